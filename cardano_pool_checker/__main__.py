@@ -1,21 +1,127 @@
 #!/usr/bin/env python
 """Cardano Pool Checker main module."""
+import argparse
+import json
+import os
+import sys
+from typing import Any
 
 from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
 
+# Stages that need network access
+NETWORK_STAGES = ["pools", "updates", "translations", "metadata", "extended_metadata"]
 
-def main() -> None:
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line arguments.
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments, None to use sys.argv. Defaults to None.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="cardano-pool-checker",
+        description="Update the Cardano stake pools register and the multi pool operators lists.",
+        epilog="Examples: cardano-pool-checker --only classified_pools, cardano-pool-checker explain POOL_ID",
+    )
+    parser.add_argument(
+        "--only", nargs="+", metavar="STAGE", help='run only these stages ("detectors" for all of them)'
+    )
+    parser.add_argument("--skip", nargs="+", metavar="STAGE", default=[], help="don't run these stages")
+    parser.add_argument(
+        "--skip-dns", action="store_true", help="don't resolve the relays hostnames, reuse the translations"
+    )
+    parser.add_argument("--offline", action="store_true", help="don't access the network, reuse the downloaded data")
+    parser.add_argument("--data-dir", help="directory of the data files instead of the configured one")
+    parser.add_argument("--allow-stale", action="store_true", help="run even if the inputs of skipped stages are stale")
+    parser.add_argument("--force", action="store_true", help="run the stages even if their inputs did not change")
+    parser.add_argument("--dry-run", action="store_true", help="show the stages that would run and exit")
+    parser.add_argument("--list-stages", action="store_true", help="show all the stages and their dependencies")
+    commands = parser.add_subparsers(dest="command", title="commands", metavar="COMMAND")
+    explain = commands.add_parser("explain", help="explain why a pool is classified as it is, without updating")
+    explain.add_argument("pool_id", help="bech32 pool id")
+    explain.add_argument("--json", action="store_true", help="print the explanation as JSON")
+    return parser.parse_args(argv)
+
+
+def format_explanation(explanation: dict[str, Any]) -> str:
+    """Format the explanation of a pool classification as text.
+
+    Args:
+        explanation (dict[str, Any]): The explanation, as returned by CardanoPoolChecker.explain.
+
+    Returns:
+        str: The explanation text.
+    """
+    lines = [f"{explanation['pool_id_bech32']} ({explanation['ticker'] or 'no ticker'})"]
+    for rule in explanation["rules"]:
+        matches = "matches" if rule["matches"] else "doesn't match"
+        keywords = ", ".join(rule["keywords"]) or "none"
+        lines.append(f"{matches} {rule['matching_file']}: {rule['rule']} (true: {keywords})")
+    if not explanation["resources"]:
+        lines.append("No shared resources.")
+    for resource in explanation["resources"]:
+        lines.append(f"{resource['type']} {resource['resource']}:")
+        if resource["current_peers"]:
+            lines.append(f"    currently shared with {', '.join(resource['current_peers'])}")
+        if resource["historical_peers"]:
+            lines.append(f"    shared at some time with {', '.join(resource['historical_peers'])}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:  # noqa: C901, PLR0912
     """Run the main entry point of the program.
 
     This function is responsible for initializing the application,
     processing command-line arguments, and orchestrating the program's
     execution.
 
+    Args:
+        argv (list[str] | None, optional): Command line arguments, None to use sys.argv. Defaults to None.
+
     Returns:
         None: This function doesn't return any values.
     """
-    my_checker = CardanoPoolChecker()
-    my_checker.update()
+    args = parse_args(argv)
+    settings: dict[str, Any] = {}
+    if args.data_dir is not None:
+        settings["CPC_DATA_DIR"] = os.path.join(os.path.abspath(args.data_dir), "")
+    if args.force:
+        settings["CPC_REUSE_UNCHANGED_STAGES"] = False
+    skip = list(args.skip)
+    # The skipped DNS translations are expected to be older than the register
+    allow_stale: bool | list[str] = args.allow_stale or []
+    if args.skip_dns or args.offline:
+        skip += ["translations"]
+        if allow_stale is not True:
+            allow_stale = ["translations"]
+    my_checker = CardanoPoolChecker(settings=settings)
+    if args.offline:
+        # The optional stages are only skipped when they are enabled
+        names = {stage.name for stage in my_checker.build_update_stages()}
+        skip += [name for name in NETWORK_STAGES if name in names]
+    if args.command == "explain":
+        try:
+            explanation = my_checker.explain(args.pool_id)
+        except ValueError as exc:
+            sys.exit(str(exc))
+        print(json.dumps(explanation, indent=4) if args.json else format_explanation(explanation))  # noqa: T201
+        return
+    if args.list_stages:
+        for stage in my_checker.build_update_stages():
+            print(f"{stage.name}: {', '.join(stage.deps) or '-'}")  # noqa: T201
+        return
+    try:
+        stages = my_checker.select_update_stages(args.only, skip, allow_stale)
+    except ValueError as exc:
+        sys.exit(str(exc))
+    if args.dry_run:
+        for stage in stages:
+            print(f"{stage.name}: {', '.join(stage.deps) or '-'}")  # noqa: T201
+        return
+    my_checker.update(args.only, skip, allow_stale)
 
 
 if __name__ == "__main__":
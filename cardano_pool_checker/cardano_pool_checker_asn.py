@@ -0,0 +1,289 @@
+"""Cardano Pool Checker module with the IP address to autonomous system database.
+
+The database is a local file with the autonomous system of every IP range,
+either a CSV/TSV file or a MaxMind MMDB file (which needs the optional
+maxminddb package). The CSV files are compiled once into an index, with the
+first and last addresses and the AS numbers of the ranges as sorted integer
+arrays, which is memory-mapped and searched with a binary search instead of
+being parsed by every update. The index is compiled again when the size or the
+modification time of the CSV file change.
+
+The supported CSV formats are the iptoasn.com one (first address, last
+address, AS number, country and description, tab separated) and the GeoLite2
+ASN one (network in CIDR notation, AS number and organization).
+
+Example:
+    with AsnDatabase("ip2asn-combined.tsv", "asn_index.bin") as database:
+        asn, name = database.lookup("192.0.2.1")
+"""
+import bisect
+import csv
+import ipaddress
+import mmap
+import os
+import socket
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Any
+
+# Format of the compiled index: the magic with its version and the byte order of the arrays, the
+# size and the modification time of the source file, the number of IPv4 ranges, IPv6 ranges and
+# named ASNs, and the length of the names
+INDEX_MAGIC = b"CPCASN1" + (b"l" if sys.byteorder == "little" else b"b")
+INDEX_HEADER = struct.Struct("<8sQqIIII")
+# Arrays of the index in their order, with their type and length, the 8 bytes ones first so every
+# array is aligned. The IPv6 addresses are split in their high and low 64 bits.
+INDEX_ARRAYS = (
+    ("first6_high", "Q", "ranges6"),
+    ("first6_low", "Q", "ranges6"),
+    ("last6_high", "Q", "ranges6"),
+    ("last6_low", "Q", "ranges6"),
+    ("first4", "I", "ranges4"),
+    ("last4", "I", "ranges4"),
+    ("asn4", "I", "ranges4"),
+    ("asn6", "I", "ranges6"),
+    ("names_asn", "I", "names"),
+    ("names_end", "I", "names"),
+)
+
+
+class AsnDatabase:
+    """IP address to autonomous system database.
+
+    Attributes:
+        path (str): Path of the CSV/TSV or MMDB database.
+        index_path (str): Path of the compiled index of a CSV/TSV database.
+    """
+
+    def __init__(self, path: str, index_path: str | None = None) -> None:
+        """Open the database, compiling the index of a CSV/TSV database when it's missing or outdated.
+
+        Args:
+            path (str): Path of the CSV/TSV or MMDB database.
+            index_path (str | None, optional): Path of the compiled index. Defaults to the
+                database path with the .idx extension.
+
+        Raises:
+            ImportError: If the database is an MMDB file and maxminddb is not installed.
+        """
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._reader: Any = None
+        self._file: Any = None
+        self._data: mmap.mmap | None = None
+        self._views: dict[str, memoryview] = {}
+        if path.endswith(".mmdb"):
+            try:
+                import maxminddb
+            except ImportError as exc:
+                msg = "The maxminddb package is required to read MMDB databases."
+                raise ImportError(msg) from exc
+            self._reader = maxminddb.open_database(path, maxminddb.MODE_MMAP)
+            return
+        stat = os.stat(path)
+        if self._index_source(self.index_path) != (stat.st_size, stat.st_mtime_ns):
+            self.compile_index(path, self.index_path)
+        self._file = open(self.index_path, "rb")  # noqa: SIM115
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, _, ranges4, ranges6, names, names_length = INDEX_HEADER.unpack_from(self._data)
+        lengths = {"ranges4": ranges4, "ranges6": ranges6, "names": names}
+        data = memoryview(self._data)
+        self._views["data"] = data
+        offset = INDEX_HEADER.size
+        # The arrays are views of the mapped file, nothing is copied
+        for name, typecode, length in INDEX_ARRAYS:
+            size = lengths[length] * array(typecode).itemsize
+            self._views[name] = data[offset : offset + size].cast(typecode)
+            offset += size
+        self._views["names"] = data[offset : offset + names_length]
+
+    @staticmethod
+    def _index_source(index_path: str) -> tuple[int, int] | None:
+        # Size and modification time of the source of an index, None if it can't be used
+        try:
+            with open(index_path, "rb") as file:
+                header = file.read(INDEX_HEADER.size)
+        except OSError:
+            return None
+        if len(header) != INDEX_HEADER.size or not header.startswith(INDEX_MAGIC):
+            return None
+        _, size, mtime, _, _, _, _ = INDEX_HEADER.unpack(header)
+        return size, mtime
+
+    @staticmethod
+    def _address(address: str) -> tuple[int, int] | None:
+        # The version and the integer value of an IP address, None if it isn't one
+        family, version = (socket.AF_INET6, 6) if ":" in address else (socket.AF_INET, 4)
+        try:
+            return version, int.from_bytes(socket.inet_pton(family, address.strip()), "big")
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def _parse_row(cls, row: list[str]) -> tuple[int, int, int, int, str] | None:
+        # The version, the first and last addresses, the AS number and the name of a CSV row,
+        # None if it isn't a range
+        try:
+            if "/" in row[0]:
+                network = ipaddress.ip_network(row[0].strip(), strict=False)
+                first = (network.version, int(network.network_address))
+                last: tuple[int, int] | None = (network.version, int(network.broadcast_address))
+                asn, name = row[1], row[2] if len(row) > 2 else ""  # noqa: PLR2004
+            else:
+                first, last = cls._address(row[0]), cls._address(row[1])  # type: ignore[assignment]
+                asn, name = row[2], row[-1] if len(row) > 3 else ""  # noqa: PLR2004
+            asn_number = int(asn.strip().upper().removeprefix("AS"))
+        except (ValueError, IndexError):
+            return None
+        # The unrouted ranges have the AS number 0
+        if first is None or last is None or first[0] != last[0] or asn_number == 0:
+            return None
+        return first[0], first[1], last[1], asn_number, name.strip()
+
+    @classmethod
+    def compile_index(cls, path: str, index_path: str) -> None:
+        """Compile the index of a CSV/TSV database.
+
+        Args:
+            path (str): Path of the CSV/TSV database.
+            index_path (str): Path of the compiled index.
+        """
+        ranges: dict[int, list[tuple[int, int, int]]] = {4: [], 6: []}
+        names: dict[int, str] = {}
+        with open(path, newline="", encoding="utf-8", errors="replace") as file:
+            delimiter = "\t" if "\t" in file.readline() else ","
+            file.seek(0)
+            for row in csv.reader(file, delimiter=delimiter):
+                if not row or row[0].startswith("#"):
+                    continue
+                parsed = cls._parse_row(row)
+                if parsed is None:
+                    continue
+                version, first, last, asn, name = parsed
+                ranges[version].append((first, last, asn))
+                if name:
+                    names.setdefault(asn, name)
+        ranges4, ranges6 = sorted(ranges[4]), sorted(ranges[6])
+        mask = (1 << 64) - 1
+        names_data = bytearray()
+        names_end = array("I")
+        for asn in sorted(names):
+            names_data.extend(names[asn].encode())
+            names_end.append(len(names_data))
+        arrays = {
+            "first6_high": array("Q", (first >> 64 for first, _, _ in ranges6)),
+            "first6_low": array("Q", (first & mask for first, _, _ in ranges6)),
+            "last6_high": array("Q", (last >> 64 for _, last, _ in ranges6)),
+            "last6_low": array("Q", (last & mask for _, last, _ in ranges6)),
+            "first4": array("I", (first for first, _, _ in ranges4)),
+            "last4": array("I", (last for _, last, _ in ranges4)),
+            "asn4": array("I", (asn for _, _, asn in ranges4)),
+            "asn6": array("I", (asn for _, _, asn in ranges6)),
+            "names_asn": array("I", sorted(names)),
+            "names_end": names_end,
+        }
+        stat = os.stat(path)
+        header = INDEX_HEADER.pack(
+            INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(ranges4), len(ranges6), len(names), len(names_data)
+        )
+        directory = os.path.dirname(os.path.abspath(index_path))
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(header)
+                for name, _, _ in INDEX_ARRAYS:
+                    file.write(arrays[name].tobytes())
+                file.write(names_data)
+            os.replace(temp_path, index_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def name(self, asn: int) -> str:
+        """Return the name of an autonomous system.
+
+        Args:
+            asn (int): The AS number.
+
+        Returns:
+            str: The name, empty if the database doesn't have it.
+        """
+        if not self._views:
+            return ""
+        names_asn = self._views["names_asn"]
+        position = bisect.bisect_left(names_asn, asn)
+        if position == len(names_asn) or names_asn[position] != asn:
+            return ""
+        start = self._views["names_end"][position - 1] if position > 0 else 0
+        return bytes(self._views["names"][start : self._views["names_end"][position]]).decode()
+
+    def _find(self, version: int, value: int) -> int | None:
+        # The AS number of the last range starting at or before the address, if it ends after it
+        views = self._views
+        if version == 4:  # noqa: PLR2004
+            position = bisect.bisect_right(views["first4"], value) - 1
+            if position < 0 or views["last4"][position] < value:
+                return None
+            return views["asn4"][position]
+        # The ranges with the same high bits are sorted by their low bits
+        high, low = value >> 64, value & ((1 << 64) - 1)
+        first_high = views["first6_high"]
+        end = bisect.bisect_right(first_high, high)
+        start = bisect.bisect_left(first_high, high, 0, end)
+        position = bisect.bisect_right(views["first6_low"], low, start, end) - 1
+        if position < start:
+            position = start - 1
+        if position < 0 or (views["last6_high"][position], views["last6_low"][position]) < (high, low):
+            return None
+        return views["asn6"][position]
+
+    def lookup(self, address: str) -> tuple[int, str] | None:
+        """Return the autonomous system of an IP address.
+
+        Args:
+            address (str): The IPv4 or IPv6 address.
+
+        Returns:
+            tuple[int, str] | None: The AS number and name, None if the address is not in any range.
+        """
+        if self._reader is not None:
+            try:
+                record = self._reader.get(address)
+            except ValueError:
+                return None
+            if not isinstance(record, dict) or not record.get("autonomous_system_number"):
+                return None
+            return int(record["autonomous_system_number"]), str(record.get("autonomous_system_organization", ""))
+        parsed = self._address(address)
+        if parsed is None or not self._views:
+            return None
+        asn = self._find(*parsed)
+        if asn is None:
+            return None
+        return asn, self.name(asn)
+
+    def close(self) -> None:
+        """Close the database."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        # The mapping can't be closed while there are views of it
+        for view in reversed(list(self._views.values())):
+            view.release()
+        self._views = {}
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "AsnDatabase":
+        """Return the open database when entering the context."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the database when leaving the context."""
+        self.close()
@@ -0,0 +1,248 @@
+"""Cardano Pool Checker benchmark runner.
+
+Runs the processing stages (register, translations, detectors and
+classification) over synthetic datasets of several sizes, recording the
+time and peak memory of every stage, and compares them with stored
+baselines. No network access is needed, the DNS lookups are answered from
+the synthetic records.
+
+Example:
+    python -m cardano_pool_checker.cardano_pool_checker_benchmark --sizes 1000 10000 --fail-on-regression
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset, generate_translations
+
+NOW = 1700000000.0
+
+
+def measure(
+    func: Callable[[], Any],
+    repeat: int = 1,
+    trace_memory: bool = True,  # noqa: FBT001, FBT002
+) -> tuple[Any, float, int]:
+    """Run a function measuring its time and its peak of traced memory.
+
+    The time is the best of repeat runs without tracing, since tracemalloc
+    slows down the allocations, and the memory is measured in an extra run.
+
+    Args:
+        func (Callable[[], Any]): The function to measure.
+        repeat (int, optional): Number of timed runs. Defaults to 1.
+        trace_memory (bool, optional): Measure the peak memory. Defaults to True.
+
+    Returns:
+        tuple[Any, float, int]: The result of the last run, the best time in
+            seconds and the peak memory in bytes (0 when not traced).
+    """
+    best = float("inf")
+    result = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    peak = 0
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, best, peak
+
+
+def run_benchmark(  # noqa: PLR0913
+    size: int,
+    sharing_rate: float = 0.05,
+    seed: int = 0,
+    repeat: int = 1,
+    trace_memory: bool = True,  # noqa: FBT001, FBT002
+    stages: list[str] | None = None,
+) -> dict[str, dict[str, float]]:
+    """Run all the stages over a synthetic dataset of the given size.
+
+    Args:
+        size (int): Number of pools of the synthetic dataset.
+        sharing_rate (float, optional): Fraction of pools sharing resources. Defaults to 0.05.
+        seed (int, optional): Seed of the synthetic data. Defaults to 0.
+        repeat (int, optional): Number of timed runs of every stage. Defaults to 1.
+        trace_memory (bool, optional): Measure the peak memory of every stage. Defaults to True.
+        stages (list[str] | None, optional): Names of the stages to measure, None for all.
+            The stages needed by them are always run. Defaults to None.
+
+    Returns:
+        dict[str, dict[str, float]]: The "time" in seconds and "memory" in bytes of every stage.
+    """
+    dataset = generate_dataset(size, sharing_rate, seed=seed)
+    results: dict[str, dict[str, float]] = {}
+
+    def stage(name: str, func: Callable[[], Any]) -> Any:
+        if stages is not None and name not in stages:
+            return func()
+        result, seconds, peak = measure(func, repeat, trace_memory)
+        results[name] = {"time": round(seconds, 6), "memory": peak}
+        print(f"{size:>8} {name:<56} {seconds:>10.3f}s {peak / 1048576:>10.1f}MiB")  # noqa: T201
+        return result
+
+    # Answer the DNS lookups from the synthetic records
+    class SyntheticChecker(CardanoPoolChecker):
+        @staticmethod
+        def _resolve_records(
+            hostname: str, rdtype: str, timeout: float = 5.0  # noqa: ARG004
+        ) -> tuple[list[str], list[str]]:
+            records: list[str] = dataset["dns"].get(hostname, {}).get(rdtype, [])
+            return records, []
+
+        @staticmethod
+        def _resolve_srv_records(name: str, timeout: float = 5.0) -> list[str]:  # noqa: ARG004
+            targets: list[str] = dataset["srv"].get(name, [])
+            return targets
+
+    def find(name: str, *args: Any) -> Callable[[], Any]:
+        # The detector function of the name run with the arguments
+        return lambda: getattr(CardanoPoolChecker, "find_" + name)(*args)
+
+    register = stage("build_register", lambda: CardanoPoolChecker.build_register(dataset["updates"]))
+    stage("build_translations", lambda: SyntheticChecker.build_translations(register, {}))
+    translations = generate_translations(register, dataset["dns"], dataset["srv"], NOW, seed=seed)
+    stage("build_translations_index", lambda: CardanoPoolChecker.build_translations_index(translations))
+    stage(
+        "compact_translations",
+        lambda: CardanoPoolChecker.compact_translations(translations, {}, register, now=NOW),
+    )
+    detectors: dict[str, Any] = {}
+    for name in (
+        "registered_currently_sharing_relay_hostname",
+        "registered_currently_sharing_meta_json_homepage",
+        "registered_currently_sharing_meta_url",
+        "registered_currently_sharing_owners",
+        "registered_currently_sharing_reward_addr",
+        "registered_currently_similar_meta_json",
+        "registered_sharing_relay_hostname",
+        "registered_sharing_meta_json_homepage",
+        "registered_sharing_meta_url",
+        "registered_sharing_owners",
+        "registered_sharing_reward_addr",
+        "registered_similar_meta_json",
+    ):
+        detectors[name] = stage("find_" + name, find(name, register))
+    for name in (
+        "registered_currently_sharing_relay_ipv4",
+        "registered_currently_sharing_relay_ipv6",
+        "registered_sharing_relay_ipv4",
+        "registered_sharing_relay_ipv6",
+    ):
+        detectors[name] = stage("find_" + name, find(name, register, translations))
+    (
+        detectors["registered_currently_sharing_relay_endpoint"],
+        detectors["registered_sharing_relay_endpoint"],
+    ) = stage(
+        "find_registered_sharing_relay_endpoints",
+        lambda: CardanoPoolChecker.find_registered_sharing_relay_endpoints(register, translations),
+    )
+    # The classification reads the detectors results from the files
+    checker = CardanoPoolChecker([], [], {})
+    with tempfile.TemporaryDirectory() as pools_path:
+        for name, value in detectors.items():
+            with open(os.path.join(pools_path, name + ".json"), "w") as file:
+                json.dump(value, file)
+        stage(
+            "build_classified_pools",
+            lambda: checker.build_classified_pools(pools_path, dataset["pools"], checker.CPC_MSPO_RULES),
+        )
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, dict[str, float]]],
+    baselines: dict[str, dict[str, dict[str, float]]],
+    threshold: float = 0.25,
+    min_time: float = 0.05,
+) -> list[str]:
+    """Compare benchmark results with the baselines.
+
+    Args:
+        results (dict[str, dict[str, dict[str, float]]]): Results by size and stage.
+        baselines (dict[str, dict[str, dict[str, float]]]): Baselines by size and stage.
+        threshold (float, optional): Allowed relative increase of time or memory. Defaults to 0.25.
+        min_time (float, optional): Time increases smaller than this number of seconds are
+            ignored, to avoid failing because of the noise of the fast stages. Defaults to 0.05.
+
+    Returns:
+        list[str]: A description of every regression found.
+    """
+    regressions = []
+    for size, stages in results.items():
+        for name, metrics in stages.items():
+            baseline = baselines.get(size, {}).get(name)
+            if baseline is None:
+                continue
+            if metrics["time"] > baseline["time"] * (1 + threshold) and metrics["time"] - baseline["time"] > min_time:
+                regressions.append(f"{size} {name}: time {baseline['time']:.3f}s -> {metrics['time']:.3f}s")
+            if (
+                metrics.get("memory")
+                and baseline.get("memory")
+                and metrics["memory"] > baseline["memory"] * (1 + threshold)
+            ):
+                regressions.append(f"{size} {name}: memory {baseline['memory']} -> {metrics['memory']} bytes")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks from the command line.
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments, None to use sys.argv. Defaults to None.
+
+    Returns:
+        int: The exit code, 1 when --fail-on-regression is set and a regression is found.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Cardano Pool Checker stages with synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="numbers of pools to test")
+    parser.add_argument("--sharing-rate", type=float, default=0.05, help="fraction of pools sharing resources")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic data")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs of every stage, the best one is kept")
+    parser.add_argument("--stages", nargs="+", help="only measure these stages")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc memory measurement")
+    parser.add_argument("--baseline", default="benchmarks/baselines.json", help="baselines file")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baselines")
+    parser.add_argument("--output", help="file where the results are written as JSON")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative increase over the baselines")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with error on regressions")
+    args = parser.parse_args(argv)
+
+    results = {
+        str(size): run_benchmark(size, args.sharing_rate, args.seed, args.repeat, not args.no_memory, args.stages)
+        for size in args.sizes
+    }
+    baselines: dict[str, dict[str, dict[str, float]]] = {}
+    if os.path.isfile(args.baseline):
+        with open(args.baseline) as file:
+            baselines = json.load(file)
+    regressions = compare(results, baselines, args.threshold)
+    for regression in regressions:
+        print(f"Regression: {regression}")  # noqa: T201
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"results": results, "regressions": regressions}, file, indent=4)
+    if args.save_baseline:
+        for size, stages in results.items():
+            baselines.setdefault(size, {}).update(stages)
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as file:
+            json.dump(baselines, file, indent=4, sort_keys=True)
+    return 1 if args.fail_on_regression and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,82 @@
 """Cardano Pool Checker module containing its class definition."""
+import hashlib
 import ipaddress
 import json
 import os
+import pickle
 import re
-import socket
 import sys
+import tempfile
 import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
+import dns.exception
+import dns.resolver
 import urllib3
 import validators
 from urllib3.exceptions import HTTPError
 
 import cardano_pool_checker.cardano_pool_checker_config as cpc_config
+import cardano_pool_checker.cardano_pool_checker_filter as cpc_filter
+import cardano_pool_checker.cardano_pool_checker_metrics as cpc_metrics
+import cardano_pool_checker.cardano_pool_checker_publisher as cpc_publisher
+import cardano_pool_checker.cardano_pool_checker_telemetry as cpc_telemetry
+from cardano_pool_checker.cardano_pool_checker_asn import AsnDatabase
+from cardano_pool_checker.cardano_pool_checker_pipeline import Pipeline, Stage
+from cardano_pool_checker.cardano_pool_checker_telemetry import Telemetry
 
 http = urllib3.PoolManager()
 urllib3.disable_warnings()
 
+KOIOS_URL = "https://api.koios.rest/api/v0/"
+# Attempts of every Koios request after the first one, waiting an increasing time between them
+KOIOS_RETRIES = 3
+KOIOS_RETRY_BACKOFF = 1.0
+# Version of the format of the state snapshot, to be increased when the stored attributes change
+SNAPSHOT_VERSION = 1
+SNAPSHOT_STATE = (
+    "_updates",
+    "_register",
+    "_translations",
+    "_translations_index",
+    "_translations_archive",
+    "_translations_history",
+    "_translations_history_index",
+)
+# Stages using the relays resolved in the last hours, whose outputs also depend on the current time
+CURRENT_WINDOW_STAGES = (
+    "registered_currently_sharing_relay_ipv4",
+    "registered_currently_sharing_relay_ipv6",
+    "registered_sharing_relay_endpoints",
+    "asn",
+)
+# Operator identifiers of the extended metadata, by their path in the Adapools and the
+# CIP-6 formats, and the name of the resource they are indexed as
+EXTENDED_OPERATOR_FIELDS = {
+    ("info", "social", "twitter_handle"): "twitter",
+    ("info", "social", "telegram_handle"): "telegram",
+    ("info", "social", "facebook_handle"): "facebook",
+    ("info", "social", "youtube_handle"): "youtube",
+    ("info", "social", "twitch_handle"): "twitch",
+    ("info", "social", "discord_handle"): "discord",
+    ("info", "social", "github_handle"): "github",
+    ("info", "company", "name"): "company",
+    ("info", "company", "company_id"): "company_id",
+    ("info", "company", "vat_id"): "vat_id",
+    ("telegram_admin_handle",): "telegram",
+    ("my_pool_ids",): "pool_id",
+    ("pool", "contact", "email"): "email",
+    ("pool", "contact", "facebook"): "facebook",
+    ("pool", "contact", "github"): "github",
+    ("pool", "contact", "telegram"): "telegram",
+    ("pool", "contact", "twitter"): "twitter",
+}
+# Characters of the bech32 encoding, naming the shards of the pools report
+BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
 
 class CardanoPoolChecker:
     """Cardano Pool Checker class definition.
@@ -48,6 +107,7 @@ class CardanoPoolChecker:
         updates: list[dict[str, Any]] | None = None,
         register: list[Any] | None = None,
         translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+        settings: dict[str, Any] | None = None,
     ) -> None:
         """Initialize variables when instantiating the CardanoPoolChecker  class.
 
@@ -64,8 +124,25 @@ class CardanoPoolChecker:
                 Dictionary containing pool hostnames translations to init the
                 class with, when None, the Dictionary is loaded from the
                 corresponding file in the "pools" directory. Defaults to None.
+            settings (dict[str, Any] | None, optional):
+                Settings overriding the ones of the configuration file, e.g.
+                {"CPC_DATA_DIR": "/tmp/pools/"}. Defaults to None.
+
+        Raises:
+            ValueError: If some of the settings is unknown.
         """
         self._load_settings()
+        for name, value in (settings or {}).items():
+            if not hasattr(self, name) or not name.startswith("CPC_"):
+                msg = f"Unknown setting {name}."
+                raise ValueError(msg)
+            setattr(self, name, value)
+        # Digests of the data files by path, with the modification time and size they had
+        self._saved_digests: dict[str, tuple[int, int, bytes]] = {}
+        self._manifest: dict[str, dict[str, Any]] = {}
+        # Everything loaded from the files can come from the snapshot instead, when it's fresh
+        if updates is None and register is None and translations is None and self._load_snapshot():
+            return
         if updates is None:
             self._load_updates()
         else:
@@ -140,9 +217,83 @@ class CardanoPoolChecker:
     @translations.setter
     def translations(self, value: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]) -> None:
         self._translations = value
+        self._translations_index: dict[str, dict[str, dict[str, float]]] | None = None
+        self._translations_history: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None
+        self._translations_history_index: dict[str, dict[str, dict[str, float]]] | None = None
         if self.CPC_SAVE_TO_DISK:
             self._save_json(self.CPC_POOLS_DNS_TRANSLATIONS_FILENAME, value)
 
+    @property
+    def translations_index(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Getter decorator for the reverse index of the translations attribute.
+
+        The index is built on first access and kept up to date by the
+        translations updates and compaction.
+
+        Returns:
+            dict[str, dict[str, dict[str, float]]]: Return the translations reverse index.
+        """
+        index: dict[str, dict[str, dict[str, float]]] | None = getattr(self, "_translations_index", None)
+        if index is None:
+            index = self.build_translations_index(self._translations)
+            self._translations_index = index
+        return index
+
+    @property
+    def translations_archive(self) -> dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]:
+        """Getter decorator for _translations_archive attribute.
+
+        The archive holds the cold translations moved out of the translations
+        file by the compaction, it's loaded from disk on first access only.
+
+        Returns:
+            dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]: Return _translations_archive value.
+        """
+        if getattr(self, "_translations_archive", None) is None:
+            self._load_translations_archive()
+        return self._translations_archive
+
+    @translations_archive.setter
+    def translations_archive(self, value: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]) -> None:
+        self._translations_archive = value
+        self._translations_history = None
+        self._translations_history_index = None
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json(self.CPC_POOLS_DNS_TRANSLATIONS_ARCHIVE_FILENAME, value)
+
+    @property
+    def translations_history(self) -> dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]:
+        """Getter decorator for the translations merged with the archived ones.
+
+        Returns:
+            dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]: Return the translations,
+                merged with the archive when CPC_TRANSLATIONS_ARCHIVE_IN_HISTORY is enabled.
+        """
+        if not self.CPC_TRANSLATIONS_ARCHIVE_IN_HISTORY:
+            return self._translations
+        history: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = getattr(
+            self, "_translations_history", None
+        )
+        if history is None:
+            history = self.merge_translations(self._translations, self.translations_archive)
+            self._translations_history = history
+        return history
+
+    @property
+    def translations_history_index(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Getter decorator for the reverse index of the translations_history attribute.
+
+        Returns:
+            dict[str, dict[str, dict[str, float]]]: Return the translations history reverse index.
+        """
+        if not self.CPC_TRANSLATIONS_ARCHIVE_IN_HISTORY:
+            return self.translations_index
+        index: dict[str, dict[str, dict[str, float]]] | None = getattr(self, "_translations_history_index", None)
+        if index is None:
+            index = self.build_translations_index(self.translations_history)
+            self._translations_history_index = index
+        return index
+
     @property
     def last_block_time(self) -> int:
         """Getter decorator for the block time of the last update in updates.
@@ -381,6 +532,118 @@ class CardanoPoolChecker:
         if self.CPC_SAVE_TO_DISK:
             self._save_json("registered_sharing_reward_addr.json", value)
 
+    @property
+    def registered_currently_similar_meta_json(self) -> dict[str, list[str]]:
+        """Getter decorator for _registered_currently_similar_meta_json attribute.
+
+        Returns:
+            dict[str, list[str]]: returns a dictionary with registered stake pools that
+                currently have a near-duplicate metadata name and description.
+        """
+        return self._registered_currently_similar_meta_json
+
+    @registered_currently_similar_meta_json.setter
+    def registered_currently_similar_meta_json(self, value: dict[str, list[str]]) -> None:
+        self._registered_currently_similar_meta_json = value
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json("registered_currently_similar_meta_json.json", value)
+
+    @property
+    def registered_similar_meta_json(self) -> dict[str, list[str]]:
+        """Getter decorator for _registered_similar_meta_json attribute.
+
+        Returns:
+            dict[str, list[str]]: returns a dictionary with registered stake pools that
+                had at any time a near-duplicate metadata name and description.
+        """
+        return self._registered_similar_meta_json
+
+    @registered_similar_meta_json.setter
+    def registered_similar_meta_json(self, value: dict[str, list[str]]) -> None:
+        self._registered_similar_meta_json = value
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json("registered_similar_meta_json.json", value)
+
+    @property
+    def registered_currently_sharing_relay_endpoint(self) -> dict[str, list[str]]:
+        """Getter decorator for _registered_currently_sharing_relay_endpoint attribute.
+
+        Returns:
+            dict[str, list[str]]: returns a dictionary with registered stake pools that
+                are currently sharing a relay host:port endpoint.
+        """
+        return self._registered_currently_sharing_relay_endpoint
+
+    @registered_currently_sharing_relay_endpoint.setter
+    def registered_currently_sharing_relay_endpoint(self, value: dict[str, list[str]]) -> None:
+        self._registered_currently_sharing_relay_endpoint = value
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json("registered_currently_sharing_relay_endpoint.json", value)
+
+    @property
+    def registered_sharing_relay_endpoint(self) -> dict[str, list[str]]:
+        """Getter decorator for _registered_sharing_relay_endpoint attribute.
+
+        Returns:
+            dict[str, list[str]]: returns a dictionary with registered stake pools that
+                shared at any time a relay host:port endpoint.
+        """
+        return self._registered_sharing_relay_endpoint
+
+    @registered_sharing_relay_endpoint.setter
+    def registered_sharing_relay_endpoint(self, value: dict[str, list[str]]) -> None:
+        self._registered_sharing_relay_endpoint = value
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json("registered_sharing_relay_endpoint.json", value)
+
+    @property
+    def registered_currently_unreachable_meta_url(self) -> dict[str, list[str]]:
+        """Getter decorator for _registered_currently_unreachable_meta_url attribute.
+
+        Returns:
+            dict[str, list[str]]: returns a dictionary with registered stake pools whose
+                current metadata url can't be downloaded, by metadata url.
+        """
+        return self._registered_currently_unreachable_meta_url
+
+    @registered_currently_unreachable_meta_url.setter
+    def registered_currently_unreachable_meta_url(self, value: dict[str, list[str]]) -> None:
+        self._registered_currently_unreachable_meta_url = value
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json("registered_currently_unreachable_meta_url.json", value)
+
+    @property
+    def registered_currently_mismatched_meta_hash(self) -> dict[str, list[str]]:
+        """Getter decorator for _registered_currently_mismatched_meta_hash attribute.
+
+        Returns:
+            dict[str, list[str]]: returns a dictionary with registered stake pools whose
+                current metadata doesn't match its registered hash, by metadata url.
+        """
+        return self._registered_currently_mismatched_meta_hash
+
+    @registered_currently_mismatched_meta_hash.setter
+    def registered_currently_mismatched_meta_hash(self, value: dict[str, list[str]]) -> None:
+        self._registered_currently_mismatched_meta_hash = value
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json("registered_currently_mismatched_meta_hash.json", value)
+
+    @property
+    def registered_currently_sharing_extended_operator(self) -> dict[str, list[str]]:
+        """Getter decorator for _registered_currently_sharing_extended_operator attribute.
+
+        Returns:
+            dict[str, list[str]]: returns a dictionary with registered stake pools that
+                are currently sharing an operator identifier of their extended metadata.
+        """
+        return self._registered_currently_sharing_extended_operator
+
+    @registered_currently_sharing_extended_operator.setter
+    def registered_currently_sharing_extended_operator(self, value: dict[str, list[str]]) -> None:
+        self._registered_currently_sharing_extended_operator = value
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json("registered_currently_sharing_extended_operator.json", value)
+
     @property
     def classified_pools(self) -> dict[str, list[dict[str, str | list[str]]]]:
         """Getter decorator for _classified_pools attribute.
@@ -397,6 +660,118 @@ class CardanoPoolChecker:
             for rule in value:
                 self._save_json(str(rule), value[rule])
 
+    @property
+    def pool_report(self) -> dict[str, dict[str, Any]]:
+        """Getter decorator for _pool_report attribute.
+
+        Returns:
+            dict[str, dict[str, Any]]: Return the shared resources, peers, matching rules
+                and cluster of every pool, by pool id.
+        """
+        return self._pool_report
+
+    @pool_report.setter
+    def pool_report(self, value: dict[str, dict[str, Any]]) -> None:
+        previous: dict[str, dict[str, Any]] = vars(self).get("_pool_report", {})
+        self._pool_report = value
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json(self.CPC_POOLS_REPORT_FILENAME, value)
+            if self.CPC_POOLS_REPORT_SHARD_LENGTH:
+                # Every shard is written, even if empty, so clients never miss a file
+                shards: dict[str, dict[str, dict[str, Any]]] = {name: {} for name in self.pool_report_shards()}
+                for pool_id, entry in value.items():
+                    shards.setdefault(self.pool_report_shard(pool_id), {})[pool_id] = entry
+                previous_shards: dict[str, dict[str, dict[str, Any]]] = {}
+                for pool_id, entry in previous.items():
+                    previous_shards.setdefault(self.pool_report_shard(pool_id), {})[pool_id] = entry
+                directory = os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR)
+                for name, shard in shards.items():
+                    file_path = os.path.join(directory, name)
+                    if shard == previous_shards.get(name, {}) and file_path in self._saved_digests:
+                        # Written by the previous report, only mark it as up to date
+                        os.utime(file_path)
+                    else:
+                        self._save_json(name, shard)
+
+    @property
+    def changes(self) -> dict[str, Any]:
+        """Getter decorator for _changes attribute.
+
+        Returns:
+            dict[str, Any]: Return the changes of the rules files and sharing maps since the previous update.
+        """
+        return self._changes
+
+    @changes.setter
+    def changes(self, value: dict[str, Any]) -> None:
+        self._changes = value
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json(self.CPC_CHANGES_FILENAME, value)
+
+    @property
+    def asn_concentration(self) -> dict[str, Any]:
+        """Getter decorator for _asn_concentration attribute.
+
+        Returns:
+            dict[str, Any]: Return the autonomous system of every current relay IP address
+                and the pools hosted by every autonomous system.
+        """
+        return self._asn_concentration
+
+    @asn_concentration.setter
+    def asn_concentration(self, value: dict[str, Any]) -> None:
+        self._asn_concentration = value
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json(self.CPC_ASN_FILENAME, value)
+
+    @property
+    def membership_filters(self) -> dict[str, dict[str, Any]]:
+        """Getter decorator for _membership_filters attribute.
+
+        Returns:
+            dict[str, dict[str, Any]]: Return the Bloom filters of the pools of every rule
+                matching file, by filter file name.
+        """
+        return self._membership_filters
+
+    @membership_filters.setter
+    def membership_filters(self, value: dict[str, dict[str, Any]]) -> None:
+        self._membership_filters = value
+        if self.CPC_SAVE_TO_DISK:
+            for filename, bloom in value.items():
+                self._save_json(filename, bloom)
+
+    @property
+    def run_report(self) -> dict[str, Any]:
+        """Getter decorator for _run_report attribute.
+
+        Returns:
+            dict[str, Any]: Return the telemetry report of the last update run.
+        """
+        return self._run_report
+
+    @run_report.setter
+    def run_report(self, value: dict[str, Any]) -> None:
+        self._run_report = value
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json(self.CPC_RUN_REPORT_FILENAME, value)
+
+    @property
+    def manifest(self) -> dict[str, dict[str, Any]]:
+        """Getter decorator for _manifest attribute.
+
+        Returns:
+            dict[str, dict[str, Any]]: Return the fingerprint of the inputs and the digests
+                of the outputs of every stage, as of its last run.
+        """
+        return self._manifest
+
+    @manifest.setter
+    def manifest(self, value: dict[str, dict[str, Any]]) -> None:
+        self._manifest = value
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json(self.CPC_MANIFEST_FILENAME, value)
+
     @staticmethod
     def _is_valid_url(url: str) -> bool:
         return bool(validators.url(url))
@@ -405,6 +780,7 @@ class CardanoPoolChecker:
     def _is_reachable_url(url: str) -> bool:
         http = urllib3.PoolManager()
         success: int = 200
+        cpc_telemetry.count("http_requests")
         try:
             response = http.request("GET", url)
         except HTTPError:
@@ -422,16 +798,175 @@ class CardanoPoolChecker:
             return str(ipv6.exploded)
 
     @staticmethod
-    def _resolve_a_records(hostname: str) -> list[str | Any]:
+    def _resolve_records(hostname: str, rdtype: str, timeout: float = 5.0) -> tuple[list[str], list[str]]:
+        # Query explicitly the A or AAAA records, returning the unique addresses
+        # and the CNAME chain followed to get them, ending with the canonical name.
+        try:
+            answer = dns.resolver.resolve(hostname, rdtype, lifetime=timeout, raise_on_no_answer=False)
+        except dns.exception.DNSException:
+            cpc_telemetry.count("dns_failures")
+            return [], []
+        chain = [str(rrset[0].target).rstrip(".") for rrset in answer.chaining_result.cnames]
+        addresses: list[str] = []
+        if answer.rrset is not None:
+            for record in answer.rrset:
+                if record.address not in addresses:
+                    addresses.append(record.address)
+        return addresses, chain
+
+    @staticmethod
+    def _relay_endpoint(address: str, port: Any) -> str | None:
+        # Normalize the endpoint as address:port, IPv6 addresses are exploded and
+        # enclosed in brackets, hostnames lowercased and without the trailing dot.
+        if not isinstance(address, str) or not isinstance(port, int):
+            return None
+        try:
+            ip_address = ipaddress.ip_address(address.strip())
+        except ValueError:
+            hostname = address.strip().lower().rstrip(".")
+            return f"{hostname}:{port}" if hostname else None
+        if ip_address.version == 6:  # noqa: PLR2004
+            return f"[{ip_address.exploded}]:{port}"
+        return f"{ip_address}:{port}"
+
+    @staticmethod
+    def _resolve_srv_records(name: str, timeout: float = 5.0) -> list[str]:
         try:
-            ip_addresses = set()
-            for result in socket.getaddrinfo(hostname, None):
-                ip_addresses.add(result[4][0])
-            return list(ip_addresses)
-        except socket.gaierror:
+            answer = dns.resolver.resolve(name, "SRV", lifetime=timeout)
+        except dns.exception.DNSException:
+            cpc_telemetry.count("dns_failures")
             return []
+        targets: list[str] = []
+        for record in answer:
+            target = str(record.target).rstrip(".")
+            if target and target not in targets:
+                targets.append(target)
+        return targets
+
+    @staticmethod
+    def _meta_json_text(meta_json: Any) -> str:
+        if not isinstance(meta_json, dict):
+            return ""
+        parts = [meta_json.get("name"), meta_json.get("description")]
+        return " ".join(" ".join(part for part in parts if isinstance(part, str)).lower().split())
+
+    @staticmethod
+    def _shingles(text: str, size: int = 5) -> set[str]:
+        if len(text) <= size:
+            return {text} if text else set()
+        return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+    @staticmethod
+    def _minhash_signature(shingles: set[str], num_perm: int) -> tuple[int, ...]:
+        # One permutation hashing: every shingle is hashed only once and the hash
+        # space split in num_perm bins keeping the minimum of each one, then the
+        # empty bins are filled rotating from the next non-empty bin.
+        bins: list[int | None] = [None] * num_perm
+        for shingle in shingles:
+            value = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+            position, value = value % num_perm, value // num_perm
+            current = bins[position]
+            if current is None or value < current:
+                bins[position] = value
+        if all(value is None for value in bins):
+            return ()
+        signature = []
+        for position in range(num_perm):
+            distance = 0
+            while (filled := bins[(position + distance) % num_perm]) is None:
+                distance += 1
+            signature.append(filled + distance * 2**64)
+        return tuple(signature)
+
+    @staticmethod
+    def _lsh_params(threshold: float, num_perm: int) -> tuple[int, int]:
+        # Choose the number of bands and rows per band minimizing the false
+        # positive and false negative probabilities around the threshold.
+        steps = 50
+
+        def integrate(bands: int, rows: int, start: float, end: float, *, negative: bool) -> float:
+            width = (end - start) / steps
+            area = 0.0
+            for step in range(steps):
+                probability = 1 - (1 - (start + (step + 0.5) * width) ** rows) ** bands
+                area += (1 - probability if negative else probability) * width
+            return area
+
+        best = (1, num_perm)
+        best_error = float("inf")
+        for bands in range(1, num_perm + 1):
+            for rows in range(1, num_perm // bands + 1):
+                error = integrate(bands, rows, 0.0, threshold, negative=False) + integrate(
+                    bands, rows, threshold, 1.0, negative=True
+                )
+                if error < best_error:
+                    best, best_error = (bands, rows), error
+        return best
+
+    @classmethod
+    def _similar_pairs(
+        cls, items: list[tuple[str, str]], signatures: dict[str, tuple[int, ...]], threshold: float, num_perm: int
+    ) -> list[tuple[str, str]]:
+        # Hash each band of the signatures into buckets, only the items falling
+        # in the same bucket are compared, avoiding a quadratic comparison.
+        bands, rows = cls._lsh_params(threshold, num_perm)
+        buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+        for index, (_, text) in enumerate(items):
+            signature = signatures[text]
+            for band in range(bands):
+                buckets.setdefault((band, signature[band * rows : (band + 1) * rows]), []).append(index)
+        similar: dict[tuple[str, str], bool] = {}
+        pairs = []
+        for bucket in buckets.values():
+            for position, first in enumerate(bucket):
+                for second in bucket[position + 1 :]:
+                    (first_pool, first_text), (second_pool, second_text) = items[first], items[second]
+                    if first_pool == second_pool:
+                        continue
+                    if (first_text, second_text) not in similar:
+                        matches = sum(
+                            a == b for a, b in zip(signatures[first_text], signatures[second_text], strict=True)
+                        )
+                        similar[(first_text, second_text)] = matches / num_perm >= threshold
+                    if similar[(first_text, second_text)]:
+                        pairs.append((first_pool, second_pool))
+        return pairs
 
-    def _load_settings(self) -> None:  # noqa: PLR0912
+    @classmethod
+    def _find_similar_meta_json(
+        cls, entries: list[tuple[str, dict[str, Any]]], threshold: float, num_perm: int
+    ) -> dict[str, list[str]]:
+        # Compute one signature per distinct text, metadata logs repeat a lot
+        signatures: dict[str, tuple[int, ...]] = {}
+        items: list[tuple[str, str]] = []
+        for pool_id, meta_json in entries:
+            text = cls._meta_json_text(meta_json)
+            if not text:
+                continue
+            if text not in signatures:
+                signatures[text] = cls._minhash_signature(cls._shingles(text), num_perm)
+            items.append((pool_id, text))
+        # Join the pools with an estimated similarity over the threshold
+        parents: dict[str, str] = {pool_id: pool_id for pool_id, _ in items}
+
+        def root(pool_id: str) -> str:
+            while parents[pool_id] != pool_id:
+                parents[pool_id] = parents[parents[pool_id]]
+                pool_id = parents[pool_id]
+            return pool_id
+
+        for first_pool, second_pool in cls._similar_pairs(items, signatures, threshold, num_perm):
+            parents[root(second_pool)] = root(first_pool)
+        clusters: dict[str, list[str]] = {}
+        for pool_id, _ in items:
+            value_pools = clusters.setdefault(root(pool_id), [])
+            if pool_id not in value_pools:
+                value_pools.append(pool_id)
+        # Key the clusters with multiple pools by their lowest pool id, which unlike
+        # the metadata names can't be shared by two unrelated clusters
+        return {min(value_pools): value_pools for value_pools in clusters.values() if len(value_pools) > 1}
+
+    def _load_settings(self) -> None:  # noqa: C901, PLR0912, PLR0915
         try:
             self.CPC_DATA_DIR = cpc_config.CPC_DATA_DIR
         except (NameError, AttributeError):
@@ -456,6 +991,10 @@ class CardanoPoolChecker:
             self.CPC_SAVE_TO_DISK = cpc_config.CPC_SAVE_TO_DISK
         except (NameError, AttributeError):
             self.CPC_SAVE_TO_DISK = True
+        try:
+            self.CPC_KOIOS_URL = cpc_config.CPC_KOIOS_URL
+        except (NameError, AttributeError):
+            self.CPC_KOIOS_URL = KOIOS_URL
         try:
             self.CPC_POOLS_URL = cpc_config.CPC_POOLS_URL
         except (NameError, AttributeError):
@@ -486,7 +1025,194 @@ class CardanoPoolChecker:
                 "ip4c",
                 "ip6c",
                 "rwdc",
+                "sim",
+                "simc",
+                "ept",
+                "eptc",
+                "mtuc",
+                "mthc",
+                "extc",
             ]
+        try:
+            self.CPC_POOLS_DNS_TRANSLATIONS_ARCHIVE_FILENAME = cpc_config.CPC_POOLS_DNS_TRANSLATIONS_ARCHIVE_FILENAME
+        except (NameError, AttributeError):
+            self.CPC_POOLS_DNS_TRANSLATIONS_ARCHIVE_FILENAME = "pools_dns_translations_archive.json"
+        try:
+            self.CPC_TRANSLATIONS_RETENTION_DAYS = cpc_config.CPC_TRANSLATIONS_RETENTION_DAYS
+        except (NameError, AttributeError):
+            self.CPC_TRANSLATIONS_RETENTION_DAYS = 90
+        try:
+            self.CPC_TRANSLATIONS_ARCHIVE_DAYS = cpc_config.CPC_TRANSLATIONS_ARCHIVE_DAYS
+        except (NameError, AttributeError):
+            self.CPC_TRANSLATIONS_ARCHIVE_DAYS = 30
+        try:
+            self.CPC_TRANSLATIONS_ARCHIVE_IN_HISTORY = cpc_config.CPC_TRANSLATIONS_ARCHIVE_IN_HISTORY
+        except (NameError, AttributeError):
+            self.CPC_TRANSLATIONS_ARCHIVE_IN_HISTORY = False
+        try:
+            self.CPC_DNS_MAX_WORKERS = cpc_config.CPC_DNS_MAX_WORKERS
+        except (NameError, AttributeError):
+            self.CPC_DNS_MAX_WORKERS = 32
+        try:
+            self.CPC_DNS_TIMEOUT = cpc_config.CPC_DNS_TIMEOUT
+        except (NameError, AttributeError):
+            self.CPC_DNS_TIMEOUT = 5.0
+        try:
+            self.CPC_META_JSON_SIMILARITY_THRESHOLD = cpc_config.CPC_META_JSON_SIMILARITY_THRESHOLD
+        except (NameError, AttributeError):
+            self.CPC_META_JSON_SIMILARITY_THRESHOLD = 0.8
+        try:
+            self.CPC_META_JSON_MINHASH_PERMUTATIONS = cpc_config.CPC_META_JSON_MINHASH_PERMUTATIONS
+        except (NameError, AttributeError):
+            self.CPC_META_JSON_MINHASH_PERMUTATIONS = 128
+        try:
+            self.CPC_PIPELINE_MAX_WORKERS = cpc_config.CPC_PIPELINE_MAX_WORKERS
+        except (NameError, AttributeError):
+            self.CPC_PIPELINE_MAX_WORKERS = 8
+        try:
+            self.CPC_STAGE_TIMEOUTS = cpc_config.CPC_STAGE_TIMEOUTS
+        except (NameError, AttributeError):
+            self.CPC_STAGE_TIMEOUTS = {}
+        try:
+            self.CPC_DAEMON_POLL_INTERVAL = cpc_config.CPC_DAEMON_POLL_INTERVAL
+        except (NameError, AttributeError):
+            self.CPC_DAEMON_POLL_INTERVAL = 300
+        try:
+            self.CPC_DAEMON_DNS_INTERVAL = cpc_config.CPC_DAEMON_DNS_INTERVAL
+        except (NameError, AttributeError):
+            self.CPC_DAEMON_DNS_INTERVAL = 3600
+        try:
+            self.CPC_RUN_REPORT_FILENAME = cpc_config.CPC_RUN_REPORT_FILENAME
+        except (NameError, AttributeError):
+            self.CPC_RUN_REPORT_FILENAME = "run_report.json"
+        try:
+            self.CPC_TELEMETRY_TRACE_MEMORY = cpc_config.CPC_TELEMETRY_TRACE_MEMORY
+        except (NameError, AttributeError):
+            self.CPC_TELEMETRY_TRACE_MEMORY = False
+        try:
+            self.CPC_PROFILE_STAGES = cpc_config.CPC_PROFILE_STAGES
+        except (NameError, AttributeError):
+            self.CPC_PROFILE_STAGES = False
+        try:
+            self.CPC_PROFILE_DIR = cpc_config.CPC_PROFILE_DIR
+        except (NameError, AttributeError):
+            self.CPC_PROFILE_DIR = "profiles/"
+        try:
+            self.CPC_REUSE_UNCHANGED_STAGES = cpc_config.CPC_REUSE_UNCHANGED_STAGES
+        except (NameError, AttributeError):
+            self.CPC_REUSE_UNCHANGED_STAGES = True
+        try:
+            self.CPC_MANIFEST_FILENAME = cpc_config.CPC_MANIFEST_FILENAME
+        except (NameError, AttributeError):
+            self.CPC_MANIFEST_FILENAME = "manifest.json"
+        try:
+            self.CPC_METRICS_TEXTFILE = cpc_config.CPC_METRICS_TEXTFILE
+        except (NameError, AttributeError):
+            self.CPC_METRICS_TEXTFILE = None
+        try:
+            self.CPC_SNAPSHOT_FILENAME = cpc_config.CPC_SNAPSHOT_FILENAME
+        except (NameError, AttributeError):
+            self.CPC_SNAPSHOT_FILENAME = "cardano_pool_checker_state.pickle"
+        try:
+            self.CPC_POOLS_REPORT_FILENAME = cpc_config.CPC_POOLS_REPORT_FILENAME
+        except (NameError, AttributeError):
+            self.CPC_POOLS_REPORT_FILENAME = "pools_report.json"
+        try:
+            self.CPC_POOLS_REPORT_SHARDS_DIR = cpc_config.CPC_POOLS_REPORT_SHARDS_DIR
+        except (NameError, AttributeError):
+            self.CPC_POOLS_REPORT_SHARDS_DIR = "pools_report/"
+        try:
+            self.CPC_POOLS_REPORT_SHARD_LENGTH = cpc_config.CPC_POOLS_REPORT_SHARD_LENGTH
+        except (NameError, AttributeError):
+            self.CPC_POOLS_REPORT_SHARD_LENGTH = 1
+        try:
+            self.CPC_CHANGES_FILENAME = cpc_config.CPC_CHANGES_FILENAME
+        except (NameError, AttributeError):
+            self.CPC_CHANGES_FILENAME = "changes.json"
+        try:
+            self.CPC_CHANGES_STATE_FILENAME = cpc_config.CPC_CHANGES_STATE_FILENAME
+        except (NameError, AttributeError):
+            self.CPC_CHANGES_STATE_FILENAME = "changes_state.json"
+        try:
+            self.CPC_MEMBERSHIP_FILTER_FPR = cpc_config.CPC_MEMBERSHIP_FILTER_FPR
+        except (NameError, AttributeError):
+            self.CPC_MEMBERSHIP_FILTER_FPR = 0.001
+        try:
+            self.CPC_METADATA_FETCH = cpc_config.CPC_METADATA_FETCH
+        except (NameError, AttributeError):
+            self.CPC_METADATA_FETCH = False
+        try:
+            self.CPC_METADATA_MAX_WORKERS = cpc_config.CPC_METADATA_MAX_WORKERS
+        except (NameError, AttributeError):
+            self.CPC_METADATA_MAX_WORKERS = 16
+        try:
+            self.CPC_METADATA_TIMEOUT = cpc_config.CPC_METADATA_TIMEOUT
+        except (NameError, AttributeError):
+            self.CPC_METADATA_TIMEOUT = 10.0
+        try:
+            self.CPC_METADATA_MAX_SIZE = cpc_config.CPC_METADATA_MAX_SIZE
+        except (NameError, AttributeError):
+            self.CPC_METADATA_MAX_SIZE = 512
+        try:
+            self.CPC_METADATA_RECHECK_HOURS = cpc_config.CPC_METADATA_RECHECK_HOURS
+        except (NameError, AttributeError):
+            self.CPC_METADATA_RECHECK_HOURS = 24
+        try:
+            self.CPC_METADATA_CACHE_FILENAME = cpc_config.CPC_METADATA_CACHE_FILENAME
+        except (NameError, AttributeError):
+            self.CPC_METADATA_CACHE_FILENAME = "pools_metadata_cache.json"
+        try:
+            self.CPC_EXTENDED_METADATA_FETCH = cpc_config.CPC_EXTENDED_METADATA_FETCH
+        except (NameError, AttributeError):
+            self.CPC_EXTENDED_METADATA_FETCH = False
+        try:
+            self.CPC_EXTENDED_METADATA_MAX_WORKERS = cpc_config.CPC_EXTENDED_METADATA_MAX_WORKERS
+        except (NameError, AttributeError):
+            self.CPC_EXTENDED_METADATA_MAX_WORKERS = 32
+        try:
+            self.CPC_EXTENDED_METADATA_MAX_PER_HOST = cpc_config.CPC_EXTENDED_METADATA_MAX_PER_HOST
+        except (NameError, AttributeError):
+            self.CPC_EXTENDED_METADATA_MAX_PER_HOST = 2
+        try:
+            self.CPC_EXTENDED_METADATA_TIMEOUT = cpc_config.CPC_EXTENDED_METADATA_TIMEOUT
+        except (NameError, AttributeError):
+            self.CPC_EXTENDED_METADATA_TIMEOUT = 10.0
+        try:
+            self.CPC_EXTENDED_METADATA_BUDGET = cpc_config.CPC_EXTENDED_METADATA_BUDGET
+        except (NameError, AttributeError):
+            self.CPC_EXTENDED_METADATA_BUDGET = 300.0
+        try:
+            self.CPC_EXTENDED_METADATA_MAX_SIZE = cpc_config.CPC_EXTENDED_METADATA_MAX_SIZE
+        except (NameError, AttributeError):
+            self.CPC_EXTENDED_METADATA_MAX_SIZE = 65536
+        try:
+            self.CPC_EXTENDED_METADATA_CACHE_FILENAME = cpc_config.CPC_EXTENDED_METADATA_CACHE_FILENAME
+        except (NameError, AttributeError):
+            self.CPC_EXTENDED_METADATA_CACHE_FILENAME = "pools_extended_metadata_cache.json"
+        try:
+            self.CPC_ASN_DATABASE = cpc_config.CPC_ASN_DATABASE
+        except (NameError, AttributeError):
+            self.CPC_ASN_DATABASE = None
+        try:
+            self.CPC_ASN_INDEX_FILENAME = cpc_config.CPC_ASN_INDEX_FILENAME
+        except (NameError, AttributeError):
+            self.CPC_ASN_INDEX_FILENAME = "asn_index.bin"
+        try:
+            self.CPC_ASN_FILENAME = cpc_config.CPC_ASN_FILENAME
+        except (NameError, AttributeError):
+            self.CPC_ASN_FILENAME = "pools_asn.json"
+        try:
+            self.CPC_PUBLISH_DIR = cpc_config.CPC_PUBLISH_DIR
+        except (NameError, AttributeError):
+            self.CPC_PUBLISH_DIR = None
+        try:
+            self.CPC_PUBLISH_FULL_INTERVAL = cpc_config.CPC_PUBLISH_FULL_INTERVAL
+        except (NameError, AttributeError):
+            self.CPC_PUBLISH_FULL_INTERVAL = 10
+        try:
+            self.CPC_PUBLISH_KEEP_SNAPSHOTS = cpc_config.CPC_PUBLISH_KEEP_SNAPSHOTS
+        except (NameError, AttributeError):
+            self.CPC_PUBLISH_KEEP_SNAPSHOTS = 3
 
     def _load_updates(self) -> None:
         try:
@@ -494,6 +1220,7 @@ class CardanoPoolChecker:
                 os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, self.CPC_POOLS_UPDATES_FILENAME)
             ) as file:
                 updates = json.load(file)
+                cpc_telemetry.count("bytes_read", file.tell())
                 if self._check_updates(updates):
                     self._updates = updates
                 else:
@@ -512,6 +1239,7 @@ class CardanoPoolChecker:
                 os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, self.CPC_POOLS_REGISTER_FILENAME)
             ) as file:
                 self._register = json.load(file)
+                cpc_telemetry.count("bytes_read", file.tell())
         except FileNotFoundError:
             print("Register File not found, creating a new one.")  # noqa: T201
             self.register = []
@@ -525,6 +1253,7 @@ class CardanoPoolChecker:
                 os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, self.CPC_POOLS_DNS_TRANSLATIONS_FILENAME),
             ) as file:
                 self._translations = json.load(file)
+                cpc_telemetry.count("bytes_read", file.tell())
         except FileNotFoundError:
             print("Translations File not found, creating a new one.")  # noqa: T201
             self.translations = {}
@@ -532,47 +1261,382 @@ class CardanoPoolChecker:
             msg = "Error reading the translations file."
             raise OSError(msg) from exc
 
+    def _load_translations_archive(self) -> None:
+        try:
+            with open(
+                os.path.join(
+                    os.path.dirname(__file__), self.CPC_DATA_DIR, self.CPC_POOLS_DNS_TRANSLATIONS_ARCHIVE_FILENAME
+                ),
+            ) as file:
+                self._translations_archive = json.load(file)
+                cpc_telemetry.count("bytes_read", file.tell())
+        except FileNotFoundError:
+            self._translations_archive = {}
+        except OSError as exc:
+            msg = "Error reading the translations archive file."
+            raise OSError(msg) from exc
+
+    def _load_manifest(self) -> None:
+        try:
+            with open(os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, self.CPC_MANIFEST_FILENAME)) as file:
+                self._manifest = json.load(file)
+                cpc_telemetry.count("bytes_read", file.tell())
+        except (FileNotFoundError, ValueError):
+            # Without a valid manifest every stage just runs again
+            self._manifest = {}
+        except OSError as exc:
+            msg = "Error reading the manifest file."
+            raise OSError(msg) from exc
+
+    def _snapshot_sources(self) -> list[str]:
+        return [
+            self.CPC_POOLS_UPDATES_FILENAME,
+            self.CPC_POOLS_REGISTER_FILENAME,
+            self.CPC_POOLS_DNS_TRANSLATIONS_FILENAME,
+            self.CPC_POOLS_DNS_TRANSLATIONS_ARCHIVE_FILENAME,
+        ]
+
+    def _load_snapshot(self) -> bool:  # noqa: C901, PLR0911
+        # Load the state from the snapshot if it matches the JSON files, returning whether it did
+        if not self.CPC_SNAPSHOT_FILENAME:
+            return False
+        directory = os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR)
+        try:
+            with open(os.path.join(directory, self.CPC_SNAPSHOT_FILENAME), "rb") as file:
+                snapshot = pickle.load(file)  # noqa: S301
+                cpc_telemetry.count("bytes_read", file.tell())
+        except Exception:  # noqa: BLE001
+            # Missing, truncated or incompatible snapshots fall back to the JSON files
+            return False
+        if (
+            not isinstance(snapshot, dict)
+            or snapshot.get("version") != SNAPSHOT_VERSION
+            or snapshot.get("archive_in_history") != self.CPC_TRANSLATIONS_ARCHIVE_IN_HISTORY
+            or set(snapshot.get("sources", {})) != set(self._snapshot_sources())
+        ):
+            return False
+        for filename, source in snapshot["sources"].items():
+            file_path = os.path.join(directory, filename)
+            if source is None or not os.path.isfile(file_path):
+                if source is None and not os.path.isfile(file_path):
+                    continue
+                return False
+            stat = os.stat(file_path)
+            if stat.st_size != source["size"]:
+                return False
+            # Files rewritten with the same content only change their modification time
+            if stat.st_mtime_ns != source["mtime_ns"]:
+                with open(file_path, "rb") as file:
+                    data = file.read()
+                cpc_telemetry.count("bytes_read", len(data))
+                if hashlib.blake2b(data).digest() != source["digest"]:
+                    return False
+            self._saved_digests[file_path] = (stat.st_mtime_ns, stat.st_size, source["digest"])
+        for name in SNAPSHOT_STATE:
+            setattr(self, name, snapshot["state"].get(name))
+        return True
+
+    def save_snapshot(self) -> None:
+        """Write a binary snapshot of the loaded state, including the translations indexes.
+
+        The snapshot records the modification time, size and digest of the JSON
+        files it was built from, and it's only loaded by later instances while
+        those files keep the same content. It's written after every successful
+        update when CPC_SNAPSHOT_FILENAME is set.
+        """
+        if not self.CPC_SNAPSHOT_FILENAME:
+            return
+        directory = os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR)
+        sources: dict[str, dict[str, Any] | None] = {}
+        for filename in self._snapshot_sources():
+            file_path = os.path.join(directory, filename)
+            digest = self._file_digest(filename)
+            if digest is None:
+                sources[filename] = None
+                continue
+            stat = os.stat(file_path)
+            sources[filename] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "digest": digest}
+        # Build the indexes that were not needed yet, so they are stored too
+        self.translations_index  # noqa: B018
+        self.translations_history_index  # noqa: B018
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "archive_in_history": self.CPC_TRANSLATIONS_ARCHIVE_IN_HISTORY,
+            "sources": sources,
+            "state": {name: getattr(self, name, None) for name in SNAPSHOT_STATE},
+        }
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                pickle.dump(snapshot, file, protocol=5)
+                cpc_telemetry.count("bytes_written", file.tell())
+            os.replace(temp_path, os.path.join(directory, self.CPC_SNAPSHOT_FILENAME))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
     @staticmethod
     def _download_json(url: str) -> Any:
-        resp = http.request("GET", url)
-        if str(resp.status) == "200":
-            return json.loads(resp.data)
+        for attempt in range(KOIOS_RETRIES + 1):
+            if attempt:
+                cpc_telemetry.count("koios_retries")
+                time.sleep(KOIOS_RETRY_BACKOFF * 2 ** (attempt - 1))
+            cpc_telemetry.count("http_requests")
+            try:
+                resp = http.request("GET", url)
+            except HTTPError:
+                cpc_telemetry.count("koios_errors")
+                continue
+            if str(resp.status) == "200":
+                return json.loads(resp.data)
+            cpc_telemetry.count("koios_errors")
         print("An error occurred while downloading data")  # noqa: T201
         sys.exit(1)
 
     def _save_json(self, filename: str, data: Any) -> None:
-        directory = os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR)
-        os.makedirs(directory, exist_ok=True)  # Create the directory if it doesn't exist
-        file_path = os.path.join(directory, filename)
-        with open(file_path, "w") as file:
-            json.dump(data, file, indent=4)
-
+        file_path = os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, filename)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)  # Create the directory if it doesn't exist
+        text = json.dumps(data, indent=4)
+        # Files are only rewritten when their content changes, so a long running
+        # instance republishes just the outputs that changed since its last write.
+        digest = hashlib.blake2b(text.encode()).digest()
+        # Compare with the file written by this instance or a previous run, keeping
+        # its modification time as the time of the last change of the content.
+        if self._cached_digest(file_path, len(text.encode())) == digest:
+            # Still mark the file as up to date for the stages staleness checks
+            os.utime(file_path)
+        else:
+            with open(file_path, "w") as file:
+                file.write(text)
+            cpc_telemetry.count("bytes_written", len(text))
+        stat = os.stat(file_path)
+        self._saved_digests[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+
+    def _cached_digest(self, file_path: str, size: int | None = None) -> bytes | None:
+        # Digest of a file, None if it doesn't exist or its size isn't the given one. The
+        # file is only read when its modification time or size changed since the digest
+        # was cached, like when it's edited by another process.
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        if size is not None and stat.st_size != size:
+            return None
+        cached = self._saved_digests.get(file_path)
+        if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+            with open(file_path, "rb") as file:
+                cached = (stat.st_mtime_ns, stat.st_size, hashlib.blake2b(file.read()).digest())
+            self._saved_digests[file_path] = cached
+        return cached[2]
+
+    def _file_digest(self, filename: str) -> bytes | None:
+        # Digest of a data file, None if it doesn't exist
+        return self._cached_digest(os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, filename))
+
+    def _settings_digest(self) -> bytes:
+        # Digest of the settings and the code of every module of the package, which
+        # can change the outputs of any stage, like the filters, ASN and publisher ones
+        settings = {name: value for name, value in vars(self).items() if name.startswith("CPC_")}
+        digest = hashlib.blake2b(json.dumps(settings, sort_keys=True, default=str).encode())
+        directory = os.path.dirname(__file__)
+        for name in sorted(os.listdir(directory)):
+            if name.startswith("cardano_pool_checker_") and name.endswith(".py"):
+                digest.update(name.encode())
+                with open(os.path.join(directory, name), "rb") as file:
+                    digest.update(file.read())
+        return digest.digest()
+
+    def _stage_fingerprint(self, stage: Stage, settings_digest: bytes) -> str:
+        # Fingerprint of everything the outputs of a stage depend on
+        fingerprint = hashlib.blake2b(settings_digest)
+        fingerprint.update(stage.name.encode())
+        for filename in stage.inputs:
+            fingerprint.update(filename.encode())
+            fingerprint.update(self._file_digest(filename) or b"missing")
+        if stage.name in CURRENT_WINDOW_STAGES:
+            # The relays leave the window as time passes, so the outputs are reused within the hour
+            fingerprint.update(str(int(time.time() // 3600)).encode())
+        return fingerprint.hexdigest()
+
+    def _reuse_unchanged(self, stage: Stage, settings_digest: bytes, reused: list[str]) -> Callable[[], Any]:
+        """Return the stage function, skipping it when its inputs didn't change since its last run.
+
+        The stage is skipped when the fingerprint of its input files and the
+        settings matches the one in the manifest and its outputs still have the
+        digests they had after that run. Otherwise the stage runs and, once
+        done, its new fingerprint is recorded in the manifest.
+
+        Args:
+            stage (Stage): The stage, with some input files.
+            settings_digest (bytes): Digest of the settings and the code.
+            reused (list[str]): List where the names of the skipped stages are appended.
+
+        Returns:
+            Callable[[], Any]: The wrapped stage function.
+        """
+        func = stage.func
+
+        def wrapped() -> Any:
+            fingerprint = self._stage_fingerprint(stage, settings_digest)
+            entry = self.manifest.get(stage.name, {})
+            outputs = entry.get("outputs", {})
+            if (
+                entry.get("fingerprint") == fingerprint
+                and set(outputs) == set(stage.outputs)
+                and all((self._file_digest(name) or b"").hex() == digest for name, digest in outputs.items())
+            ):
+                # Mark the reused outputs as up to date for the stages staleness checks
+                for name in stage.outputs:
+                    os.utime(os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, name))
+                if stage.name == "register":
+                    # The following stages read the register from memory
+                    self._load_register()
+                reused.append(stage.name)
+                current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                print(f"[{current_time}] Inputs of {stage.name} unchanged, reusing its outputs.")  # noqa: T201
+                return None
+            self.manifest.pop(stage.name, None)
+            result = func()
+            digests = {name: self._file_digest(name) for name in stage.outputs}
+            if all(digests.values()):
+                self.manifest[stage.name] = {
+                    "fingerprint": fingerprint,
+                    "outputs": {name: digest.hex() for name, digest in digests.items() if digest},
+                }
+            return result
+
+        return wrapped
+
     def info(self) -> None:
         """Print program information."""
         print("\nCardano Pool Checker v1.0.0\n")  # noqa: T201
 
-    def update(self) -> None:
+    def update(
+        self,
+        only: list[str] | None = None,
+        skip: list[str] | None = None,
+        allow_stale: bool | list[str] = False,  # noqa: FBT002
+    ) -> None:
         """Update all the stake pools information in the "pools" directory.
 
         Update all the stake pools information, including the list of pools,
         the pool updates register, the hostnames translations, and the shared
         resources lists used for multi pool operators detection. The data is
         then saved in the "pools" directory under the project's root.
+
+        The stages whose input files and settings did not change since their
+        last run are skipped, reusing their outputs, and listed under "reused"
+        in the run report.
+
+        Args:
+            only (list[str] | None, optional): Names of the stages to run, None for all.
+                See select_update_stages. Defaults to None.
+            skip (list[str] | None, optional): Names of the stages not to run. Defaults to None.
+            allow_stale (bool | list[str], optional): Run even if the outputs of some skipped
+                stage are stale, or the names of the stages allowed to be stale. Defaults to False.
         """
         self.info()
-        # Download a simple list of pools
-        self.set_pools()
-        # Update the updates incrementally.
-        since = self.last_block_time
-        new_updates = self.build_updates(since)
-        if new_updates:
-            if self._updates:
-                # setter decorator is not triggered by .extend
-                self.updates = self.updates + new_updates
-            else:
-                self.updates = new_updates
-        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{current_time}] Pools updates: {len(new_updates)} new downloaded.")  # noqa: T201
+        profile_dir = None
+        if self.CPC_PROFILE_STAGES:
+            profile_dir = os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, self.CPC_PROFILE_DIR)
+        telemetry = Telemetry(self.CPC_TELEMETRY_TRACE_MEMORY, profile_dir)
+        stages = self.select_update_stages(only, skip, allow_stale)
+        # Outputs can only be reused when they are saved
+        reuse = self.CPC_REUSE_UNCHANGED_STAGES and self.CPC_SAVE_TO_DISK
+        reused: list[str] = []
+        settings_digest = b""
+        if reuse:
+            self._load_manifest()
+            settings_digest = self._settings_digest()
+        for stage in stages:
+            if reuse and stage.inputs:
+                stage.func = self._reuse_unchanged(stage, settings_digest, reused)
+            stage.func = telemetry.wrap(stage.name, stage.func)
+        # Only one profiler can be active at once in some python versions
+        pipeline = Pipeline(stages, 1 if profile_dir else self.CPC_PIPELINE_MAX_WORKERS)
+        telemetry.start()
+        try:
+            pipeline.run()
+        finally:
+            report = telemetry.stop(pipeline.status)
+            report["reused"] = sorted(reused)
+            self.run_report = report
+            if reuse:
+                self.manifest = self._manifest
+            if self.CPC_METRICS_TEXTFILE:
+                self.export_metrics(report)
+        pipeline.raise_for_status()
+        if self.CPC_SAVE_TO_DISK:
+            self.save_snapshot()
+
+    def _data_file_length(self, filename: str) -> int | None:
+        # Number of entries of a data file, None if it can't be read
+        try:
+            with open(os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, filename)) as file:
+                return len(json.load(file))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def record_counts(self) -> dict[str, Any]:
+        """Count the records of the data files.
+
+        Returns:
+            dict[str, Any]: The number of "pools", "updates", pools in the "register" and
+                tracked "hostnames", and the entries by file name of the "sharing" maps
+                and of the classification "rules" files.
+        """
+        pools = getattr(self, "_pools", None)
+        counts: dict[str, Any] = {
+            "pools": len(pools) if pools is not None else self._data_file_length(self.CPC_POOLS_LIST_FILENAME),
+            "updates": len(self.updates),
+            "register": len(self.register),
+            "hostnames": len(self.translations),
+            "sharing": {},
+            "rules": {},
+        }
+        for stage in self.build_update_stages():
+            if stage.name.startswith("registered_"):
+                for filename in stage.outputs:
+                    entries = self._data_file_length(filename)
+                    if entries is not None:
+                        counts["sharing"][filename] = entries
+        for rule in self.CPC_MSPO_RULES:
+            for key in ("matching_file", "non_matching_file"):
+                entries = self._data_file_length(str(rule[key]))
+                if entries is not None:
+                    counts["rules"][str(rule[key])] = entries
+        return counts
+
+    def export_metrics(self, report: dict[str, Any] | None = None) -> None:
+        """Write the metrics of the last update to the CPC_METRICS_TEXTFILE Prometheus file.
+
+        Nothing is written when CPC_METRICS_TEXTFILE is not set.
+
+        Args:
+            report (dict[str, Any] | None, optional): The run report, None to use the
+                run_report attribute. Defaults to None.
+        """
+        if not self.CPC_METRICS_TEXTFILE:
+            return
+        if report is None:
+            report = self.run_report
+        path = os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, self.CPC_METRICS_TEXTFILE)
+        text = cpc_metrics.build_metrics(
+            report, self.record_counts(), self.last_block_time, cpc_metrics.read_last_success(path)
+        )
+        cpc_metrics.write_textfile(path, text)
+
+    def build_update_stages(self) -> list[Stage]:
+        """Build the stages of the update pipeline and their dependencies.
+
+        The pools list download is independent of the updates and the register,
+        and only the detectors comparing IP addresses need the DNS translations,
+        so those branches can run concurrently.
+
+        Returns:
+            list[Stage]: The stages run by the update method.
+        """
         # Icremental registry updates needs more testing, just passing
         # the current register and the new updates depends on the good
         # state of the register file. It may be required to look in the
@@ -580,15 +1644,294 @@ class CardanoPoolChecker:
         # sync, and this, among others, reduces the cost benefits of
         # incremental mode. Some benchmarking is needed.
         # For now, rebuild the register entirely with each update.
-        self.set_register()
-        self.set_translations()
-        self.set_all_sharing()
-        self.set_classified_pools()
+        stages = [
+            Stage("pools", self.set_pools, outputs=[self.CPC_POOLS_LIST_FILENAME]),
+            Stage("updates", self.extend_updates, outputs=[self.CPC_POOLS_UPDATES_FILENAME]),
+            Stage(
+                "register",
+                self.set_register,
+                ["updates"],
+                outputs=[self.CPC_POOLS_REGISTER_FILENAME],
+                inputs=[self.CPC_POOLS_UPDATES_FILENAME],
+            ),
+            Stage(
+                "translations", self.set_translations, ["register"], outputs=[self.CPC_POOLS_DNS_TRANSLATIONS_FILENAME]
+            ),
+            Stage(
+                "compaction",
+                self.set_compacted_translations,
+                ["translations"],
+                outputs=[self.CPC_POOLS_DNS_TRANSLATIONS_FILENAME, self.CPC_POOLS_DNS_TRANSLATIONS_ARCHIVE_FILENAME],
+            ),
+        ]
+        register_detectors: list[Callable[..., None]] = [
+            self.set_registered_currently_sharing_relay_hostname,
+            self.set_registered_currently_sharing_meta_json_homepage,
+            self.set_registered_currently_sharing_meta_url,
+            self.set_registered_currently_sharing_owners,
+            self.set_registered_currently_sharing_reward_addr,
+            self.set_registered_currently_similar_meta_json,
+            self.set_registered_sharing_relay_hostname,
+            self.set_registered_sharing_meta_json_homepage,
+            self.set_registered_sharing_meta_url,
+            self.set_registered_sharing_owners,
+            self.set_registered_sharing_reward_addr,
+            self.set_registered_similar_meta_json,
+        ]
+        translations_detectors: list[Callable[..., None]] = [
+            self.set_registered_currently_sharing_relay_ipv4,
+            self.set_registered_currently_sharing_relay_ipv6,
+            self.set_registered_sharing_relay_ipv4,
+            self.set_registered_sharing_relay_ipv6,
+            self.set_registered_sharing_relay_endpoints,
+        ]
+        # The pools, updates and translations stages read the network and the compaction
+        # depends on the current time. The rest are reused while their input files don't
+        # change, and the ones using the recently resolved relays only within the same hour.
+        translations_inputs = [
+            self.CPC_POOLS_REGISTER_FILENAME,
+            self.CPC_POOLS_DNS_TRANSLATIONS_FILENAME,
+            self.CPC_POOLS_DNS_TRANSLATIONS_ARCHIVE_FILENAME,
+        ]
+        detectors = []
+        detectors_outputs = []
+        # Detectors depending on a download other than the updates, when it fails the
+        # classification still runs with the files they wrote in the previous update
+        network_detectors = []
+        for deps, inputs, setters in (
+            (["register"], [self.CPC_POOLS_REGISTER_FILENAME], register_detectors),
+            (["compaction"], translations_inputs, translations_detectors),
+        ):
+            for setter in setters:
+                name = setter.__name__.removeprefix("set_")
+                outputs = [name + ".json"]
+                if name == "registered_sharing_relay_endpoints":
+                    outputs = [
+                        "registered_currently_sharing_relay_endpoint.json",
+                        "registered_sharing_relay_endpoint.json",
+                    ]
+                stages.append(Stage(name, setter, deps, outputs=outputs, inputs=inputs))
+                detectors.append(name)
+                detectors_outputs += outputs
+                if deps == ["compaction"]:
+                    network_detectors.append(name)
+        if self.CPC_METADATA_FETCH:
+            # Downloads the metadata, so it has no reusable inputs
+            stages.append(
+                Stage(
+                    "metadata",
+                    self.set_verified_metadata,
+                    ["register"],
+                    outputs=[
+                        self.CPC_METADATA_CACHE_FILENAME,
+                        "registered_currently_unreachable_meta_url.json",
+                        "registered_currently_mismatched_meta_hash.json",
+                    ],
+                )
+            )
+            detectors.append("metadata")
+            network_detectors.append("metadata")
+            detectors_outputs += stages[-1].outputs[1:]
+        if self.CPC_EXTENDED_METADATA_FETCH:
+            # The crawl downloads the extended metadata and the detector only reads its cache
+            stages.append(
+                Stage(
+                    "extended_metadata",
+                    self.set_extended_metadata,
+                    ["register"],
+                    outputs=[self.CPC_EXTENDED_METADATA_CACHE_FILENAME],
+                )
+            )
+            stages.append(
+                Stage(
+                    "registered_currently_sharing_extended_operator",
+                    self.set_registered_currently_sharing_extended_operator,
+                    ["register", "extended_metadata"],
+                    outputs=["registered_currently_sharing_extended_operator.json"],
+                    inputs=[self.CPC_POOLS_REGISTER_FILENAME, self.CPC_EXTENDED_METADATA_CACHE_FILENAME],
+                )
+            )
+            detectors.append("registered_currently_sharing_extended_operator")
+            network_detectors.append("registered_currently_sharing_extended_operator")
+            detectors_outputs += stages[-1].outputs
+        if self.CPC_ASN_DATABASE:
+            stages.append(
+                Stage(
+                    "asn",
+                    self.set_asn_concentration,
+                    ["compaction"],
+                    outputs=[self.CPC_ASN_FILENAME],
+                    inputs=[*translations_inputs, self.CPC_ASN_DATABASE],
+                )
+            )
+        # The classification reads the pools list and the files of all the detectors
+        outputs = [str(rule[key]) for rule in self.CPC_MSPO_RULES for key in ("matching_file", "non_matching_file")]
+        stages.append(
+            Stage(
+                "classified_pools",
+                self.set_classified_pools,
+                ["pools", *detectors],
+                outputs=outputs,
+                inputs=[self.CPC_POOLS_LIST_FILENAME, *detectors_outputs],
+                optional_deps=network_detectors,
+            )
+        )
+        # The pools report gathers everything about every pool from the files above
+        stages.append(
+            Stage(
+                "pool_report",
+                self.set_pool_report,
+                ["classified_pools"],
+                outputs=[self.CPC_POOLS_REPORT_FILENAME, *self.pool_report_shards()],
+                inputs=[
+                    self.CPC_POOLS_LIST_FILENAME,
+                    *detectors_outputs,
+                    *[str(rule["matching_file"]) for rule in self.CPC_MSPO_RULES],
+                ],
+            )
+        )
+        matching_files = [str(rule["matching_file"]) for rule in self.CPC_MSPO_RULES]
+        stages.append(
+            Stage(
+                "membership_filters",
+                self.set_membership_filters,
+                ["classified_pools"],
+                outputs=[self.membership_filter_filename(filename) for filename in matching_files],
+                inputs=matching_files,
+            )
+        )
+        # The changes compare with the previous update, so they have no reusable inputs
+        stages.append(
+            Stage(
+                "changes",
+                self.set_changes,
+                ["classified_pools"],
+                outputs=[self.CPC_CHANGES_FILENAME, self.CPC_CHANGES_STATE_FILENAME],
+            )
+        )
+        if self.CPC_PUBLISH_DIR:
+            stages.append(
+                Stage(
+                    "publish",
+                    self.publish,
+                    ["classified_pools", "pool_report"],
+                    outputs=[os.path.join(self.CPC_PUBLISH_DIR, cpc_publisher.INDEX_FILENAME)],
+                )
+            )
+        for stage in stages:
+            stage.timeout = self.CPC_STAGE_TIMEOUTS.get(stage.name)
+        return stages
+
+    def select_update_stages(  # noqa: C901
+        self,
+        only: list[str] | None = None,
+        skip: list[str] | None = None,
+        allow_stale: bool | list[str] = False,  # noqa: FBT002
+    ) -> list[Stage]:
+        """Select a part of the update stages, checking that they won't read stale inputs.
+
+        A skipped stage is stale when some of its output files is missing or older
+        than the outputs of a stage it depends on, when one of those stages is stale
+        too, or when one of those stages is going to run. Running a stage that
+        depends on a stale skipped stage raises an error, unless allowed.
+
+        Args:
+            only (list[str] | None, optional): Names of the stages to run, None for all.
+                The name "detectors" selects all the sharing detectors. Defaults to None.
+            skip (list[str] | None, optional): Names of the stages not to run, it also
+                accepts "detectors". Defaults to None.
+            allow_stale (bool | list[str], optional): Don't check the staleness of the
+                skipped stages, or the names of the skipped stages allowed to be stale.
+                Defaults to False.
+
+        Returns:
+            list[Stage]: The selected stages, depending on the selected stages their skipped
+                dependencies depend on.
+
+        Raises:
+            ValueError: If a stage name is unknown or a selected stage depends on a stale one.
+        """
+        stages = {stage.name: stage for stage in self.build_update_stages()}
+        detectors = [name for name, stage in stages.items() if name.startswith("registered_")]
+
+        def expand(names: list[str]) -> set[str]:
+            expanded = set()
+            for name in names:
+                if name == "detectors":
+                    expanded.update(detectors)
+                elif name in stages:
+                    expanded.add(name)
+                else:
+                    msg = f"Unknown stage {name}, use one of: {', '.join([*stages, 'detectors'])}."
+                    raise ValueError(msg)
+            return expanded
+
+        selected = set(stages) if only is None else expand(only)
+        selected -= expand(skip or [])
+        if allow_stale is not True:
+            allowed = set() if allow_stale is False else expand(list(allow_stale))
+            directory = os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR)
+
+            def mtime(stage: Stage) -> float | None:
+                # Time of the oldest output of the stage, None if some output is missing
+                paths = [os.path.join(directory, output) for output in stage.outputs]
+                if not all(os.path.isfile(path) for path in paths):
+                    return None
+                return min((os.path.getmtime(path) for path in paths), default=0.0)
+
+            stale: dict[str, bool] = {}
+
+            def is_stale(name: str) -> bool:
+                if name in selected or name in allowed:
+                    return False
+                if name not in stale:
+                    my_mtime = mtime(stages[name])
+                    stale[name] = my_mtime is None
+                    for dep in stages[name].deps:
+                        dep_mtime = mtime(stages[dep])
+                        if dep in selected or is_stale(dep) or (dep_mtime or 0.0) > (my_mtime or 0.0):
+                            stale[name] = True
+                return stale[name]
+
+            problems = sorted(
+                {dep for name in selected for dep in stages[name].deps if dep not in selected and is_stale(dep)}
+            )
+            if problems:
+                msg = (
+                    f"Skipped stages with stale or missing outputs: {', '.join(problems)}. "
+                    "Run them too or allow stale inputs."
+                )
+                raise ValueError(msg)
+
+        def selected_deps(name: str, *, optional: bool = False) -> dict[str, bool]:
+            # Replace the skipped dependencies by the selected ones they depend on, to keep the order,
+            # with whether they are only reached through optional dependencies
+            deps: dict[str, bool] = {}
+            for dep in stages[name].deps:
+                dep_optional = optional or dep in stages[name].optional_deps
+                found = {dep: dep_optional} if dep in selected else selected_deps(dep, optional=dep_optional)
+                for selected_dep, selected_optional in found.items():
+                    deps[selected_dep] = deps.get(selected_dep, True) and selected_optional
+            return deps
+
+        selected_stages = []
+        for stage in stages.values():
+            if stage.name in selected:
+                deps = selected_deps(stage.name)
+                optional_deps = [dep for dep, optional in deps.items() if optional]
+                selected_stages.append(
+                    Stage(stage.name, stage.func, deps, stage.timeout, stage.outputs, stage.inputs, optional_deps)
+                )
+        return selected_stages
 
     @classmethod
-    def build_pools(cls) -> list[dict[str, str | None]]:
+    def build_pools(cls, koios_url: str = KOIOS_URL) -> list[dict[str, str | None]]:
         """Build a complete list of stake pools using Koios API.
 
+        Args:
+            koios_url (str, optional): Base URL of the Koios API, ending with a slash.
+                Defaults to KOIOS_URL.
+
         Returns:
             list[dict[str, str | None]]: Returns a list of stake pools
                 containing the pool_id_bech32 and ticker.
@@ -598,7 +1941,7 @@ class CardanoPoolChecker:
         koios_pool_list = []
         pool_range = range(0, 100000, pagesize)
         for offset in pool_range:
-            url = "https://api.koios.rest/api/v0/pool_list?offset=" + str(offset) + "&limit=" + str(pagesize)
+            url = koios_url + "pool_list?offset=" + str(offset) + "&limit=" + str(pagesize)
             fetched = cls._download_json(url)
             koios_pool_list.extend(fetched)
             if len(fetched) < pagesize:
@@ -607,7 +1950,7 @@ class CardanoPoolChecker:
 
     def set_pools(self) -> None:
         """Update the pools attribute with new data coming from build_pools call."""
-        self.pools = self.build_pools()
+        self.pools = self.build_pools(self.CPC_KOIOS_URL)
         current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
         print(f"[{current_time}] Simple list with {len(self._pools)} pools downloaded.")  # noqa: T201
 
@@ -630,7 +1973,7 @@ class CardanoPoolChecker:
         return result
 
     @classmethod
-    def build_updates(cls, since: int = 0) -> list[Any]:
+    def build_updates(cls, since: int = 0, koios_url: str = KOIOS_URL) -> list[Any]:
         """Download the pool updates from Koios API.
 
         Args:
@@ -638,6 +1981,8 @@ class CardanoPoolChecker:
                 obtaining register updates. If None, the current updates attribute
                 is used to get the last entry block time to start from there.
                 Defaults to None.
+            koios_url (str, optional): Base URL of the Koios API, ending with a slash.
+                Defaults to KOIOS_URL.
 
         Returns:
             list[Any]: Rerun a list with the updates.
@@ -651,7 +1996,8 @@ class CardanoPoolChecker:
             iteration = 0
             while True:
                 fetched = cls._download_json(
-                    "https://api.koios.rest/api/v0/pool_updates?block_time=gt."
+                    koios_url
+                    + "pool_updates?block_time=gt."
                     + str(since)
                     + "&order=block_time.asc&offset="
                     + str(batchsize * iteration)
@@ -664,6 +2010,18 @@ class CardanoPoolChecker:
                     break
         return list(updates_list)
 
+    def extend_updates(self) -> None:
+        """Extend the updates attribute with the ones newer than the last known block time."""
+        new_updates = self.build_updates(self.last_block_time, self.CPC_KOIOS_URL)
+        if new_updates:
+            if self._updates:
+                # setter decorator is not triggered by .extend
+                self.updates = self.updates + new_updates
+            else:
+                self.updates = new_updates
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[{current_time}] Pools updates: {len(new_updates)} new downloaded.")  # noqa: T201
+
     def set_updates(self, since: int | None = None) -> None:
         """Update the updates attribute with new data coming from build_updates call.
 
@@ -675,7 +2033,7 @@ class CardanoPoolChecker:
         """
         if since is None:
             since = self.last_block_time
-        new_updates = self.build_updates(since)
+        new_updates = self.build_updates(since, self.CPC_KOIOS_URL)
         self.updates.extend(new_updates)
         current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
         print(f"[{current_time}] Pools updates: {len(new_updates)} new downloaded.")  # noqa: T201
@@ -883,64 +2241,164 @@ class CardanoPoolChecker:
         current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
         print(f"[{current_time}] Pools register: rebuilt for {len(self._register)} stake pools.")  # noqa: T201
 
+    @staticmethod
+    def _ip_family(resolved_ip: str) -> tuple[str, str]:
+        # Return the translations family key and the address as stored, with
+        # the IPv6 addresses unshortened.
+        resolved_ip_obj = ipaddress.ip_address(resolved_ip)
+        if resolved_ip_obj.version == 6:  # noqa: PLR2004
+            return "6", str(resolved_ip_obj.exploded)
+        return "4", str(resolved_ip_obj)
+
+    @staticmethod
+    def _add_translation(  # noqa: PLR0913
+        translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]],
+        hostname: str,
+        family: str,
+        value: str,
+        pool_id: str,
+        my_time: float,
+        index: dict[str, dict[str, dict[str, float]]] | None = None,
+    ) -> None:
+        pools = translations.setdefault(hostname, {}).setdefault(family, {}).setdefault(value, {})
+        if pool_id not in pools:
+            pools[pool_id] = {"first": my_time, "last": my_time}
+        else:
+            pools[pool_id]["last"] = my_time
+        # Keep the reverse index of the IP addresses up to date
+        if index is not None and family in ("4", "6"):
+            index_pools = index.setdefault(family, {}).setdefault(value, {})
+            index_pools[pool_id] = max(index_pools.get(pool_id, my_time), my_time)
+
+    @classmethod
+    def build_translations_index(  # noqa: C901
+        cls, translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None
+    ) -> dict[str, dict[str, dict[str, float]]]:
+        """Build a reverse index of the translations keyed by IP address.
+
+        Args:
+            translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
+                Hostname translations dictionary to index. Defaults to None.
+
+        Returns:
+            dict[str, dict[str, dict[str, float]]]: Dictionary with the "4" and "6" families,
+                each one containing the resolved IPs with the pools they were resolved for,
+                and the last time they were seen as a timestamp.
+        """
+        if translations is None:
+            translations = {}
+        index: dict[str, dict[str, dict[str, float]]] = {"4": {}, "6": {}}
+        if isinstance(translations, dict):
+            for hostname_data in translations.values():
+                if not isinstance(hostname_data, dict):
+                    continue
+                for family in ("4", "6"):
+                    for resolved_ip, resolved_ip_data in hostname_data.get(family, {}).items():
+                        if not isinstance(resolved_ip_data, dict):
+                            continue
+                        if family == "6":
+                            resolved_ip = cls._unshorten_ipv6(resolved_ip)  # noqa: PLW2901
+                        index_pools = index[family].setdefault(resolved_ip, {})
+                        for mypool, pool_data in resolved_ip_data.items():
+                            if isinstance(pool_data, dict) and pool_data.get("last") is not None:
+                                index_pools[mypool] = max(index_pools.get(mypool, pool_data["last"]), pool_data["last"])
+        return index
+
     @classmethod
-    def build_translations(  # noqa: PLR0912, C901
+    def build_translations(  # noqa: C901, PLR0912, PLR0913
         cls,
         register: list[dict[str, Any]] | None = None,
         translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+        max_workers: int = 32,
+        timeout: float = 5.0,
+        index: dict[str, dict[str, dict[str, float]]] | None = None,
     ) -> dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]:
         """Build a hostname translations dictionary from the hosts in a pools registry.
 
+        Relays registered with a hostname are resolved querying in parallel their
+        A and AAAA records, also recording under the "cname" key the CNAME chain
+        followed, and relays registered with a SRV record are expanded to their
+        targets, which are also resolved and stored under the SRV name. Every
+        name is resolved once per run even when it's shared between pools, and
+        the lookups are done concurrently.
+
         Args:
             register (list[dict[str, Any]] | None, optional): Register of pools to analyse.
                 Defaults to None.
             translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
                 Dictionary with existent translations to extend with new ones. Defaults to None.
+            max_workers (int, optional): Maximum number of concurrent DNS lookups. Defaults to 32.
+            timeout (float, optional): Time limit in seconds for each DNS lookup. Defaults to 5.0.
+            index (dict[str, dict[str, dict[str, float]]] | None, optional): Reverse index of the
+                translations, as returned by build_translations_index, updated in place with the
+                new translations when passed. Defaults to None.
 
         Returns:
             dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]:
                 Dictionary with the updated translations.
         """
-        # Iterate the registered pools to create a list of IPs from hostnames
         if translations is None:
             translations = {}
         if register is None:
             register = []
+        # Iterate the registered pools to collect the pools using each hostname or SRV name
+        hostnames: dict[str, list[str]] = {}
+        srv_names: dict[str, list[str]] = {}
         registered_pools = [pool for pool in register if pool.get("pool_status") == "registered"]
         for pool in registered_pools:
             for relay in pool["relays"]:
-                if relay["dns"] is not None:
-                    resolved_ips = cls._resolve_a_records(relay["dns"])  # Assuming resolve_a_records() is defined
-                    my_time = time.time()
-                    for resolved_ip in resolved_ips:
-                        resolved_ip_obj = ipaddress.ip_address(resolved_ip)
-                        if translations.get(relay["dns"]) is None:
-                            translations[relay["dns"]] = {}
-                        if resolved_ip_obj.version == 4:  # noqa: PLR2004
-                            if translations[relay["dns"]].get("4") is None:
-                                translations[relay["dns"]]["4"] = {}
-                            if resolved_ip not in translations[relay["dns"]]["4"]:
-                                translations[relay["dns"]]["4"][resolved_ip] = {}
-                            if pool["pool_id_bech32"] not in translations[relay["dns"]]["4"][resolved_ip]:
-                                translations[relay["dns"]]["4"][resolved_ip][pool["pool_id_bech32"]] = {
-                                    "first": my_time,
-                                    "last": my_time,
-                                }
-                            else:
-                                translations[relay["dns"]]["4"][resolved_ip][pool["pool_id_bech32"]]["last"] = my_time
-                        elif resolved_ip_obj.version == 6:  # noqa: PLR2004
-                            resolved_ipv6 = cls._unshorten_ipv6(resolved_ip)
-                            if translations[relay["dns"]].get("6") is None:
-                                translations[relay["dns"]]["6"] = {}
-                            if resolved_ipv6 not in translations[relay["dns"]]["6"]:
-                                translations[relay["dns"]]["6"][resolved_ipv6] = {}
-                            if pool["pool_id_bech32"] not in translations[relay["dns"]]["6"][resolved_ipv6]:
-                                translations[relay["dns"]]["6"][resolved_ipv6][pool["pool_id_bech32"]] = {
-                                    "first": my_time,
-                                    "last": my_time,
-                                }
-                            else:
-                                translations[relay["dns"]]["6"][resolved_ipv6][pool["pool_id_bech32"]]["last"] = my_time
+                for field, names in (("dns", hostnames), ("srv", srv_names)):
+                    if relay.get(field) is not None:
+                        pools = names.setdefault(relay[field], [])
+                        if pool["pool_id_bech32"] not in pools:
+                            pools.append(pool["pool_id_bech32"])
+
+        @cpc_telemetry.propagate
+        def resolve(hostname: str, rdtype: str) -> tuple[list[str], list[str], float]:
+            resolved_ips, chain = cls._resolve_records(hostname, rdtype, timeout)
+            return resolved_ips, chain, time.time()
+
+        resolve_srv = cpc_telemetry.propagate(cls._resolve_srv_records)
+
+        # Resolve the hostnames and SRV names concurrently, submitting the SRV
+        # targets as soon as they are known unless they were already submitted.
+        # The A and AAAA queries of every name are also issued in parallel.
+        srv_targets: dict[str, list[str]] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            host_futures = {
+                hostname: [executor.submit(resolve, hostname, rdtype) for rdtype in ("A", "AAAA")]
+                for hostname in hostnames
+            }
+            srv_futures = {executor.submit(resolve_srv, srv_name, timeout): srv_name for srv_name in srv_names}
+            for future in as_completed(srv_futures):
+                srv_targets[srv_futures[future]] = future.result()
+                for target in srv_targets[srv_futures[future]]:
+                    if target not in host_futures:
+                        host_futures[target] = [executor.submit(resolve, target, rdtype) for rdtype in ("A", "AAAA")]
+        cpc_telemetry.count("dns_queries", len(srv_futures) + 2 * len(host_futures))
+        resolved: dict[str, tuple[list[str], list[str], float]] = {}
+        for hostname, futures in host_futures.items():
+            (ipv4_ips, ipv4_chain, ipv4_time), (ipv6_ips, ipv6_chain, ipv6_time) = (
+                future.result() for future in futures
+            )
+            resolved[hostname] = (ipv4_ips + ipv6_ips, ipv4_chain or ipv6_chain, max(ipv4_time, ipv6_time))
+        # Store the translations and the CNAME chain of each name for every pool using it,
+        # the chain is kept in order under the "cname" key ending with the canonical name.
+        for hostname, pools in hostnames.items():
+            resolved_ips, chain, my_time = resolved[hostname]
+            for pool_id in pools:
+                for resolved_ip in resolved_ips:
+                    cls._add_translation(translations, hostname, *cls._ip_family(resolved_ip), pool_id, my_time, index)
+                for alias in chain:
+                    cls._add_translation(translations, hostname, "cname", alias, pool_id, my_time)
+        for srv_name, pools in srv_names.items():
+            for target in srv_targets.get(srv_name, []):
+                resolved_ips, _, my_time = resolved[target]
+                for resolved_ip in resolved_ips:
+                    for pool_id in pools:
+                        cls._add_translation(
+                            translations, srv_name, *cls._ip_family(resolved_ip), pool_id, my_time, index
+                        )
         return translations
 
     def set_translations(
@@ -958,14 +2416,173 @@ class CardanoPoolChecker:
         """
         if register is None:
             register = self._register
+        index = None
         if translations is None:
             translations = self._translations
-        self.translations = self.build_translations(register, translations)
+            index = self.translations_index
+        self.translations = self.build_translations(
+            register, translations, self.CPC_DNS_MAX_WORKERS, self.CPC_DNS_TIMEOUT, index
+        )
+        # the index was updated incrementally along with the translations
+        self._translations_index = index
         current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
         print(  # noqa: T201
             f"[{current_time}] Pools DNS translations: updated for {len(self._translations)} currently tracked hostnames."
         )
 
+    @staticmethod
+    def merge_translations(
+        *translations_list: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]
+    ) -> dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]:
+        """Merge several translations dictionaries into a new one.
+
+        When the same pool is found for a translation in more than one of them,
+        their windows are merged keeping the earliest first and the latest last
+        timestamps.
+
+        Args:
+            *translations_list (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]):
+                Translations dictionaries to merge.
+
+        Returns:
+            dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]: The merged translations.
+        """
+        merged: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] = {}
+        for translations in translations_list:
+            for hostname, hostname_data in translations.items():
+                for family, family_data in hostname_data.items():
+                    for value, value_data in family_data.items():
+                        pools = merged.setdefault(hostname, {}).setdefault(family, {}).setdefault(value, {})
+                        for pool_id, window in value_data.items():
+                            if pool_id not in pools:
+                                pools[pool_id] = dict(window)
+                            else:
+                                pools[pool_id] = {
+                                    "first": min(pools[pool_id]["first"], window["first"]),
+                                    "last": max(pools[pool_id]["last"], window["last"]),
+                                }
+        return merged
+
+    @staticmethod
+    def compact_translations(  # noqa: C901, PLR0912, PLR0913
+        translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+        archive: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+        register: list[dict[str, Any]] | None = None,
+        retention_days: int = 90,
+        archive_days: int = 30,
+        now: float | None = None,
+        index: dict[str, dict[str, dict[str, float]]] | None = None,
+    ) -> tuple[
+        dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]],
+        dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]],
+    ]:
+        """Compact the translations, moving the cold ones to an archive and dropping the retired pools.
+
+        The translations of the pools not registered anymore are dropped from both
+        dictionaries once they were last seen more than retention_days ago, and the
+        translations not seen in archive_days are moved to the archive, merging
+        their window with the one already archived for the same pool.
+
+        Args:
+            translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
+                Translations dictionary to compact. Defaults to None.
+            archive (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
+                Existing archive of translations. Defaults to None.
+            register (list[dict[str, Any]] | None, optional): Register of pools used to know
+                which pools are still registered, when None or empty the retention is
+                skipped. Defaults to None.
+            retention_days (int, optional): Days to keep the translations of retired pools.
+                Defaults to 90.
+            archive_days (int, optional): Days without being seen after which a translation
+                is moved to the archive. Defaults to 30.
+            now (float | None, optional): Timestamp of reference, current time when None.
+                Defaults to None.
+            index (dict[str, dict[str, dict[str, float]]] | None, optional): When passed, it's
+                refilled in place with the reverse index of the compacted translations.
+                Defaults to None.
+
+        Returns:
+            tuple[dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]], dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]]:
+                The compacted translations and the updated archive.
+        """
+        if translations is None:
+            translations = {}
+        if archive is None:
+            archive = {}
+        if now is None:
+            now = time.time()
+        if index is not None:
+            index.clear()
+            index.update({"4": {}, "6": {}})
+        # An empty register means it couldn't be loaded, not that every pool retired
+        registered = None
+        if register:
+            registered = {pool.get("pool_id_bech32") for pool in register if pool.get("pool_status") == "registered"}
+        retention_cutoff = now - timedelta(days=retention_days).total_seconds()
+        archive_cutoff = now - timedelta(days=archive_days).total_seconds()
+
+        def expired(pool_id: str, window: dict[str, float]) -> bool:
+            return registered is not None and pool_id not in registered and window["last"] < retention_cutoff
+
+        hot: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] = {}
+        cold: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] = {}
+        for source, recent in ((archive, False), (translations, True)):
+            for hostname, hostname_data in source.items():
+                for family, family_data in hostname_data.items():
+                    for value, value_data in family_data.items():
+                        for pool_id, window in value_data.items():
+                            if expired(pool_id, window):
+                                continue
+                            target = hot if recent and window["last"] >= archive_cutoff else cold
+                            if index is not None and target is hot and family in ("4", "6"):
+                                index_pools = index.setdefault(family, {}).setdefault(value, {})
+                                index_pools[pool_id] = max(index_pools.get(pool_id, window["last"]), window["last"])
+                            pools = target.setdefault(hostname, {}).setdefault(family, {}).setdefault(value, {})
+                            if pool_id not in pools:
+                                pools[pool_id] = dict(window)
+                            else:
+                                pools[pool_id] = {
+                                    "first": min(pools[pool_id]["first"], window["first"]),
+                                    "last": max(pools[pool_id]["last"], window["last"]),
+                                }
+        return hot, cold
+
+    def set_compacted_translations(
+        self,
+        register: list[dict[str, Any]] | None = None,
+        translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+    ) -> None:
+        """Update the translations and translations_archive attributes with a compact_translations call.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools,
+                when None it is loaded from the attribute. Defaults to None.
+            translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
+                Translations dictionary to compact, when None it is loaded from the
+                attribute. Defaults to None.
+        """
+        if register is None:
+            register = self._register
+        if translations is None:
+            translations = self._translations
+        index: dict[str, dict[str, dict[str, float]]] = {}
+        hot, cold = self.compact_translations(
+            translations,
+            self.translations_archive,
+            register,
+            self.CPC_TRANSLATIONS_RETENTION_DAYS,
+            self.CPC_TRANSLATIONS_ARCHIVE_DAYS,
+            index=index,
+        )
+        self.translations = hot
+        self.translations_archive = cold
+        # the index of the compacted translations was built during the compaction
+        self._translations_index = index
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(  # noqa: T201
+            f"[{current_time}] Pools DNS translations: compacted to {len(self._translations)} hostnames, {len(self._translations_archive)} archived."
+        )
+
     def set_all_sharing(
         self,
         register: list[dict[str, Any]] | None = None,
@@ -986,6 +2603,7 @@ class CardanoPoolChecker:
         self.set_registered_currently_sharing_meta_url(register)
         self.set_registered_currently_sharing_owners(register)
         self.set_registered_currently_sharing_reward_addr(register)
+        self.set_registered_currently_similar_meta_json(register)
         self.set_registered_sharing_relay_hostname(register)
         self.set_registered_sharing_relay_ipv4(register, translations)
         self.set_registered_sharing_relay_ipv6(register, translations)
@@ -993,6 +2611,8 @@ class CardanoPoolChecker:
         self.set_registered_sharing_meta_url(register)
         self.set_registered_sharing_owners(register)
         self.set_registered_sharing_reward_addr(register)
+        self.set_registered_similar_meta_json(register)
+        self.set_registered_sharing_relay_endpoints(register, translations)
 
     def set_registered_currently_sharing(
         self,
@@ -1014,6 +2634,8 @@ class CardanoPoolChecker:
         self.set_registered_currently_sharing_meta_url(register)
         self.set_registered_currently_sharing_owners(register)
         self.set_registered_currently_sharing_reward_addr(register)
+        self.set_registered_currently_similar_meta_json(register)
+        self.set_registered_currently_sharing_relay_endpoint(register, translations)
 
     def set_registered_sharing(
         self,
@@ -1035,6 +2657,8 @@ class CardanoPoolChecker:
         self.set_registered_sharing_meta_url(register)
         self.set_registered_sharing_owners(register)
         self.set_registered_sharing_reward_addr(register)
+        self.set_registered_similar_meta_json(register)
+        self.set_registered_sharing_relay_endpoint(register, translations)
 
     @staticmethod
     def find_registered_currently_sharing_relay_hostname(
@@ -1091,10 +2715,12 @@ class CardanoPoolChecker:
             f"[{current_time}] Found {len(self._registered_currently_sharing_relay_hostname)} entries for registered_currently_sharing_relay_hostname."
         )
 
-    @staticmethod
+    @classmethod
     def find_registered_currently_sharing_relay_ipv4(  # noqa: PLR0912, C901
+        cls,
         register: list[dict[str, Any]] | None = None,
         translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+        index: dict[str, dict[str, dict[str, float]]] | None = None,
     ) -> dict[str, list[str]]:
         """Find registered stake pools that are currently sharing a relay IPv4 address.
 
@@ -1103,6 +2729,8 @@ class CardanoPoolChecker:
             translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
                 Existing hostname translations dictionary to check for shared IP addresses
                 also between the resolved ones. Defaults to None.
+            index (dict[str, dict[str, dict[str, float]]] | None, optional): Reverse index of the
+                translations, when None it's built from the translations. Defaults to None.
 
         Returns:
             dict[str, list[str]]: Dictionary containing the shared resources between pools.
@@ -1131,22 +2759,18 @@ class CardanoPoolChecker:
                                     ipv4_addresses[relay["ipv4"]].append(pool["pool_id_bech32"])
                             else:
                                 ipv4_addresses[relay["ipv4"]] = [pool["pool_id_bech32"]]
-        # iterate the list of relay hostname translations to also look among the
-        # recent (less than 4h) resolved IPs for sharing conditions
+        # iterate the reverse index of the relay hostname translations to also look among the
+        # recent (less than 4h) resolved IPs for sharing conditions, guarded as it always was
         if isinstance(translations, dict) and translations.get("4") is not None:
-            for hostname_data in translations.values():
-                if isinstance(hostname_data, dict) and hostname_data.get("4") is not None:
-                    for resolved_ip, resolved_ip_data in hostname_data["4"].items():
-                        if isinstance(resolved_ip_data, dict):
-                            for mypool, pool_data in resolved_ip_data.items():
-                                if isinstance(pool_data, dict) and pool_data.get("last") is not None:
-                                    last_datetime = datetime.fromtimestamp(pool_data["last"], tz=timezone.utc)
-                                    if last_datetime > datetime.now(tz=timezone.utc) - timedelta(hours=4):
-                                        if resolved_ip in ipv4_addresses:
-                                            if mypool is not None and mypool not in ipv4_addresses[resolved_ip]:
-                                                ipv4_addresses[resolved_ip].append(mypool)
-                                        else:
-                                            ipv4_addresses[resolved_ip] = [mypool]
+            if index is None:
+                index = cls.build_translations_index(translations)
+            cutoff = time.time() - timedelta(hours=4).total_seconds()
+            for resolved_ip, resolved_ip_pools in index.get("4", {}).items():
+                for mypool, last in resolved_ip_pools.items():
+                    if last > cutoff:
+                        ipv4_addresses.setdefault(resolved_ip, [])
+                        if mypool is not None and mypool not in ipv4_addresses[resolved_ip]:
+                            ipv4_addresses[resolved_ip].append(mypool)
         # Filter the dictionary to include only the IPv4 addresses present in multiple pools
         return {value: value_pools for value, value_pools in ipv4_addresses.items() if len(value_pools) > 1}
 
@@ -1166,10 +2790,12 @@ class CardanoPoolChecker:
         """
         if register is None:
             register = self._register
+        index = None
         if translations is None:
             translations = self._translations
+            index = self.translations_index
         self.registered_currently_sharing_relay_ipv4 = self.find_registered_currently_sharing_relay_ipv4(
-            register, translations
+            register, translations, index
         )
         current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
         print(  # noqa: T201
@@ -1181,6 +2807,7 @@ class CardanoPoolChecker:
         cls,
         register: list[dict[str, Any]] | None = None,
         translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+        index: dict[str, dict[str, dict[str, float]]] | None = None,
     ) -> dict[Any, Any]:
         """Find registered stake pools that are currently sharing a relay IPv6 address.
 
@@ -1189,6 +2816,8 @@ class CardanoPoolChecker:
             translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
                 Existing hostname translations dictionary to check for shared IP addresses
                 also between the resolved ones. Defaults to None.
+            index (dict[str, dict[str, dict[str, float]]] | None, optional): Reverse index of the
+                translations, when None it's built from the translations. Defaults to None.
 
         Returns:
             dict[Any, Any]: Dictionary containing the shared resources between pools.
@@ -1219,23 +2848,18 @@ class CardanoPoolChecker:
                                         ipv6_addresses[full_ipv6].append(pool["pool_id_bech32"])
                                 else:
                                     ipv6_addresses[full_ipv6] = [pool["pool_id_bech32"]]
-        # iterate the list of relay hostname translations to also look among the
-        # recent (less than 4h) resolved IPs for sharing conditions
+        # iterate the reverse index of the relay hostname translations to also look among the
+        # recent (less than 4h) resolved IPs for sharing conditions, guarded as it always was
         if isinstance(translations, dict) and translations.get("6") is not None:
-            for hostname_data in translations.values():
-                if isinstance(hostname_data, dict) and hostname_data.get("6") is not None:
-                    for resolved_ip, resolved_ip_data in hostname_data["6"].items():
-                        full_ipv6 = cls._unshorten_ipv6(resolved_ip)
-                        if isinstance(resolved_ip_data, dict):
-                            for mypool, pool_data in resolved_ip_data.items():
-                                if isinstance(pool_data, dict) and pool_data.get("last") is not None:
-                                    last_datetime = datetime.fromtimestamp(pool_data["last"], tz=timezone.utc)
-                                    if last_datetime > datetime.now(tz=timezone.utc) - timedelta(hours=4):
-                                        if full_ipv6 in ipv6_addresses:
-                                            if mypool is not None and mypool not in ipv6_addresses[full_ipv6]:
-                                                ipv6_addresses[full_ipv6].append(mypool)
-                                        else:
-                                            ipv6_addresses[full_ipv6] = [mypool]
+            if index is None:
+                index = cls.build_translations_index(translations)
+            cutoff = time.time() - timedelta(hours=4).total_seconds()
+            for full_ipv6, resolved_ip_pools in index.get("6", {}).items():
+                for mypool, last in resolved_ip_pools.items():
+                    if last > cutoff:
+                        ipv6_addresses.setdefault(full_ipv6, [])
+                        if mypool is not None and mypool not in ipv6_addresses[full_ipv6]:
+                            ipv6_addresses[full_ipv6].append(mypool)
         # Filter the dictionary to include only the IPv6 addresses present in multiple pools
         return {value: value_pools for value, value_pools in ipv6_addresses.items() if len(value_pools) > 1}
 
@@ -1255,10 +2879,12 @@ class CardanoPoolChecker:
         """
         if register is None:
             register = self._register
+        index = None
         if translations is None:
             translations = self._translations
+            index = self.translations_index
         self.registered_currently_sharing_relay_ipv6 = self.find_registered_currently_sharing_relay_ipv6(
-            register, translations
+            register, translations, index
         )
         current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
         print(  # noqa: T201
@@ -1416,7 +3042,7 @@ class CardanoPoolChecker:
         self.registered_currently_sharing_owners = self.find_registered_currently_sharing_owners(register)
         current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
         print(  # noqa: T201
-            f"[{current_time}] Found {len(self._registered_currently_sharing_meta_url)} entries for registered_currently_sharing_meta_url."
+            f"[{current_time}] Found {len(self._registered_currently_sharing_owners)} entries for registered_currently_sharing_owners."
         )
 
     @staticmethod
@@ -1526,8 +3152,9 @@ class CardanoPoolChecker:
             f"[{current_time}] Found {len(self._registered_sharing_relay_hostname)} entries for registered_sharing_relay_hostname."
         )
 
-    @staticmethod
-    def find_registered_sharing_relay_ipv4(  # noqa: C901, PLR0912
+    @classmethod
+    def find_registered_sharing_relay_ipv4(  # noqa: C901
+        cls,
         register: list[dict[str, Any]] | None = None,
         translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
     ) -> dict[str, list[str]]:
@@ -1571,19 +3198,6 @@ class CardanoPoolChecker:
                                             ipv4_addresses[relay["ipv4"]].append(pool["pool_id_bech32"])
                                     else:
                                         ipv4_addresses[relay["ipv4"]] = [pool["pool_id_bech32"]]
-        # iterate the list of relay hostname translations to also look among the
-        # resolved IPs for sharing conditions
-        if isinstance(translations, dict) and translations.get("4") is not None:
-            for hostname_data in translations.values():
-                if isinstance(hostname_data, dict) and hostname_data.get("4") is not None:
-                    for resolved_ip, resolved_ip_data in hostname_data["4"].items():
-                        if isinstance(resolved_ip_data, dict) == dict:
-                            for mypool in resolved_ip_data:
-                                if resolved_ip in ipv4_addresses:
-                                    if mypool is not None and mypool not in ipv4_addresses[resolved_ip]:
-                                        ipv4_addresses[resolved_ip].append(mypool)
-                                else:
-                                    ipv4_addresses[resolved_ip] = [mypool]
         # Filter the dictionary to include only the IPv4 addresses present in multiple pools
         return {value: value_pools for value, value_pools in ipv4_addresses.items() if len(value_pools) > 1}
 
@@ -1604,7 +3218,7 @@ class CardanoPoolChecker:
         if register is None:
             register = self._register
         if translations is None:
-            translations = self._translations
+            translations = self.translations_history
         self.registered_sharing_relay_ipv4 = self.find_registered_sharing_relay_ipv4(register, translations)
         current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
         print(  # noqa: T201
@@ -1616,6 +3230,7 @@ class CardanoPoolChecker:
         cls,
         register: list[dict[str, Any]] | None = None,
         translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+        index: dict[str, dict[str, dict[str, float]]] | None = None,
     ) -> dict[Any, Any]:
         """Find registered stake pools that shared at any time a relay IPv6.
 
@@ -1624,6 +3239,8 @@ class CardanoPoolChecker:
             translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
                 Existing hostname translations dictionary to check for shared IP addresses
                 also between the resolved ones. Defaults to None.
+            index (dict[str, dict[str, dict[str, float]]] | None, optional): Reverse index of the
+                translations, when None it's built from the translations. Defaults to None.
 
         Returns:
             dict[Any, Any]: Dictionary containing the shared resources between pools.
@@ -1659,20 +3276,16 @@ class CardanoPoolChecker:
                                                 ipv6_addresses[full_ipv6].append(pool["pool_id_bech32"])
                                         else:
                                             ipv6_addresses[full_ipv6] = [pool["pool_id_bech32"]]
-        # iterate the list of relay hostname translations to also look among the
-        # resolved IPs for sharing conditions
+        # iterate the reverse index of the relay hostname translations to also look
+        # among the resolved IPs for sharing conditions, guarded as it always was
         if isinstance(translations, dict) and translations.get("6") is not None:
-            for hostname_data in translations.values():
-                if isinstance(hostname_data, dict) and hostname_data.get("6") is not None:
-                    for resolved_ip, resolved_ip_data in hostname_data["6"].items():
-                        full_ipv6 = cls._unshorten_ipv6(resolved_ip)
-                        if isinstance(resolved_ip_data, dict):
-                            for mypool in resolved_ip_data:
-                                if full_ipv6 in ipv6_addresses:
-                                    if mypool is not None and mypool not in ipv6_addresses[full_ipv6]:
-                                        ipv6_addresses[full_ipv6].append(mypool)
-                                else:
-                                    ipv6_addresses[full_ipv6] = [mypool]
+            if index is None:
+                index = cls.build_translations_index(translations)
+            for full_ipv6, resolved_ip_pools in index.get("6", {}).items():
+                ipv6_addresses.setdefault(full_ipv6, [])
+                for mypool in resolved_ip_pools:
+                    if mypool is not None and mypool not in ipv6_addresses[full_ipv6]:
+                        ipv6_addresses[full_ipv6].append(mypool)
         # Filter the dictionary to include only the IPv6 addresses present in multiple pools
         return {value: value_pools for value, value_pools in ipv6_addresses.items() if len(value_pools) > 1}
 
@@ -1692,9 +3305,11 @@ class CardanoPoolChecker:
         """
         if register is None:
             register = self._register
+        index = None
         if translations is None:
-            translations = self._translations
-        self.registered_sharing_relay_ipv6 = self.find_registered_sharing_relay_ipv6(register, translations)
+            translations = self.translations_history
+            index = self.translations_history_index
+        self.registered_sharing_relay_ipv6 = self.find_registered_sharing_relay_ipv6(register, translations, index)
         current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
         print(  # noqa: T201
             f"[{current_time}] Found {len(self._registered_sharing_relay_ipv6)} entries for registered_sharing_relay_ipv6."
@@ -1930,82 +3545,831 @@ class CardanoPoolChecker:
             f"[{current_time}] Found {len(self._registered_sharing_reward_addr)} entries for registered_sharing_reward_addr."
         )
 
-    def _is_rule_safe(self, rule: str) -> bool:
-        # The rule is invalid if contains something else than lowercase letters, uppercase letters, spaces, and parentheses
-        pattern = r"^[a-zA-Z0-9 ()]*$"
-        if bool(re.match(pattern, rule)) is False:
-            return False
-        # Filter the parentheses from the rule and check if all the words are allowed
-        filtered_rule = re.sub(r"[^a-zA-Z0-9\s]", "", rule)
-        allowed = self.CPC_MSPO_RULES_ALLOWED_KEYWORDS
-        words = filtered_rule.split()
-        # Return True if all words are allowed, otherwise return False
-        return all(word in allowed for word in words)
-
-    def _are_rule_vars_safe(self, my_vars: dict[str, bool]) -> bool:
-        allowed = self.CPC_MSPO_RULES_ALLOWED_KEYWORDS
-        # Return False if any key is a non allowed word or if values are not bool, otherwise return True
-        return all(not (not isinstance(my_vars[my_var], bool) or str(my_var) not in allowed) for my_var in my_vars)
+    @classmethod
+    def find_registered_currently_similar_meta_json(
+        cls,
+        register: list[dict[str, Any]] | None = None,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+    ) -> dict[str, list[str]]:
+        """Find registered stake pools that currently have a near-duplicate metadata.
 
-    def build_classified_pools(  # noqa: C901
-        self,
-        pools_path: str,
-        pools_list: list[dict[str, str | list[str]]],
-        config_rules: list[dict[str, str | dict[str, str]]],
-    ) -> dict[str, list[dict[str, str | list[str]]]]:
-        """Builds lists of stake pools by classifying them using the provided rules.
+        The name and description of each pool metadata are split in character
+        shingles and summarized with MinHash signatures, which are grouped
+        using locality-sensitive hashing buckets, so only the candidate pairs
+        sharing a bucket are compared.
 
         Args:
-            pools_path (str): The path where the pool resources listings are stored.
-            pools_list (list[dict[str, str | list[str]]]): The list of pools to classify.
-            config_rules (list[dict[str, str  |  dict[str, str]]]): The rules to use for classifying.
+            register (list[dict[str, Any]] | None, optional): Register of pools. Defaults to None.
+            threshold (float, optional): Minimum estimated Jaccard similarity to consider
+                two metadata as near-duplicates. Defaults to 0.8.
+            num_perm (int, optional): Number of hash functions of the MinHash signatures.
+                Defaults to 128.
 
         Returns:
-            dict[str, list[dict[str, str|list[str]]]]: The classified lists of pools.
+            dict[str, list[str]]: Dictionary containing the similar pools grouped by the
+                lowest pool id of each group.
         """
-        # Use a dictionary to store results for each rule
-        result_files = {}
-        # Get the allowed keywords in the rules definition
-        allowed = self.CPC_MSPO_RULES_ALLOWED_KEYWORDS
-        # Process each defined rule
-        for rule in config_rules:
-            matching_ids = []
-            non_matching_ids = []
-            for pool in pools_list:
-                if isinstance(pool["pool_id_bech32"], str):
-                    id_value = pool["pool_id_bech32"]
-                reason = []
-                variables = {}
-                if isinstance(rule["files"], dict):
-                    for var, filename in rule["files"].items():
-                        with open(os.path.join(pools_path, filename)) as file:
-                            file_content = json.load(file)
-                        variables[var] = id_value in str(file_content)
-                if (
-                    isinstance(rule["rule"], str)
-                    and self._is_rule_safe(rule["rule"])
-                    and self._are_rule_vars_safe(variables)
-                ):
-                    if eval(rule["rule"], variables):  # noqa: S307, PGH001
-                        for var in variables:
-                            if variables[var] and (var in allowed) and isinstance(rule["files"], dict):
-                                reason.append(self.CPC_POOLS_URL + str(rule["files"].get(var)))  # noqa: PERF401
-                        my_pool = pool.copy()
-                        my_pool["reason"] = reason
-                        matching_ids.append(my_pool)
-                    else:
-                        non_matching_ids.append(pool)
-            if isinstance(rule["matching_file"], str) and isinstance(rule["non_matching_file"], str):
-                result_files[rule["matching_file"]] = matching_ids
-                result_files[rule["non_matching_file"]] = non_matching_ids
-        return result_files
+        # init result dict
+        if register is None:
+            register = []
+        entries: list[tuple[str, dict[str, Any]]] = []
+        if isinstance(register, list):
+            # iterate the registered pools to create a list with the ids and their metadata
+            registered_pools = [
+                pool for pool in register if isinstance(pool, dict) and pool.get("pool_status") == "registered"
+            ]
+            entries = [
+                (pool["pool_id_bech32"], pool["meta_json"])
+                for pool in registered_pools
+                if pool.get("pool_id_bech32") is not None and isinstance(pool.get("meta_json"), dict)
+            ]
+        return cls._find_similar_meta_json(entries, threshold, num_perm)
 
-    def set_classified_pools(self) -> None:
-        """Update the classified_pools attribute."""
-        # Get the list of pools
-        try:
-            with open(os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, self.CPC_POOLS_LIST_FILENAME)) as file:
+    def set_registered_currently_similar_meta_json(self, register: list[dict[str, Any]] | None = None) -> None:
+        """Update the registered_currently_similar_meta_json attribute.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools,
+                when None it is loaded from the attribute. Defaults to None.
+        """
+        if register is None:
+            register = self._register
+        self.registered_currently_similar_meta_json = self.find_registered_currently_similar_meta_json(
+            register, self.CPC_META_JSON_SIMILARITY_THRESHOLD, self.CPC_META_JSON_MINHASH_PERMUTATIONS
+        )
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(  # noqa: T201
+            f"[{current_time}] Found {len(self._registered_currently_similar_meta_json)} entries for registered_currently_similar_meta_json."
+        )
+
+    @classmethod
+    def find_registered_similar_meta_json(
+        cls,
+        register: list[dict[str, Any]] | None = None,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+    ) -> dict[str, list[str]]:
+        """Find registered stake pools that had at any time a near-duplicate metadata.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools. Defaults to None.
+            threshold (float, optional): Minimum estimated Jaccard similarity to consider
+                two metadata as near-duplicates. Defaults to 0.8.
+            num_perm (int, optional): Number of hash functions of the MinHash signatures.
+                Defaults to 128.
+
+        Returns:
+            dict[str, list[str]]: Dictionary containing the similar pools grouped by the
+                lowest pool id of each group.
+        """
+        # init result dict
+        if register is None:
+            register = []
+        entries: list[tuple[str, dict[str, Any]]] = []
+        if isinstance(register, list):
+            # iterate the registered pools to create a list with the ids and all their metadata
+            registered_pools = [
+                pool for pool in register if isinstance(pool, dict) and pool.get("pool_status") == "registered"
+            ]
+            for pool in registered_pools:
+                if (
+                    pool.get("pool_id_bech32") is not None
+                    and pool.get("meta_json_log") is not None
+                    and isinstance(pool["meta_json_log"], list)
+                ):
+                    for log in pool["meta_json_log"]:
+                        if isinstance(log, dict) and isinstance(log.get("meta_json"), dict):
+                            entries.append((pool["pool_id_bech32"], log["meta_json"]))  # noqa: PERF401
+        return cls._find_similar_meta_json(entries, threshold, num_perm)
+
+    def set_registered_similar_meta_json(self, register: list[dict[str, Any]] | None = None) -> None:
+        """Update the registered_similar_meta_json attribute.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools,
+                when None it is loaded from the attribute. Defaults to None.
+        """
+        if register is None:
+            register = self._register
+        self.registered_similar_meta_json = self.find_registered_similar_meta_json(
+            register, self.CPC_META_JSON_SIMILARITY_THRESHOLD, self.CPC_META_JSON_MINHASH_PERMUTATIONS
+        )
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(  # noqa: T201
+            f"[{current_time}] Found {len(self._registered_similar_meta_json)} entries for registered_similar_meta_json."
+        )
+
+    @classmethod
+    def find_registered_sharing_relay_endpoints(  # noqa: C901
+        cls,
+        register: list[dict[str, Any]] | None = None,
+        translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+    ) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+        """Find registered stake pools sharing a relay host:port endpoint, currently and at any time.
+
+        Both results are built in a single pass over the register. Relays using a
+        hostname are indexed by the hostname and also by each one of the IP
+        addresses it was translated to, recent (less than 4h) translations for the
+        current relays and all the known ones for the relays history.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools. Defaults to None.
+            translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
+                Existing hostname translations dictionary to check for shared endpoints
+                also between the resolved ones. Defaults to None.
+
+        Returns:
+            tuple[dict[str, list[str]], dict[str, list[str]]]: Dictionaries containing the
+                currently shared endpoints and the ever shared endpoints between pools.
+        """
+        # init result dicts
+        if translations is None:
+            translations = {}
+        if register is None:
+            register = []
+        current: dict[str, list[str]] = {}
+        historical: dict[str, list[str]] = {}
+        cutoff = time.time() - timedelta(hours=4).total_seconds()
+        resolved: dict[str, tuple[set[str], set[str]]] = {}
+
+        def addresses(relay: dict[str, Any], *, recent: bool) -> list[str]:
+            # Return the relay address plus the IPs its hostname was translated to
+            result = [relay[field] for field in ("dns", "ipv4", "ipv6") if isinstance(relay.get(field), str)]
+            hostname = relay.get("dns")
+            if isinstance(hostname, str) and isinstance(translations.get(hostname), dict):
+                if hostname not in resolved:
+                    recent_ips: set[str] = set()
+                    all_ips: set[str] = set()
+                    for family in ("4", "6"):
+                        for resolved_ip, resolved_ip_data in translations[hostname].get(family, {}).items():
+                            all_ips.add(resolved_ip)
+                            if isinstance(resolved_ip_data, dict) and any(
+                                isinstance(pool_data, dict) and pool_data.get("last", 0) > cutoff
+                                for pool_data in resolved_ip_data.values()
+                            ):
+                                recent_ips.add(resolved_ip)
+                    resolved[hostname] = (recent_ips, all_ips)
+                result.extend(sorted(resolved[hostname][0] if recent else resolved[hostname][1]))
+            return result
+
+        def add(endpoints: dict[str, list[str]], relay: Any, pool_id: str, *, recent: bool) -> None:
+            if not isinstance(relay, dict):
+                return
+            for address in addresses(relay, recent=recent):
+                endpoint = cls._relay_endpoint(address, relay.get("port"))
+                if endpoint is not None:
+                    if endpoint not in endpoints:
+                        endpoints[endpoint] = [pool_id]
+                    elif pool_id not in endpoints[endpoint]:
+                        endpoints[endpoint].append(pool_id)
+
+        if isinstance(register, list):
+            # iterate the registered pools once, filling both dicts at the same time
+            registered_pools = [
+                pool for pool in register if isinstance(pool, dict) and pool.get("pool_status") == "registered"
+            ]
+            for pool in registered_pools:
+                if pool.get("pool_id_bech32") is None:
+                    continue
+                if isinstance(pool.get("relays"), list):
+                    for relay in pool["relays"]:
+                        add(current, relay, pool["pool_id_bech32"], recent=True)
+                if isinstance(pool.get("relays_log"), list):
+                    for log in pool["relays_log"]:
+                        if isinstance(log, dict) and isinstance(log.get("relays"), list):
+                            for relay in log["relays"]:
+                                add(historical, relay, pool["pool_id_bech32"], recent=False)
+        # Filter the dictionaries to include only the endpoints present in multiple pools
+        return (
+            {value: value_pools for value, value_pools in current.items() if len(value_pools) > 1},
+            {value: value_pools for value, value_pools in historical.items() if len(value_pools) > 1},
+        )
+
+    @classmethod
+    def find_registered_currently_sharing_relay_endpoint(
+        cls,
+        register: list[dict[str, Any]] | None = None,
+        translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+    ) -> dict[str, list[str]]:
+        """Find registered stake pools that are currently sharing a relay host:port endpoint.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools. Defaults to None.
+            translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
+                Existing hostname translations dictionary to check for shared endpoints
+                also between the resolved ones. Defaults to None.
+
+        Returns:
+            dict[str, list[str]]: Dictionary containing the shared resources between pools.
+        """
+        return cls.find_registered_sharing_relay_endpoints(register, translations)[0]
+
+    @classmethod
+    def find_registered_sharing_relay_endpoint(
+        cls,
+        register: list[dict[str, Any]] | None = None,
+        translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+    ) -> dict[str, list[str]]:
+        """Find registered stake pools that shared at any time a relay host:port endpoint.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools. Defaults to None.
+            translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
+                Existing hostname translations dictionary to check for shared endpoints
+                also between the resolved ones. Defaults to None.
+
+        Returns:
+            dict[str, list[str]]: Dictionary containing the shared resources between pools.
+        """
+        return cls.find_registered_sharing_relay_endpoints(register, translations)[1]
+
+    def set_registered_sharing_relay_endpoints(
+        self,
+        register: list[dict[str, Any]] | None = None,
+        translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+    ) -> None:
+        """Update the registered_currently_sharing_relay_endpoint and registered_sharing_relay_endpoint attributes.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools,
+                when None it is loaded from the attribute. Defaults to None.
+            translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
+                Existing hostname translations dictionary, when None it is loaded
+                from the attribute. Defaults to None.
+        """
+        if register is None:
+            register = self._register
+        if translations is None:
+            translations = self.translations_history
+        current, historical = self.find_registered_sharing_relay_endpoints(register, translations)
+        self.registered_currently_sharing_relay_endpoint = current
+        self.registered_sharing_relay_endpoint = historical
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(  # noqa: T201
+            f"[{current_time}] Found {len(self._registered_currently_sharing_relay_endpoint)} entries for registered_currently_sharing_relay_endpoint."
+        )
+        print(  # noqa: T201
+            f"[{current_time}] Found {len(self._registered_sharing_relay_endpoint)} entries for registered_sharing_relay_endpoint."
+        )
+
+    def set_registered_currently_sharing_relay_endpoint(
+        self,
+        register: list[dict[str, Any]] | None = None,
+        translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+    ) -> None:
+        """Update the registered_currently_sharing_relay_endpoint attribute.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools,
+                when None it is loaded from the attribute. Defaults to None.
+            translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
+                Existing hostname translations dictionary, when None it is loaded
+                from the attribute. Defaults to None.
+        """
+        if register is None:
+            register = self._register
+        if translations is None:
+            translations = self._translations
+        self.registered_currently_sharing_relay_endpoint = self.find_registered_currently_sharing_relay_endpoint(
+            register, translations
+        )
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(  # noqa: T201
+            f"[{current_time}] Found {len(self._registered_currently_sharing_relay_endpoint)} entries for registered_currently_sharing_relay_endpoint."
+        )
+
+    def set_registered_sharing_relay_endpoint(
+        self,
+        register: list[dict[str, Any]] | None = None,
+        translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None = None,
+    ) -> None:
+        """Update the registered_sharing_relay_endpoint attribute.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools,
+                when None it is loaded from the attribute. Defaults to None.
+            translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] | None, optional):
+                Existing hostname translations dictionary, when None it is loaded
+                from the attribute. Defaults to None.
+        """
+        if register is None:
+            register = self._register
+        if translations is None:
+            translations = self.translations_history
+        self.registered_sharing_relay_endpoint = self.find_registered_sharing_relay_endpoint(register, translations)
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(  # noqa: T201
+            f"[{current_time}] Found {len(self._registered_sharing_relay_endpoint)} entries for registered_sharing_relay_endpoint."
+        )
+
+    @staticmethod
+    def _fetch_limited(
+        pool_manager: urllib3.PoolManager,
+        url: str,
+        max_size: int,
+        timeout: float,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[int | None, bytes | None, Mapping[str, str]]:
+        # Download a url reading at most max_size bytes, returning the status, the body and the
+        # headers, None as body if it's bigger, and None as status if the request failed.
+        # The timeout also limits the wait for a free connection when the pool blocks.
+        cpc_telemetry.count("http_requests")
+        try:
+            response = pool_manager.request(
+                "GET",
+                url,
+                headers=headers,
+                preload_content=False,
+                timeout=urllib3.Timeout(total=timeout),
+                pool_timeout=timeout,
+                retries=urllib3.Retry(total=None, connect=0, read=0, status=0, other=0, redirect=3),
+            )
+        except (HTTPError, ValueError):
+            return None, None, {}
+        try:
+            body = response.read(max_size + 1)
+        except HTTPError:
+            response.close()
+            return None, None, {}
+        if len(body) > max_size:
+            # The rest is not read, so the connection can't be reused
+            response.close()
+            return response.status, None, response.headers
+        response.release_conn()
+        cpc_telemetry.count("bytes_read", len(body))
+        return response.status, body, response.headers
+
+    def verify_metadata(
+        self, pools: list[tuple[str, str]], cache: dict[str, dict[str, dict[str, Any]]] | None = None
+    ) -> dict[str, dict[str, dict[str, Any]]]:
+        """Download the metadata of the pools concurrently and check it against its hash.
+
+        Args:
+            pools (list[tuple[str, str]]): The (metadata url, metadata hash) pairs to check.
+            cache (dict[str, dict[str, dict[str, Any]]] | None, optional): The results of previous
+                checks, by url and hash. Defaults to None.
+
+        Returns:
+            dict[str, dict[str, dict[str, Any]]]: By url and hash, the "status" of the metadata
+                ("valid", "mismatch", "too_large" or "unreachable") and the time it was "checked".
+        """
+        cache = cache or {}
+        now = time.time()
+        results: dict[str, dict[str, dict[str, Any]]] = {}
+        pending = []
+        for url, meta_hash in set(pools):
+            cached = cache.get(url, {}).get(meta_hash)
+            # The valid metadata can't change without changing its hash
+            if cached is not None and (
+                cached["status"] == "valid" or now - cached["checked"] < self.CPC_METADATA_RECHECK_HOURS * 3600
+            ):
+                results.setdefault(url, {})[meta_hash] = cached
+            else:
+                pending.append((url, meta_hash))
+        pool_manager = urllib3.PoolManager(num_pools=self.CPC_METADATA_MAX_WORKERS, maxsize=4)
+
+        @cpc_telemetry.propagate
+        def check(url: str, meta_hash: str) -> dict[str, Any]:
+            status, body, _ = self._fetch_limited(
+                pool_manager, url, self.CPC_METADATA_MAX_SIZE, self.CPC_METADATA_TIMEOUT
+            )
+            if status != 200:  # noqa: PLR2004
+                result = "unreachable"
+            elif body is None:
+                result = "too_large"
+            elif hashlib.blake2b(body, digest_size=32).hexdigest() == meta_hash.lower():
+                result = "valid"
+            else:
+                result = "mismatch"
+            return {"status": result, "checked": now}
+
+        with ThreadPoolExecutor(max_workers=self.CPC_METADATA_MAX_WORKERS) as executor:
+            futures = {executor.submit(check, url, meta_hash): (url, meta_hash) for url, meta_hash in pending}
+            for future in as_completed(futures):
+                url, meta_hash = futures[future]
+                results.setdefault(url, {})[meta_hash] = future.result()
+        return results
+
+    def set_verified_metadata(self, register: list[dict[str, Any]] | None = None) -> None:
+        """Check the metadata of the registered pools against its hash.
+
+        Updates the registered_currently_unreachable_meta_url and
+        registered_currently_mismatched_meta_hash attributes. The metadata bigger
+        than CPC_METADATA_MAX_SIZE was downloaded but can't be valid, so it's
+        listed as mismatched.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools,
+                when None it is loaded from the attribute. Defaults to None.
+        """
+        if register is None:
+            register = self._register
+        pools = [
+            pool
+            for pool in register
+            if isinstance(pool, dict)
+            and pool.get("pool_status") == "registered"
+            and pool.get("meta_url") is not None
+            and pool.get("meta_hash") is not None
+            and self._is_valid_url(pool["meta_url"])
+        ]
+        try:
+            with open(
+                os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, self.CPC_METADATA_CACHE_FILENAME)
+            ) as file:
+                cache = json.load(file)
+                cpc_telemetry.count("bytes_read", file.tell())
+        except (OSError, ValueError):
+            cache = {}
+        # The results of the metadata no longer registered are dropped from the cache
+        results = self.verify_metadata([(pool["meta_url"], pool["meta_hash"]) for pool in pools], cache)
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json(self.CPC_METADATA_CACHE_FILENAME, {url: results[url] for url in sorted(results)})
+        unreachable: dict[str, list[str]] = {}
+        mismatched: dict[str, list[str]] = {}
+        for pool in pools:
+            status = results[pool["meta_url"]][pool["meta_hash"]]["status"]
+            if status in ("mismatch", "too_large"):
+                mismatched.setdefault(pool["meta_url"], []).append(pool["pool_id_bech32"])
+            elif status != "valid":
+                unreachable.setdefault(pool["meta_url"], []).append(pool["pool_id_bech32"])
+        self.registered_currently_unreachable_meta_url = unreachable
+        self.registered_currently_mismatched_meta_hash = mismatched
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(  # noqa: T201
+            f"[{current_time}] Metadata of {len(pools)} pools checked: "
+            f"{sum(len(ids) for ids in unreachable.values())} unreachable, "
+            f"{sum(len(ids) for ids in mismatched.values())} not matching their hash."
+        )
+
+    @staticmethod
+    def _extended_operator_fields(extended: Any) -> list[str]:
+        # The operator identifiers of an extended metadata as "resource:value" strings
+        fields = set()
+        for path, resource in EXTENDED_OPERATOR_FIELDS.items():
+            value = extended
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, str | int) and not isinstance(item, bool):
+                    item = str(item).strip().lstrip("@").lower()  # noqa: PLW2901
+                    if item:
+                        fields.add(f"{resource}:{item}")
+        return sorted(fields)
+
+    @staticmethod
+    def _revalidation_headers(cached: dict[str, Any]) -> dict[str, str]:
+        # The conditional request headers of a cached extended metadata, only the valid ones are revalidated
+        headers = {}
+        if cached.get("status") == "valid" and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("status") == "valid" and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    @classmethod
+    def _extended_metadata_result(
+        cls, cached: dict[str, Any] | None, response: tuple[int | None, bytes | None, Mapping[str, str]], now: float
+    ) -> dict[str, Any]:
+        # The crawl result of a response, cached is the result revalidated by the request if any
+        status, body, headers = response
+        if status == 304 and cached is not None:  # noqa: PLR2004
+            return {**cached, "checked": now}
+        if status != 200:  # noqa: PLR2004
+            return {"status": "unreachable", "fields": [], "checked": now}
+        if body is None:
+            return {"status": "too_large", "fields": [], "checked": now}
+        try:
+            extended = json.loads(body)
+        except ValueError:
+            return {"status": "invalid", "fields": [], "checked": now}
+        return {
+            "status": "valid",
+            "fields": cls._extended_operator_fields(extended),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "checked": now,
+        }
+
+    def crawl_extended_metadata(
+        self, urls: list[str], cache: dict[str, dict[str, Any]] | None = None
+    ) -> dict[str, dict[str, Any]]:
+        """Download the extended metadata urls concurrently, revalidating the cached responses.
+
+        The urls never crawled go first, then the ones crawled longer ago. No request is
+        started after CPC_EXTENDED_METADATA_BUDGET seconds and the requests in progress are
+        limited to the remaining time, the urls not crawled keeping their cached result.
+
+        Args:
+            urls (list[str]): The extended metadata urls.
+            cache (dict[str, dict[str, Any]] | None, optional): The results of previous crawls,
+                by url. Defaults to None.
+
+        Returns:
+            dict[str, dict[str, Any]]: By url, the "status" of the extended metadata ("valid",
+                "invalid", "too_large" or "unreachable"), the operator "fields" found in it, the
+                "etag" and "last_modified" headers of the response and the time it was "checked".
+        """
+        previous: dict[str, dict[str, Any]] = cache or {}
+        deadline = time.monotonic() + self.CPC_EXTENDED_METADATA_BUDGET
+        now = time.time()
+        urls = sorted(set(urls), key=lambda url: (url in previous, previous.get(url, {}).get("checked", 0)))
+        # A blocking pool per host limits the connections to every server
+        pool_manager = urllib3.PoolManager(
+            num_pools=self.CPC_EXTENDED_METADATA_MAX_WORKERS,
+            maxsize=self.CPC_EXTENDED_METADATA_MAX_PER_HOST,
+            block=True,
+        )
+
+        @cpc_telemetry.propagate
+        def crawl(url: str) -> dict[str, Any] | None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            cached = previous.get(url, {})
+            headers = self._revalidation_headers(cached)
+            response = self._fetch_limited(
+                pool_manager,
+                url,
+                self.CPC_EXTENDED_METADATA_MAX_SIZE,
+                min(self.CPC_EXTENDED_METADATA_TIMEOUT, remaining),
+                headers,
+            )
+            return self._extended_metadata_result(cached if headers else None, response, now)
+
+        results = {url: previous[url] for url in urls if url in previous}
+        with ThreadPoolExecutor(max_workers=self.CPC_EXTENDED_METADATA_MAX_WORKERS) as executor:
+            futures = {executor.submit(crawl, url): url for url in urls}
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
+                    results[futures[future]] = result
+        return results
+
+    @classmethod
+    def _extended_metadata_urls(cls, register: list[dict[str, Any]]) -> dict[str, str]:
+        # The extended metadata url of every registered pool publishing a valid one
+        urls = {}
+        for pool in register:
+            if isinstance(pool, dict) and pool.get("pool_status") == "registered":
+                meta_json = pool.get("meta_json")
+                url = meta_json.get("extended") if isinstance(meta_json, dict) else None
+                if isinstance(url, str) and cls._is_valid_url(url):
+                    urls[pool["pool_id_bech32"]] = url
+        return urls
+
+    def _load_extended_metadata_cache(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(
+                os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, self.CPC_EXTENDED_METADATA_CACHE_FILENAME)
+            ) as file:
+                cache = json.load(file)
+                cpc_telemetry.count("bytes_read", file.tell())
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def set_extended_metadata(self, register: list[dict[str, Any]] | None = None) -> None:
+        """Crawl the extended metadata of the registered pools, updating its cache file.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools,
+                when None it is loaded from the attribute. Defaults to None.
+        """
+        if register is None:
+            register = self._register
+        urls = sorted(set(self._extended_metadata_urls(register).values()))
+        start = time.time()
+        # The results of the urls no longer published are dropped from the cache
+        results = self.crawl_extended_metadata(urls, self._load_extended_metadata_cache())
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json(self.CPC_EXTENDED_METADATA_CACHE_FILENAME, {url: results[url] for url in sorted(results)})
+        crawled = [entry for entry in results.values() if entry["checked"] >= start]
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(  # noqa: T201
+            f"[{current_time}] Extended metadata of {len(crawled)} of {len(urls)} urls crawled: "
+            f"{sum(entry['status'] == 'valid' for entry in crawled)} valid, "
+            f"{len(urls) - len(crawled)} left for the next update."
+        )
+
+    @classmethod
+    def find_registered_currently_sharing_extended_operator(
+        cls, register: list[dict[str, Any]] | None = None, crawled: dict[str, dict[str, Any]] | None = None
+    ) -> dict[str, list[str]]:
+        """Find registered stake pools that are currently sharing an operator identifier of their extended metadata.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools. Defaults to None.
+            crawled (dict[str, dict[str, Any]] | None, optional): The crawled extended metadata,
+                by url. Defaults to None.
+
+        Returns:
+            dict[str, list[str]]: The pools sharing every "resource:value" identifier.
+        """
+        if register is None:
+            register = []
+        if crawled is None:
+            crawled = {}
+        operators: dict[str, list[str]] = {}
+        for pool_id, url in cls._extended_metadata_urls(register).items():
+            for field in crawled.get(url, {}).get("fields", []):
+                if pool_id not in operators.setdefault(field, []):
+                    operators[field].append(pool_id)
+        # Filter the dictionary to include only the identifiers present in multiple pools
+        return {value: value_pools for value, value_pools in sorted(operators.items()) if len(value_pools) > 1}
+
+    def set_registered_currently_sharing_extended_operator(self, register: list[dict[str, Any]] | None = None) -> None:
+        """Update the registered_currently_sharing_extended_operator attribute.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools,
+                when None it is loaded from the attribute. Defaults to None.
+        """
+        if register is None:
+            register = self._register
+        self.registered_currently_sharing_extended_operator = self.find_registered_currently_sharing_extended_operator(
+            register, self._load_extended_metadata_cache()
+        )
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(  # noqa: T201
+            f"[{current_time}] Found {len(self._registered_currently_sharing_extended_operator)} entries for registered_currently_sharing_extended_operator."
+        )
+
+    @classmethod
+    def _relay_addresses(cls, relay: Any) -> list[str]:
+        # The valid IPv4 and IPv6 addresses of a registered relay
+        if not isinstance(relay, dict):
+            return []
+        addresses = [relay.get("ipv4")]
+        if relay.get("ipv6") is not None:
+            addresses.append(cls._unshorten_ipv6(relay["ipv6"]))
+        return [address for address in addresses if address and address != "Invalid_IPv6"]
+
+    @classmethod
+    def _current_relay_ips(
+        cls, register: list[dict[str, Any]], index: dict[str, dict[str, dict[str, float]]]
+    ) -> dict[str, list[str]]:
+        # The registered relay IP addresses and the ones resolved in the last 4h, with their pools
+        relay_ips: dict[str, list[str]] = {}
+        for pool in register:
+            if isinstance(pool, dict) and pool.get("pool_status") == "registered":
+                for relay in pool.get("relays") or []:
+                    for address in cls._relay_addresses(relay):
+                        if pool["pool_id_bech32"] not in relay_ips.setdefault(address, []):
+                            relay_ips[address].append(pool["pool_id_bech32"])
+        cutoff = time.time() - timedelta(hours=4).total_seconds()
+        for family in ("4", "6"):
+            for resolved_ip, resolved_ip_pools in index.get(family, {}).items():
+                for mypool, last in resolved_ip_pools.items():
+                    if last > cutoff and mypool not in relay_ips.setdefault(resolved_ip, []):
+                        relay_ips[resolved_ip].append(mypool)
+        return relay_ips
+
+    @staticmethod
+    def build_asn_concentration(relay_ips: dict[str, list[str]], database: AsnDatabase) -> dict[str, Any]:
+        """Group the relay IP addresses and their pools by autonomous system.
+
+        Args:
+            relay_ips (dict[str, list[str]]): The pools of every relay IP address.
+            database (AsnDatabase): The IP address to autonomous system database.
+
+        Returns:
+            dict[str, Any]: The number of "pools" with relay addresses, the autonomous system
+                number of every address in "relays" (None if unknown), the number of "unknown"
+                addresses and, in "asns", the "name", the number of "relays", the "pools" and
+                the "share" of the pools of every autonomous system, with the most pools first.
+        """
+        relays: dict[str, int | None] = {}
+        asns: dict[int, dict[str, Any]] = {}
+        pools: set[str] = set()
+        for address in sorted(relay_ips):
+            found = database.lookup(address)
+            relays[address] = found[0] if found else None
+            pools.update(relay_ips[address])
+            if found:
+                entry = asns.setdefault(found[0], {"name": found[1], "relays": 0, "pools": set()})
+                entry["relays"] += 1
+                entry["pools"].update(relay_ips[address])
+        return {
+            "pools": len(pools),
+            "unknown": sum(asn is None for asn in relays.values()),
+            "asns": {
+                f"AS{asn}": {
+                    "name": entry["name"],
+                    "relays": entry["relays"],
+                    "pools": sorted(entry["pools"]),
+                    "share": round(len(entry["pools"]) / len(pools), 6),
+                }
+                for asn, entry in sorted(asns.items(), key=lambda item: (-len(item[1]["pools"]), item[0]))
+            },
+            "relays": relays,
+        }
+
+    def set_asn_concentration(self, register: list[dict[str, Any]] | None = None) -> None:
+        """Update the asn_concentration attribute with the current relay IP addresses.
+
+        Args:
+            register (list[dict[str, Any]] | None, optional): Register of pools,
+                when None it is loaded from the attribute. Defaults to None.
+        """
+        if register is None:
+            register = self._register
+        relay_ips = self._current_relay_ips(register, self.translations_index)
+        directory = os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR)
+        with AsnDatabase(
+            os.path.join(directory, str(self.CPC_ASN_DATABASE)), os.path.join(directory, self.CPC_ASN_INDEX_FILENAME)
+        ) as database:
+            self.asn_concentration = self.build_asn_concentration(relay_ips, database)
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(  # noqa: T201
+            f"[{current_time}] Found {len(self._asn_concentration['asns'])} autonomous systems for "
+            f"{len(relay_ips)} relay addresses, {self._asn_concentration['unknown']} unknown."
+        )
+
+    def _is_rule_safe(self, rule: str) -> bool:
+        # The rule is invalid if contains something else than lowercase letters, uppercase letters, spaces, and parentheses
+        pattern = r"^[a-zA-Z0-9 ()]*$"
+        if bool(re.match(pattern, rule)) is False:
+            return False
+        # Filter the parentheses from the rule and check if all the words are allowed
+        filtered_rule = re.sub(r"[^a-zA-Z0-9\s]", "", rule)
+        allowed = self.CPC_MSPO_RULES_ALLOWED_KEYWORDS
+        words = filtered_rule.split()
+        # Return True if all words are allowed, otherwise return False
+        return all(word in allowed for word in words)
+
+    def _are_rule_vars_safe(self, my_vars: dict[str, bool]) -> bool:
+        allowed = self.CPC_MSPO_RULES_ALLOWED_KEYWORDS
+        # Return False if any key is a non allowed word or if values are not bool, otherwise return True
+        return all(not (not isinstance(my_vars[my_var], bool) or str(my_var) not in allowed) for my_var in my_vars)
+
+    def build_classified_pools(  # noqa: C901, PLR0912
+        self,
+        pools_path: str,
+        pools_list: list[dict[str, str | list[str]]],
+        config_rules: list[dict[str, str | dict[str, str]]],
+    ) -> dict[str, list[dict[str, str | list[str]]]]:
+        """Builds lists of stake pools by classifying them using the provided rules.
+
+        Args:
+            pools_path (str): The path where the pool resources listings are stored.
+            pools_list (list[dict[str, str | list[str]]]): The list of pools to classify.
+            config_rules (list[dict[str, str  |  dict[str, str]]]): The rules to use for classifying.
+
+        Returns:
+            dict[str, list[dict[str, str|list[str]]]]: The classified lists of pools.
+        """
+        # Use a dictionary to store results for each rule
+        result_files = {}
+        # Get the allowed keywords in the rules definition
+        allowed = self.CPC_MSPO_RULES_ALLOWED_KEYWORDS
+        # The content of every rules file as text, loaded once for all the pools and rules
+        contents: dict[str, str] = {}
+        # Process each defined rule
+        for rule in config_rules:
+            matching_ids = []
+            non_matching_ids = []
+            if isinstance(rule["files"], dict):
+                for filename in rule["files"].values():
+                    if filename not in contents:
+                        with open(os.path.join(pools_path, filename)) as file:
+                            contents[filename] = str(json.load(file))
+                            cpc_telemetry.count("bytes_read", file.tell())
+            for pool in pools_list:
+                if isinstance(pool["pool_id_bech32"], str):
+                    id_value = pool["pool_id_bech32"]
+                reason = []
+                variables = {}
+                if isinstance(rule["files"], dict):
+                    for var, filename in rule["files"].items():
+                        variables[var] = id_value in contents[filename]
+                if (
+                    isinstance(rule["rule"], str)
+                    and self._is_rule_safe(rule["rule"])
+                    and self._are_rule_vars_safe(variables)
+                ):
+                    if eval(rule["rule"], variables):  # noqa: S307, PGH001
+                        for var in variables:
+                            if variables[var] and (var in allowed) and isinstance(rule["files"], dict):
+                                reason.append(self.CPC_POOLS_URL + str(rule["files"].get(var)))  # noqa: PERF401
+                        my_pool = pool.copy()
+                        my_pool["reason"] = reason
+                        matching_ids.append(my_pool)
+                    else:
+                        non_matching_ids.append(pool)
+            if isinstance(rule["matching_file"], str) and isinstance(rule["non_matching_file"], str):
+                result_files[rule["matching_file"]] = matching_ids
+                result_files[rule["non_matching_file"]] = non_matching_ids
+        return result_files
+
+    def set_classified_pools(self) -> None:
+        """Update the classified_pools attribute."""
+        # Get the list of pools
+        try:
+            with open(os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, self.CPC_POOLS_LIST_FILENAME)) as file:
                 pools_list = json.load(file)
+                cpc_telemetry.count("bytes_read", file.tell())
         except FileNotFoundError:
             print("Pools list File not found.")  # noqa: T201
         except OSError as exc:
@@ -2021,3 +4385,360 @@ class CardanoPoolChecker:
         for rule in self.classified_pools:
             current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
             print(f"[{current_time}] Found {len(self.classified_pools[rule])} entries for {rule!s} rule.")  # noqa: T201
+
+    @staticmethod
+    def build_pool_index(
+        maps: dict[str, dict[str, list[str]]],
+        classified: dict[str, list[dict[str, Any]]],
+        pools_list: list[dict[str, Any]] | None = None,
+    ) -> dict[str, Any]:
+        """Build the pool to shared resources index used to explain the classification of a pool.
+
+        Args:
+            maps (dict[str, dict[str, list[str]]]): The sharing maps by name (the file name without
+                extension, e.g. "registered_sharing_owners"), each one with the pools sharing
+                every resource.
+            classified (dict[str, list[dict[str, Any]]]): The matching files of the rules, with
+                their pools.
+            pools_list (list[dict[str, Any]] | None, optional): The pools list, to show the tickers.
+                Defaults to None.
+
+        Returns:
+            dict[str, Any]: The index, with the "maps" and, by pool id, the (map, resource)
+                pairs of its "resources", the "rules" files it matches and its "tickers".
+        """
+        resources: dict[str, list[tuple[str, str]]] = {}
+        for name, sharing_map in maps.items():
+            for resource, pool_ids in sharing_map.items():
+                for pool_id in pool_ids:
+                    resources.setdefault(pool_id, []).append((name, resource))
+        rules: dict[str, list[str]] = {}
+        for filename, pools in classified.items():
+            for pool in pools:
+                rules.setdefault(str(pool.get("pool_id_bech32")), []).append(filename)
+        tickers = {}
+        for pool in pools_list or []:
+            tickers[str(pool.get("pool_id_bech32"))] = pool.get("ticker")
+        return {"maps": maps, "resources": resources, "rules": rules, "tickers": tickers}
+
+    @staticmethod
+    def _pool_resources(index: dict[str, Any], pool_id: str) -> list[dict[str, Any]]:
+        # The current and historical maps of a resource type are merged in one entry
+        resources: dict[tuple[str, str], dict[str, Any]] = {}
+        for name, resource in index["resources"].get(pool_id, []):
+            kind = name.removeprefix("registered_")
+            current = kind.startswith("currently_")
+            kind = kind.removeprefix("currently_").removeprefix("sharing_")
+            entry = resources.setdefault(
+                (kind, resource), {"type": kind, "resource": resource, "current_peers": [], "historical_peers": []}
+            )
+            peers = [peer for peer in index["maps"][name][resource] if peer != pool_id]
+            entry["current_peers" if current else "historical_peers"] = peers
+        return list(resources.values())
+
+    def _load_data_file(self, filename: str, attribute: Any = None) -> Any:
+        # The content of a file of the data directory, None if it's missing. The attribute
+        # holding the content, when it was built by this instance, avoids reading it again.
+        if attribute is not None:
+            return attribute
+        try:
+            with open(os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR, filename)) as file:
+                data = json.load(file)
+                cpc_telemetry.count("bytes_read", file.tell())
+                return data
+        except FileNotFoundError:
+            return None
+
+    def load_pool_index(self) -> None:
+        """Load the pool index from the sharing maps, the rules files and the pools list.
+
+        The ones built by this instance are taken from its attributes, the other ones are
+        loaded from the files of the data directory.
+        """
+        attributes = vars(self)
+        load = self._load_data_file
+        maps = {}
+        for stage in self.build_update_stages():
+            if stage.name.startswith("registered_"):
+                for filename in stage.outputs:
+                    name = filename.removesuffix(".json")
+                    sharing_map = load(filename, attributes.get("_" + name))
+                    if isinstance(sharing_map, dict):
+                        maps[name] = sharing_map
+        classified = {}
+        for rule in self.CPC_MSPO_RULES:
+            filename = str(rule["matching_file"])
+            pools = load(filename, attributes.get("_classified_pools", {}).get(filename))
+            if isinstance(pools, list):
+                classified[filename] = pools
+        pools_list = load(self.CPC_POOLS_LIST_FILENAME, attributes.get("_pools"))
+        self._pool_index = self.build_pool_index(maps, classified, pools_list)
+
+    @classmethod
+    def build_pool_report(cls, index: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        """Build the report of every pool from the pool index.
+
+        The pools sharing some resource, currently or in the past, directly or
+        through other pools, form a cluster named after its lowest pool id.
+
+        Args:
+            index (dict[str, Any]): The pool index, see build_pool_index.
+
+        Returns:
+            dict[str, dict[str, Any]]: By pool id, the "ticker", the shared "resources" as in
+                explain, the matching files of the "rules" the pool matches, its "cluster"
+                and the "cluster_size".
+        """
+        # Join the pools sharing each resource into clusters
+        parents: dict[str, str] = {}
+
+        def root(pool_id: str) -> str:
+            parents.setdefault(pool_id, pool_id)
+            while parents[pool_id] != pool_id:
+                parents[pool_id] = parents[parents[pool_id]]
+                pool_id = parents[pool_id]
+            return pool_id
+
+        for sharing_map in index["maps"].values():
+            for pool_ids in sharing_map.values():
+                first = root(pool_ids[0])
+                for pool_id in pool_ids[1:]:
+                    second = root(pool_id)
+                    if first != second:
+                        # The lowest pool id stays as the root, naming the cluster
+                        first, second = min(first, second), max(first, second)
+                        parents[second] = first
+        sizes: dict[str, int] = {}
+        for pool_id in parents:
+            cluster = root(pool_id)
+            sizes[cluster] = sizes.get(cluster, 0) + 1
+        report = {}
+        for pool_id in sorted(index["tickers"].keys() | index["resources"].keys()):
+            cluster = root(pool_id)
+            report[pool_id] = {
+                "ticker": index["tickers"].get(pool_id),
+                "resources": cls._pool_resources(index, pool_id),
+                "rules": index["rules"].get(pool_id, []),
+                "cluster": cluster,
+                "cluster_size": sizes.get(cluster, 1),
+            }
+        return report
+
+    def pool_report_shard(self, pool_id: str) -> str:
+        """Return the name of the pools report shard of a pool.
+
+        Args:
+            pool_id (str): The bech32 pool id.
+
+        Returns:
+            str: The shard file name, relative to the data directory.
+        """
+        prefix = pool_id.removeprefix("pool1")[: self.CPC_POOLS_REPORT_SHARD_LENGTH]
+        return f"{self.CPC_POOLS_REPORT_SHARDS_DIR}{prefix}.json"
+
+    def pool_report_shards(self) -> list[str]:
+        """Return the names of all the pools report shards.
+
+        Returns:
+            list[str]: The shard file names, relative to the data directory, empty when
+                the shards are disabled.
+        """
+        if not self.CPC_POOLS_REPORT_SHARD_LENGTH:
+            return []
+        prefixes = [""]
+        for _ in range(self.CPC_POOLS_REPORT_SHARD_LENGTH):
+            prefixes = [prefix + char for prefix in prefixes for char in BECH32_CHARSET]
+        return [f"{self.CPC_POOLS_REPORT_SHARDS_DIR}{prefix}.json" for prefix in prefixes]
+
+    def set_pool_report(self) -> None:
+        """Update the pool_report attribute."""
+        self.load_pool_index()
+        self.pool_report = self.build_pool_report(self._pool_index)
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[{current_time}] Found {len(self.pool_report)} entries for the pools report.")  # noqa: T201
+
+    @staticmethod
+    def build_changes(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+        """Compare two generations of the rules files and sharing maps.
+
+        Args:
+            previous (dict[str, Any]): The previous generation, with the pool ids of every rules
+                file in "lists" and the sharing maps by name in "maps".
+            current (dict[str, Any]): The current generation, in the same format.
+
+        Returns:
+            dict[str, Any]: By rules file in "lists", the pools "entered" and "left" and the
+                "count" of pools. By sharing map in "maps", the resources "shared" and "changed"
+                with their pools, the "unshared" resources and the "count" of resources. The
+                numbers of all of them in "totals".
+        """
+        totals = dict.fromkeys(("entered", "left", "shared", "changed", "unshared"), 0)
+        lists: dict[str, dict[str, list[str] | int]] = {}
+        for filename, pool_ids in current["lists"].items():
+            now, before = set(pool_ids), set(previous["lists"].get(filename, []))
+            entered, left = sorted(now - before), sorted(before - now)
+            lists[filename] = {"entered": entered, "left": left, "count": len(now)}
+            totals["entered"] += len(entered)
+            totals["left"] += len(left)
+        maps: dict[str, dict[str, dict[str, list[str]] | list[str] | int]] = {}
+        for name, sharing_map in current["maps"].items():
+            before_map = previous["maps"].get(name, {})
+            shared = {resource: sharing_map[resource] for resource in sorted(sharing_map.keys() - before_map.keys())}
+            changed = {
+                resource: sharing_map[resource]
+                for resource in sorted(sharing_map.keys() & before_map.keys())
+                if set(sharing_map[resource]) != set(before_map[resource])
+            }
+            unshared = sorted(before_map.keys() - sharing_map.keys())
+            maps[name] = {"shared": shared, "changed": changed, "unshared": unshared, "count": len(sharing_map)}
+            totals["shared"] += len(shared)
+            totals["changed"] += len(changed)
+            totals["unshared"] += len(unshared)
+        return {"lists": lists, "maps": maps, "totals": totals}
+
+    def set_changes(self) -> None:
+        """Update the changes attribute, comparing the rules files and sharing maps with the previous update.
+
+        The ones built by this instance are taken from its attributes, the other ones are
+        loaded from the files of the data directory.
+        """
+        attributes = vars(self)
+        load = self._load_data_file
+        current: dict[str, Any] = {"lists": {}, "maps": {}}
+        for stage in self.build_update_stages():
+            if stage.name.startswith("registered_"):
+                for filename in stage.outputs:
+                    name = filename.removesuffix(".json")
+                    sharing_map = load(filename, attributes.get("_" + name))
+                    if isinstance(sharing_map, dict):
+                        current["maps"][name] = sharing_map
+        for rule in self.CPC_MSPO_RULES:
+            for key in ("matching_file", "non_matching_file"):
+                pools = load(str(rule[key]), attributes.get("_classified_pools", {}).get(str(rule[key])))
+                if isinstance(pools, list):
+                    current["lists"][str(rule[key])] = sorted(str(pool.get("pool_id_bech32")) for pool in pools)
+        # Without a previous generation everything is new
+        previous = load(self.CPC_CHANGES_STATE_FILENAME) or {"lists": {}, "maps": {}}
+        self.changes = self.build_changes(previous, current)
+        if self.CPC_SAVE_TO_DISK:
+            self._save_json(self.CPC_CHANGES_STATE_FILENAME, current)
+        totals = self.changes["totals"]
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(  # noqa: T201
+            f"[{current_time}] Changes: {totals['entered']} pools entered and {totals['left']} left the rules files, "
+            f"{totals['shared']} resources shared, {totals['changed']} changed and {totals['unshared']} unshared."
+        )
+
+    @staticmethod
+    def membership_filter_filename(matching_file: str) -> str:
+        """Return the name of the Bloom filter file of a rule matching file.
+
+        Args:
+            matching_file (str): The matching file, e.g. "registered_multi_stake_pool_operators.json".
+
+        Returns:
+            str: The filter file, e.g. "registered_multi_stake_pool_operators.bloom.json".
+        """
+        return matching_file.removesuffix(".json") + ".bloom.json"
+
+    def set_membership_filters(self) -> None:
+        """Update the membership_filters attribute with the pools of every rule matching file."""
+        classified = vars(self).get("_classified_pools", {})
+        filters = {}
+        for rule in self.CPC_MSPO_RULES:
+            matching_file = str(rule["matching_file"])
+            pools = self._load_data_file(matching_file, classified.get(matching_file))
+            if pools is None:
+                continue
+            membership_filter = cpc_filter.BloomFilter.build(
+                (str(pool.get("pool_id_bech32")) for pool in pools), self.CPC_MEMBERSHIP_FILTER_FPR
+            )
+            filters[self.membership_filter_filename(matching_file)] = membership_filter.to_json()
+        self.membership_filters = filters
+        for filename, data in filters.items():
+            current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            print(  # noqa: T201
+                f"[{current_time}] Membership filter {filename}: {data['count']} pools in {data['bits'] // 8} bytes, "
+                f"false positive rate {data['false_positive_rate']:.5f}."
+            )
+
+    def published_files(self) -> list[str]:
+        """Return the names of the files published in every generation.
+
+        Returns:
+            list[str]: The pools list, the sharing maps, the rules files, their membership
+                filters and the pools report.
+        """
+        filenames = [self.CPC_POOLS_LIST_FILENAME]
+        for stage in self.build_update_stages():
+            if stage.name.startswith("registered_") or stage.name in ("classified_pools", "membership_filters"):
+                filenames += stage.outputs
+        return [*filenames, self.CPC_POOLS_REPORT_FILENAME]
+
+    def publish(self) -> int | None:
+        """Publish the current files as a new generation in CPC_PUBLISH_DIR, if they changed.
+
+        Returns:
+            int | None: The new generation, None if the files didn't change since the last one.
+        """
+        directory = os.path.join(os.path.dirname(__file__), self.CPC_DATA_DIR)
+        files = {}
+        for filename in self.published_files():
+            content = self._load_data_file(filename)
+            if content is not None:
+                files[filename] = content
+        publisher = cpc_publisher.Publisher(
+            os.path.join(directory, str(self.CPC_PUBLISH_DIR)),
+            self.CPC_PUBLISH_FULL_INTERVAL,
+            self.CPC_PUBLISH_KEEP_SNAPSHOTS,
+        )
+        generation = publisher.publish(files)
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        if generation is None:
+            print(f"[{current_time}] Published files unchanged.")  # noqa: T201
+        else:
+            print(f"[{current_time}] Published generation {generation}.")  # noqa: T201
+        return generation
+
+    def explain(self, pool_id: str) -> dict[str, Any]:
+        """Explain why a pool is classified as it is, listing the resources it shares and with whom.
+
+        The index is loaded from the data files on the first call, see load_pool_index,
+        after that every explanation only costs the size of its answer.
+
+        Args:
+            pool_id (str): The bech32 pool id.
+
+        Returns:
+            dict[str, Any]: The "pool_id_bech32", "ticker", the shared "resources", each one
+                with its "type", "resource", and the "current_peers" and "historical_peers" sharing
+                it, and the "rules" with their "matching_file", whether the pool "matches" it
+                and the rule "keywords" that apply to the pool.
+
+        Raises:
+            ValueError: If the pool is not in the pools list nor in any sharing map.
+        """
+        if getattr(self, "_pool_index", None) is None:
+            self.load_pool_index()
+        index = self._pool_index
+        if pool_id not in index["tickers"] and pool_id not in index["resources"]:
+            msg = f"Unknown pool {pool_id}."
+            raise ValueError(msg)
+        names = {name for name, _ in index["resources"].get(pool_id, [])}
+        rules = []
+        for rule in self.CPC_MSPO_RULES:
+            files = rule["files"] if isinstance(rule["files"], dict) else {}
+            rules.append(
+                {
+                    "matching_file": rule["matching_file"],
+                    "rule": rule["rule"],
+                    "matches": rule["matching_file"] in index["rules"].get(pool_id, []),
+                    "keywords": [var for var, filename in files.items() if filename.removesuffix(".json") in names],
+                }
+            )
+        return {
+            "pool_id_bech32": pool_id,
+            "ticker": index["tickers"].get(pool_id),
+            "resources": self._pool_resources(index, pool_id),
+            "rules": rules,
+        }
@@ -0,0 +1,249 @@
+"""Cardano Pool Checker client for the published files.
+
+Services that only consume the files published under CPC_POOLS_URL can use
+it instead of running the checker. The files are cached on disk and
+revalidated with conditional requests (If-None-Match / If-Modified-Since), at
+most once every max_age seconds, so an unchanged file costs a 304 answer at
+most. The cache has a bounded size, evicting the least recently used files.
+
+Example:
+    client = PoolsClient()
+    if client.contains("registered_multi_stake_pool_operators.json", pool_id):
+        ...
+"""
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any
+
+import urllib3
+from urllib3.exceptions import HTTPError
+
+import cardano_pool_checker.cardano_pool_checker_config as cpc_config
+
+try:
+    DEFAULT_URL = cpc_config.CPC_POOLS_URL
+except (NameError, AttributeError):
+    DEFAULT_URL = "https://raw.githubusercontent.com/blockopszone/cardano-pool-checker/main/cardano_pool_checker/pools/"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cardano_pool_checker")
+
+
+class PublishedFile:
+    """A published file, decoded only when its content is used.
+
+    Attributes:
+        name (str): The file name.
+        raw (bytes): The file content.
+        etag (str | None): The ETag of the content, if the server sent one.
+    """
+
+    def __init__(self, name: str, raw: bytes, etag: str | None = None) -> None:
+        """Initialize the file.
+
+        Args:
+            name (str): The file name.
+            raw (bytes): The file content.
+            etag (str | None, optional): The ETag of the content. Defaults to None.
+        """
+        self.name = name
+        self.raw = raw
+        self.etag = etag
+        self._data: Any = None
+        self._members: frozenset[str] | None = None
+
+    @property
+    def data(self) -> Any:
+        """Return the decoded JSON content.
+
+        Returns:
+            Any: The content, decoded on the first use.
+        """
+        if self._data is None:
+            self._data = json.loads(self.raw)
+        return self._data
+
+    @property
+    def members(self) -> frozenset[str]:
+        """Return the pool ids of the file.
+
+        Returns:
+            frozenset[str]: The pool ids of the entries of a list, or of the pools
+                sharing any resource in a sharing map, built on the first use.
+        """
+        if self._members is None:
+            data = self.data
+            if isinstance(data, dict):
+                self._members = frozenset(
+                    pool_id for pool_ids in data.values() if isinstance(pool_ids, list) for pool_id in pool_ids
+                )
+            else:
+                self._members = frozenset(
+                    str(entry.get("pool_id_bech32")) if isinstance(entry, dict) else str(entry) for entry in data
+                )
+        return self._members
+
+
+class PoolsClient:
+    """Fetches the published files with conditional requests, caching them on disk.
+
+    Attributes:
+        base_url (str): URL of the published files.
+        cache_dir (str): Directory of the cache.
+        max_bytes (int): Maximum size of the cached files.
+        max_age (float): Seconds during which a cached file is used without revalidating it.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        base_url: str = DEFAULT_URL,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: float = 300,
+        timeout: float = 30.0,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            base_url (str, optional): URL of the published files. Defaults to CPC_POOLS_URL.
+            cache_dir (str, optional): Directory of the cache. Defaults to ~/.cache/cardano_pool_checker.
+            max_bytes (int, optional): Maximum size of the cached files. Defaults to 256 MiB.
+            max_age (float, optional): Seconds during which a cached file is used without
+                revalidating it. Defaults to 300.
+            timeout (float, optional): Time limit in seconds of the requests. Defaults to 30.0.
+        """
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._http = urllib3.PoolManager(timeout=timeout, retries=False)
+        self._files: dict[str, tuple[float, PublishedFile]] = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, name: str) -> tuple[str, str]:
+        # The body and the validators of a cached file, named after its URL
+        key = hashlib.sha256((self.base_url + name).encode()).hexdigest()
+        return os.path.join(self.cache_dir, key + ".body"), os.path.join(self.cache_dir, key + ".meta")
+
+    def _store(self, path: str, data: bytes) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _evict(self) -> None:
+        # Remove the least recently used bodies, the modification time being the last use
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".body")]
+        except FileNotFoundError:
+            return
+        stats = sorted(((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries), reverse=True)
+        total = 0
+        for _, size, path in stats:
+            total += size
+            if total > self.max_bytes:
+                for stale_path in (path, path.removesuffix(".body") + ".meta"):
+                    with contextlib.suppress(FileNotFoundError):
+                        os.unlink(stale_path)
+
+    def _download(self, name: str, meta: dict[str, Any], raw: bytes | None) -> tuple[dict[str, Any], bytes, bool]:
+        # Download a file or revalidate its cached copy, returning its validators, its body and
+        # if the server answered. The cached copy is kept when the server fails.
+        headers = {}
+        if raw is not None and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if raw is not None and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            response = self._http.request("GET", self.base_url + name, headers=headers)
+        except HTTPError:
+            response = None
+        if response is not None and response.status == 200:  # noqa: PLR2004
+            meta = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+            self._store(self._paths(name)[0], response.data)
+            return meta, response.data, True
+        if raw is None:
+            reason = f": HTTP {response.status}." if response is not None else "."
+            msg = f"Error downloading {name}{reason}"
+            raise OSError(msg)
+        return meta, raw, response is not None and response.status == 304  # noqa: PLR2004
+
+    def fetch(self, name: str) -> PublishedFile:
+        """Return a published file, revalidating the cached copy when it's older than max_age.
+
+        When the server can't be reached, the cached copy is used whatever its age.
+
+        Args:
+            name (str): The file name, e.g. "registered_multi_stake_pool_operators.json".
+
+        Returns:
+            PublishedFile: The file.
+
+        Raises:
+            OSError: If the file can't be downloaded and it's not cached.
+        """
+        now = time.time()
+        with self._lock:
+            cached = self._files.get(name)
+        if cached is not None and now - cached[0] < self.max_age:
+            return cached[1]
+        body_path, meta_path = self._paths(name)
+        try:
+            with open(meta_path) as file:
+                meta = json.load(file)
+            with open(body_path, "rb") as file:
+                raw = file.read()
+        except (OSError, ValueError):
+            meta, raw = {}, None
+        # Time of the last answer of the server, a failed request is retried in the next fetch
+        checked = meta.get("validated", 0.0)
+        validated = False
+        if raw is None or now - checked >= self.max_age:
+            meta, raw, validated = self._download(name, meta, raw)
+            if validated:
+                checked = meta["validated"] = now
+                self._store(meta_path, json.dumps(meta).encode())
+        # An unchanged file keeps its decoded content
+        if cached is not None and cached[1].raw == raw:
+            published = cached[1]
+        else:
+            published = PublishedFile(name, raw, meta.get("etag"))
+        # Mark the body as recently used for the eviction
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(body_path)
+        if validated:
+            self._evict()
+        with self._lock:
+            self._files[name] = (checked, published)
+        return published
+
+    def get(self, name: str) -> Any:
+        """Return the decoded content of a published file.
+
+        Args:
+            name (str): The file name.
+
+        Returns:
+            Any: The JSON content.
+        """
+        return self.fetch(name).data
+
+    def contains(self, name: str, pool_id: str) -> bool:
+        """Return whether a pool is in a published list or sharing map.
+
+        Args:
+            name (str): The file name.
+            pool_id (str): The bech32 pool id.
+
+        Returns:
+            bool: Whether the pool is in the file.
+        """
+        return pool_id in self.fetch(name).members
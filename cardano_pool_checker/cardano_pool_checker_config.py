@@ -4,7 +4,109 @@ CPC_POOLS_UPDATES_FILENAME: str = "pools_updates.json"
 CPC_POOLS_REGISTER_FILENAME: str = "pools_register.json"
 CPC_POOLS_DNS_TRANSLATIONS_FILENAME: str = "pools_dns_translations.json"
 CPC_POOLS_LIST_FILENAME: str = "pools_list.json"
+CPC_POOLS_DNS_TRANSLATIONS_ARCHIVE_FILENAME: str = "pools_dns_translations_archive.json"
 CPC_SAVE_TO_DISK: bool = True
+# Base URL of the Koios API, it can point to a local stand-in server
+# (python -m cardano_pool_checker.cardano_pool_checker_koios_server).
+CPC_KOIOS_URL: str = "https://api.koios.rest/api/v0/"
+# Maximum number of concurrent DNS lookups when updating the translations.
+CPC_DNS_MAX_WORKERS: int = 32
+# Time limit in seconds for each DNS lookup.
+CPC_DNS_TIMEOUT: float = 5.0
+# Days to keep the translations of pools that are not registered anymore, also in the archive file.
+CPC_TRANSLATIONS_RETENTION_DAYS: int = 90
+# Days without being seen after which a translation is moved to the archive file.
+CPC_TRANSLATIONS_ARCHIVE_DAYS: int = 30
+# Opt in to use the archived translations in the "registered_sharing" (ever shared) lists.
+# Disabled by default, as it loads and merges the archive file on every update.
+CPC_TRANSLATIONS_ARCHIVE_IN_HISTORY: bool = False
+# Maximum number of update pipeline stages running at once.
+CPC_PIPELINE_MAX_WORKERS: int = 8
+# Time limit in seconds for the update pipeline stages, by stage name. Stages not
+# listed have no limit. A stage exceeding its limit skips the stages depending on it.
+CPC_STAGE_TIMEOUTS: dict[str, float] = {
+    "pools": 900,
+    "updates": 1800,
+    "translations": 3600,
+}
+# Seconds between the refresh cycles of the daemon mode (new updates polling).
+CPC_DAEMON_POLL_INTERVAL: float = 300
+# Seconds between the DNS sweeps of the daemon mode.
+CPC_DAEMON_DNS_INTERVAL: float = 3600
+# File with the time, CPU, memory, I/O, HTTP and DNS usage of every stage of the last update.
+CPC_RUN_REPORT_FILENAME: str = "run_report.json"
+# Measure the peak memory of the stages with tracemalloc (slows down the update).
+CPC_TELEMETRY_TRACE_MEMORY: bool = False
+# Write a cProfile dump of every stage into CPC_PROFILE_DIR under the data directory,
+# the stages run one at a time while they are profiled.
+CPC_PROFILE_STAGES: bool = False
+CPC_PROFILE_DIR: str = "profiles/"
+# Reuse the outputs of the stages whose input files and settings did not change since the
+# last update, recording their fingerprints in CPC_MANIFEST_FILENAME.
+CPC_REUSE_UNCHANGED_STAGES: bool = True
+CPC_MANIFEST_FILENAME: str = "manifest.json"
+# Prometheus textfile collector file written at the end of every update, relative to the
+# data directory or absolute, e.g. "/var/lib/node_exporter/textfile_collector/cpc.prom".
+CPC_METRICS_TEXTFILE: str | None = None
+# Binary snapshot of the loaded updates, register, translations and their indexes, written after
+# every successful update and used at start while the JSON files don't change. None to disable.
+CPC_SNAPSHOT_FILENAME: str | None = "cardano_pool_checker_state.pickle"
+# Report with the shared resources, peers, matching rules and cluster of every pool, also split
+# in CPC_POOLS_REPORT_SHARDS_DIR by the first CPC_POOLS_REPORT_SHARD_LENGTH characters of the
+# pool id after "pool1", e.g. pools_report/q.json. A length of 0 disables the shards.
+CPC_POOLS_REPORT_FILENAME: str = "pools_report.json"
+CPC_POOLS_REPORT_SHARDS_DIR: str = "pools_report/"
+CPC_POOLS_REPORT_SHARD_LENGTH: int = 1
+# Pools that entered or left every rule file and resources that became shared or unshared in
+# every sharing map since the previous update, compared with the pool ids and sharing maps
+# of that update kept in CPC_CHANGES_STATE_FILENAME.
+CPC_CHANGES_FILENAME: str = "changes.json"
+CPC_CHANGES_STATE_FILENAME: str = "changes_state.json"
+# Target false positive rate of the Bloom filters of the pools of every rule matching file,
+# written next to it with the .bloom.json extension.
+CPC_MEMBERSHIP_FILTER_FPR: float = 0.001
+# Download the metadata of the registered pools and check it against its on-chain hash, listing
+# the pools whose metadata url is unreachable (error or timeout) or whose metadata doesn't
+# match the hash or is bigger than the maximum size, for the "mtuc" and "mthc" rule keywords.
+# The valid results are cached by url and hash in CPC_METADATA_CACHE_FILENAME, the other ones
+# are checked again after CPC_METADATA_RECHECK_HOURS.
+CPC_METADATA_FETCH: bool = False
+CPC_METADATA_MAX_WORKERS: int = 16
+CPC_METADATA_TIMEOUT: float = 10.0
+CPC_METADATA_MAX_SIZE: int = 512
+CPC_METADATA_RECHECK_HOURS: float = 24
+CPC_METADATA_CACHE_FILENAME: str = "pools_metadata_cache.json"
+# Crawl the extended metadata url of the registered pools (the "extended" field of their
+# metadata) and list the pools sharing any operator identifier found in it (social handles,
+# contact, company and declared pool ids), for the "extc" rule keyword. At most
+# CPC_EXTENDED_METADATA_MAX_WORKERS urls are downloaded at the same time, with at most
+# CPC_EXTENDED_METADATA_MAX_PER_HOST connections to every host, and the crawl stops starting
+# requests after CPC_EXTENDED_METADATA_BUDGET seconds, the remaining urls being crawled by the
+# next updates. The responses are cached in CPC_EXTENDED_METADATA_CACHE_FILENAME and revalidated
+# with their ETag and Last-Modified headers.
+CPC_EXTENDED_METADATA_FETCH: bool = False
+CPC_EXTENDED_METADATA_MAX_WORKERS: int = 32
+CPC_EXTENDED_METADATA_MAX_PER_HOST: int = 2
+CPC_EXTENDED_METADATA_TIMEOUT: float = 10.0
+CPC_EXTENDED_METADATA_BUDGET: float = 300.0
+CPC_EXTENDED_METADATA_MAX_SIZE: int = 65536
+CPC_EXTENDED_METADATA_CACHE_FILENAME: str = "pools_extended_metadata_cache.json"
+# Local IP range to autonomous system database (a CSV/TSV file like the iptoasn.com or the
+# GeoLite2 ASN ones, or an MMDB file, which needs the maxminddb package), relative to the data
+# directory. When set, the current relay IP addresses are annotated with their autonomous system
+# in CPC_ASN_FILENAME, with the pools hosted by every one. The CSV/TSV databases are compiled to
+# CPC_ASN_INDEX_FILENAME the first time they are used.
+# CPC_ASN_DATABASE = "ip2asn-combined.tsv"
+CPC_ASN_DATABASE: str | None = None
+CPC_ASN_INDEX_FILENAME: str = "asn_index.bin"
+CPC_ASN_FILENAME: str = "pools_asn.json"
+# Directory, under the data directory, where every update publishes a new generation of the
+# pools list, the sharing maps, the rules files and the pools report, with a full snapshot every
+# CPC_PUBLISH_FULL_INTERVAL generations and deltas in between, for consumers syncing with
+# python -m cardano_pool_checker.cardano_pool_checker_publisher. None to disable.
+CPC_PUBLISH_DIR: str | None = None
+CPC_PUBLISH_FULL_INTERVAL: int = 10
+CPC_PUBLISH_KEEP_SNAPSHOTS: int = 3
 # Pool files URL prefix
 CPC_POOLS_URL: str = (
     "https://raw.githubusercontent.com/blockopszone/cardano-pool-checker/main/cardano_pool_checker/pools/"
@@ -60,4 +162,17 @@ CPC_MSPO_RULES_ALLOWED_KEYWORDS: list[str] = [
     "ip4c",
     "ip6c",
     "rwdc",
+    "sim",
+    "simc",
+    "ept",
+    "eptc",
+    "mtuc",
+    "mthc",
+    "extc",
 ]
+
+# Near-duplicate metadata detection (name and description) settings.
+# Minimum estimated Jaccard similarity between two pools metadata to group them.
+CPC_META_JSON_SIMILARITY_THRESHOLD: float = 0.8
+# Number of hash functions used to build the MinHash signatures.
+CPC_META_JSON_MINHASH_PERMUTATIONS: int = 128
@@ -0,0 +1,173 @@
+"""Cardano Pool Checker daemon mode.
+
+Keeps the updates, the register, the translations and their indexes in
+memory, polling Koios for new pool updates on a schedule and resolving the
+relays hostnames on a separate, slower cadence. Every refresh cycle only
+runs the stages whose inputs changed, and only the files whose content
+changed are written again.
+
+Example:
+    daemon = CardanoPoolCheckerDaemon()
+    daemon.run()
+"""
+import contextlib
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_pipeline import Pipeline, Stage
+
+if TYPE_CHECKING:
+    import threading
+
+
+class CardanoPoolCheckerDaemon:
+    """Long running refresh loop over a warm CardanoPoolChecker instance.
+
+    Attributes:
+        checker (CardanoPoolChecker): The instance holding the in memory state.
+        poll_interval (float): Seconds between the start of two refresh cycles.
+        dns_interval (float): Seconds between two DNS sweeps.
+    """
+
+    def __init__(
+        self,
+        checker: CardanoPoolChecker | None = None,
+        poll_interval: float | None = None,
+        dns_interval: float | None = None,
+    ) -> None:
+        """Initialize the daemon, loading the state from disk when no checker is passed.
+
+        Args:
+            checker (CardanoPoolChecker | None, optional): Instance holding the state. Defaults to None.
+            poll_interval (float | None, optional): Seconds between refresh cycles, when None
+                CPC_DAEMON_POLL_INTERVAL is used. Defaults to None.
+            dns_interval (float | None, optional): Seconds between DNS sweeps, when None
+                CPC_DAEMON_DNS_INTERVAL is used. Defaults to None.
+        """
+        self.checker = CardanoPoolChecker() if checker is None else checker
+        self.poll_interval = self.checker.CPC_DAEMON_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.dns_interval = self.checker.CPC_DAEMON_DNS_INTERVAL if dns_interval is None else dns_interval
+        self._last_dns: float | None = None
+        # Stages of a failed cycle, run again in the next one
+        self._pending: set[str] = set()
+        # Threads of the stages given up when exceeding their timeout, by stage name
+        self._abandoned: dict[str, threading.Thread] = {}
+
+    def _run_stages(self, names: set[str]) -> dict[str, str]:
+        # The inputs of the stages not selected are up to date in memory
+        stages = self.checker.select_update_stages(list(names), allow_stale=True)
+        pipeline = Pipeline(stages, self.checker.CPC_PIPELINE_MAX_WORKERS)
+        try:
+            status = pipeline.run()
+        finally:
+            self._abandoned.update(pipeline.abandoned)
+        pipeline.raise_for_status()
+        return status
+
+    def _busy_stages(self, stages: dict[str, Stage]) -> set[str]:
+        # The abandoned stages still running and the stages depending on them, directly or not
+        self._abandoned = {name: thread for name, thread in self._abandoned.items() if thread.is_alive()}
+        busy = set(self._abandoned)
+        pending = list(busy)
+        while pending:
+            current = pending.pop()
+            for stage in stages.values():
+                if current in stage.deps and stage.name not in busy:
+                    busy.add(stage.name)
+                    pending.append(stage.name)
+        return busy
+
+    def refresh(self, now: float | None = None) -> dict[str, str]:
+        """Run a refresh cycle.
+
+        The pools list and the new updates are always downloaded. The register
+        and the detectors reading it are only rebuilt when there are new
+        updates, the DNS translations only when the DNS interval has elapsed,
+        and the classification with the outputs derived from it only when some
+        of their inputs were recomputed. A stage given up in a previous cycle
+        whose thread is still running is not started again, nor the stages
+        depending on it, until the thread ends.
+
+        Args:
+            now (float | None, optional): Monotonic time of the cycle, used to decide
+                whether a DNS sweep is due. Defaults to None.
+
+        Returns:
+            dict[str, str]: The status of the stages run in the cycle.
+        """
+        checker = self.checker
+        if now is None:
+            now = time.monotonic()
+        pools = checker.build_pools(checker.CPC_KOIOS_URL)
+        pools_changed = pools != getattr(checker, "_pools", None)
+        if pools_changed:
+            checker.pools = pools
+        new_updates = checker.build_updates(checker.last_block_time, checker.CPC_KOIOS_URL)
+        if new_updates:
+            checker.updates = checker.updates + new_updates
+        dns_due = self._last_dns is None or now - self._last_dns >= self.dns_interval
+        stages = {stage.name: stage for stage in checker.build_update_stages()}
+        names = set(self._pending)
+        if new_updates:
+            # The hostnames of the new pools are resolved in the next DNS sweep
+            names |= {"register"} | {
+                name for name, stage in stages.items() if "register" in stage.deps and name != "translations"
+            }
+        if dns_due:
+            names |= {"translations", "compaction"}
+        if new_updates or dns_due:
+            names |= {name for name, stage in stages.items() if "compaction" in stage.deps}
+        if names or pools_changed:
+            names |= {"classified_pools"} | {name for name, stage in stages.items() if "classified_pools" in stage.deps}
+        # Two threads of the same stage would update the same state and files at once
+        waiting = names & self._busy_stages(stages)
+        names -= waiting
+        current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        print(  # noqa: T201
+            f"[{current_time}] Daemon cycle: {len(new_updates)} new updates, pools list "
+            f"{'changed' if pools_changed else 'unchanged'}, DNS sweep {'due' if dns_due else 'not due'}."
+        )
+        if waiting:
+            print(  # noqa: T201
+                f"[{current_time}] Daemon cycle: waiting for the abandoned stages {', '.join(sorted(self._abandoned))} "
+                f"to end before running {', '.join(sorted(waiting))}."
+            )
+        self._pending = names | waiting
+        status = self._run_stages(names) if names else {}
+        self._pending = waiting
+        if dns_due and "translations" not in waiting:
+            self._last_dns = now
+        return status
+
+    def run(self, cycles: int | None = None) -> None:
+        """Run refresh cycles every poll interval until interrupted.
+
+        A failed cycle is reported and retried in the next one, keeping the state in memory.
+
+        Args:
+            cycles (int | None, optional): Number of cycles to run, None to run forever. Defaults to None.
+        """
+        self.checker.info()
+        count = 0
+        while cycles is None or count < cycles:
+            start = time.monotonic()
+            try:
+                self.refresh(start)
+            except (Exception, SystemExit) as exc:
+                current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                print(f"[{current_time}] Daemon cycle failed: {exc!r}")  # noqa: T201
+            count += 1
+            if cycles is None or count < cycles:
+                time.sleep(max(0.0, self.poll_interval - (time.monotonic() - start)))
+
+
+def main() -> None:
+    """Run the daemon until interrupted."""
+    with contextlib.suppress(KeyboardInterrupt):
+        CardanoPoolCheckerDaemon().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Cardano Pool Checker module with the Bloom filters of the pools of the rules files.
+
+A filter answers whether a pool id is in a list without downloading the list:
+a pool of the list is always found, and a pool not in it is found with the
+probability given by its false_positive_rate. The filters are written as JSON,
+with the bits in base64, next to every rules file, e.g.
+registered_multi_stake_pool_operators.bloom.json.
+
+Example:
+    with open("registered_multi_stake_pool_operators.bloom.json") as file:
+        multi = BloomFilter.from_json(json.load(file))
+    if pool_id in multi:
+        ...
+"""
+import base64
+import hashlib
+import math
+from collections.abc import Iterable
+from typing import Any
+
+# Version of the format of the filters, readers must reject other versions
+FILTER_VERSION = 1
+
+
+class BloomFilter:
+    """Bloom filter of strings, with k bit positions derived from one blake2b digest.
+
+    Attributes:
+        bits (int): Number of bits of the filter.
+        hashes (int): Number of bit positions of every item.
+        count (int): Number of items added.
+    """
+
+    def __init__(self, bits: int, hashes: int, data: bytes | None = None, count: int = 0) -> None:
+        """Initialize an empty filter, or one with the given bits.
+
+        Args:
+            bits (int): Number of bits of the filter.
+            hashes (int): Number of bit positions of every item.
+            data (bytes | None, optional): The bits of the filter. Defaults to None.
+            count (int, optional): Number of items in the data. Defaults to 0.
+
+        Raises:
+            ValueError: If the data doesn't have the size of the filter.
+        """
+        self.bits = max(8, bits)
+        self.hashes = max(1, hashes)
+        self.count = count
+        size = (self.bits + 7) // 8
+        if data is not None and len(data) != size:
+            msg = f"Expected {size} bytes of filter data, got {len(data)}."
+            raise ValueError(msg)
+        self._data = bytearray(data) if data is not None else bytearray(size)
+
+    @classmethod
+    def build(cls, items: Iterable[str], false_positive_rate: float = 0.001) -> "BloomFilter":
+        """Build the smallest filter with the target false positive rate for the items.
+
+        Args:
+            items (Iterable[str]): The items.
+            false_positive_rate (float, optional): The target false positive rate. Defaults to 0.001.
+
+        Returns:
+            BloomFilter: The filter.
+        """
+        items = set(items)
+        count = max(1, len(items))
+        bits = math.ceil(-count * math.log(false_positive_rate) / math.log(2) ** 2)
+        bloom = cls(bits, round(bits / count * math.log(2)))
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item: str) -> list[int]:
+        # Double hashing, the positions are h1 + i * h2 modulo the size
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.bits for index in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter.
+
+        Args:
+            item (str): The item.
+        """
+        for position in self._positions(item):
+            self._data[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """Return whether an item may have been added, false positives being possible."""
+        data = self._data
+        return all(data[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Return the expected false positive rate with the items added.
+
+        Returns:
+            float: The probability of finding an item that was not added.
+        """
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    def to_json(self) -> dict[str, Any]:
+        """Return the filter as a JSON object.
+
+        Returns:
+            dict[str, Any]: The "version", "bits", "hashes", "count", "false_positive_rate"
+                and the base64 "data" of the filter.
+        """
+        return {
+            "version": FILTER_VERSION,
+            "hash": "blake2b-128-double",
+            "bits": self.bits,
+            "hashes": self.hashes,
+            "count": self.count,
+            "false_positive_rate": self.false_positive_rate,
+            "data": base64.b64encode(bytes(self._data)).decode(),
+        }
+
+    @classmethod
+    def from_json(cls, value: dict[str, Any]) -> "BloomFilter":
+        """Load a filter from a JSON object written by to_json.
+
+        Args:
+            value (dict[str, Any]): The JSON object.
+
+        Returns:
+            BloomFilter: The filter.
+
+        Raises:
+            ValueError: If the filter has another format version.
+        """
+        if value.get("version") != FILTER_VERSION:
+            msg = f"Unsupported filter version {value.get('version')}."
+            raise ValueError(msg)
+        return cls(value["bits"], value["hashes"], base64.b64decode(value["data"]), value["count"])
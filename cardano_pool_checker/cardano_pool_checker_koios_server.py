@@ -0,0 +1,236 @@
+"""Cardano Pool Checker local Koios stand-in server.
+
+Serves the pool_list and pool_updates endpoints of the Koios API from
+recorded or synthetic data, supporting the PostgREST style parameters used
+by the ingestion (offset, limit, order and column filters such as
+block_time=gt.123). Latency and errors can be injected to reproduce slow or
+unreliable upstreams. Point CPC_KOIOS_URL to the printed URL to use it.
+
+Example:
+    python -m cardano_pool_checker.cardano_pool_checker_koios_server --synthetic 10000 --port 8053
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset
+
+PREFIX = "/api/v0/"
+OPERATORS = {
+    "eq": lambda value, other: value == other,
+    "neq": lambda value, other: value != other,
+    "gt": lambda value, other: value > other,
+    "gte": lambda value, other: value >= other,
+    "lt": lambda value, other: value < other,
+    "lte": lambda value, other: value <= other,
+}
+
+
+def _cast(value: str, sample: Any) -> Any:
+    # Convert a filter value to the type of the column
+    if isinstance(sample, bool) or sample is None:
+        return value
+    if isinstance(sample, int):
+        return int(value)
+    if isinstance(sample, float):
+        return float(value)
+    return value
+
+
+def query(rows: list[dict[str, Any]], params: list[tuple[str, str]]) -> list[dict[str, Any]]:
+    """Apply PostgREST style filters, order, offset and limit parameters to a list of rows.
+
+    Args:
+        rows (list[dict[str, Any]]): The rows of the endpoint.
+        params (list[tuple[str, str]]): The query string parameters.
+
+    Returns:
+        list[dict[str, Any]]: The selected rows.
+
+    Raises:
+        ValueError: If a parameter is not valid.
+    """
+    offset = 0
+    limit = None
+    order = None
+    for name, value in params:
+        if name == "offset":
+            offset = int(value)
+        elif name == "limit":
+            limit = int(value)
+        elif name == "order":
+            order = value
+        elif name == "select":
+            continue
+        else:
+            operator, _, other = value.partition(".")
+            if operator not in OPERATORS:
+                msg = f"Unsupported filter {name}={value}."
+                raise ValueError(msg)
+            sample = next((row.get(name) for row in rows if row.get(name) is not None), None)
+            other_value = _cast(other, sample)
+            rows = [row for row in rows if row.get(name) is not None and OPERATORS[operator](row[name], other_value)]
+    if order is not None:
+        for column in reversed(order.split(",")):
+            name, _, direction = column.partition(".")
+            rows = sorted(rows, key=lambda row: (row.get(name) is None, row.get(name)), reverse=direction == "desc")
+    rows = rows[offset:]
+    if limit is not None:
+        rows = rows[:limit]
+    return rows
+
+
+class KoiosServer:
+    """Local HTTP server answering the Koios pool_list and pool_updates endpoints.
+
+    Attributes:
+        url (str): Base URL of the API, to use as CPC_KOIOS_URL.
+        requests (int): Number of requests received.
+
+    Example:
+        with KoiosServer(pools, updates) as server:
+            updates = CardanoPoolChecker.build_updates(0, server.url)
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        pools: list[dict[str, Any]],
+        updates: list[dict[str, Any]],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the server, listening on a random free port by default.
+
+        Args:
+            pools (list[dict[str, Any]]): Rows served by the pool_list endpoint.
+            updates (list[dict[str, Any]]): Rows served by the pool_updates endpoint.
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, 0 for a free one. Defaults to 0.
+            latency (float, optional): Seconds to wait before answering every request. Defaults to 0.0.
+            error_rate (float, optional): Fraction of the requests answered with a 503 error. Defaults to 0.0.
+            seed (int, optional): Seed deciding which requests fail. Defaults to 0.
+        """
+        self.endpoints = {"pool_list": pools, "pool_updates": updates}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                server.handle(self)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ARG002
+                return
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self.httpd.server_address[1]}{PREFIX}"
+
+    def handle(self, request: BaseHTTPRequestHandler) -> None:
+        """Answer a request to one of the endpoints.
+
+        Args:
+            request (BaseHTTPRequestHandler): The request being handled.
+        """
+        with self._lock:
+            self.requests += 1
+            failed = self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        parts = urlsplit(request.path)
+        endpoint = parts.path.removeprefix(PREFIX)
+        status = 200
+        body: dict[str, str] | list[dict[str, Any]]
+        if failed:
+            status, body = 503, {"message": "Injected error"}
+        elif endpoint not in self.endpoints:
+            status, body = 404, {"message": f"Unknown endpoint {endpoint}"}
+        else:
+            try:
+                body = query(self.endpoints[endpoint], parse_qsl(parts.query))
+            except ValueError as exc:
+                status, body = 400, {"message": str(exc)}
+        data = json.dumps(body).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(data)))
+        request.end_headers()
+        request.wfile.write(data)
+
+    def start(self) -> "KoiosServer":
+        """Start serving in a background thread.
+
+        Returns:
+            KoiosServer: The server itself.
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "KoiosServer":
+        """Start serving when entering the context."""
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        """Stop serving when leaving the context."""
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the stand-in server from the command line until interrupted.
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments, None to use sys.argv. Defaults to None.
+    """
+    parser = argparse.ArgumentParser(description="Serve the Koios pool_list and pool_updates endpoints locally.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8053, help="port to listen on")
+    parser.add_argument("--pools", help="JSON file with the pool_list rows (e.g. pools_list.json)")
+    parser.add_argument("--updates", help="JSON file with the pool_updates rows (e.g. pools_updates.json)")
+    parser.add_argument("--synthetic", type=int, help="serve synthetic data with this number of pools instead")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic data and the injected errors")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before every answer")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args(argv)
+
+    pools: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
+    if args.synthetic:
+        dataset = generate_dataset(args.synthetic, seed=args.seed)
+        pools, updates = dataset["pools"], dataset["updates"]
+    if args.pools:
+        with open(args.pools) as file:
+            pools = json.load(file)
+    if args.updates:
+        with open(args.updates) as file:
+            updates = json.load(file)
+    server = KoiosServer(pools, updates, args.host, args.port, args.latency, args.error_rate, args.seed)
+    print(f"Serving {len(pools)} pools and {len(updates)} updates at {server.url}")  # noqa: T201
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
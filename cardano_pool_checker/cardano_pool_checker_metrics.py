@@ -0,0 +1,184 @@
+"""Cardano Pool Checker module exporting the update metrics in the Prometheus text format.
+
+The file is meant for the textfile collector of the Prometheus node exporter,
+pointing CPC_METRICS_TEXTFILE to a .prom file in its directory, e.g.
+/var/lib/node_exporter/textfile_collector/cardano_pool_checker.prom.
+"""
+import os
+import re
+import tempfile
+import time
+from typing import Any
+
+PREFIX = "cardano_pool_checker_"
+
+COUNTERS_HELP = {
+    "bytes_read": "Bytes of data files read during the last update.",
+    "bytes_written": "Bytes of data files written during the last update.",
+    "http_requests": "HTTP requests made during the last update, including the retries.",
+    "koios_errors": "Koios requests that failed during the last update.",
+    "koios_retries": "Koios requests retried during the last update.",
+    "dns_queries": "DNS lookups made during the last update.",
+    "dns_failures": "DNS lookups without an answer (timeouts, NXDOMAIN...) during the last update.",
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class _Metrics:
+    # Groups the samples of every metric under its HELP and TYPE lines
+    def __init__(self) -> None:
+        self.metrics: dict[str, tuple[str, list[str]]] = {}
+
+    def add(self, name: str, help_text: str, value: float, labels: dict[str, str] | None = None) -> None:
+        samples = self.metrics.setdefault(PREFIX + name, (help_text, []))[1]
+        label_text = ",".join(f'{key}="{_escape(str(label))}"' for key, label in (labels or {}).items())
+        if label_text:
+            label_text = "{" + label_text + "}"
+        samples.append(f"{PREFIX}{name}{label_text} {_format_value(value)}")
+
+    def text(self) -> str:
+        lines = []
+        for name, (help_text, samples) in self.metrics.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", *samples]
+        return "\n".join(lines) + "\n"
+
+
+def build_metrics(  # noqa: C901, PLR0912
+    report: dict[str, Any],
+    counts: dict[str, Any],
+    last_block_time: int = 0,
+    last_success: float | None = None,
+    now: float | None = None,
+) -> str:
+    """Build the Prometheus text exposition of the metrics of an update run.
+
+    Args:
+        report (dict[str, Any]): The run report, as returned by Telemetry.stop.
+        counts (dict[str, Any]): Record counts: "pools", "updates", "register" and
+            "hostnames" numbers, and "sharing" and "rules" entries by file name.
+        last_block_time (int, optional): Block time of the last known pool update,
+            0 when unknown. Defaults to 0.
+        last_success (float | None, optional): Time of the last successful update,
+            used when this run failed. Defaults to None.
+        now (float | None, optional): Current time, None to use time.time(). Defaults to None.
+
+    Returns:
+        str: The metrics in the Prometheus text format.
+    """
+    if now is None:
+        now = time.time()
+    stages = report.get("stages", {})
+    success = all(stage.get("status") == "done" for stage in stages.values())
+    if success:
+        last_success = now
+    metrics = _Metrics()
+    metrics.add("last_run_timestamp_seconds", "Unix time of the end of the last update.", now)
+    if last_success is not None:
+        metrics.add(
+            "last_success_timestamp_seconds", "Unix time of the end of the last successful update.", last_success
+        )
+    metrics.add("run_success", "Whether all the stages of the last update were done.", success)
+    metrics.add("run_duration_seconds", "Wall time of the last update.", report.get("wall_time", 0.0))
+    for name, stage in stages.items():
+        labels = {"stage": name}
+        metrics.add(
+            "stage_success", "Whether the stage was done in the last update.", stage["status"] == "done", labels
+        )
+        metrics.add(
+            "stage_reused",
+            "Whether the stage outputs were reused in the last update.",
+            name in report.get("reused", []),
+            labels,
+        )
+        if "wall_time" in stage:
+            metrics.add(
+                "stage_duration_seconds", "Wall time of the stage in the last update.", stage["wall_time"], labels
+            )
+            metrics.add(
+                "stage_cpu_seconds", "CPU time of the stage thread in the last update.", stage["cpu_time"], labels
+            )
+    totals = report.get("totals", {})
+    for counter, help_text in COUNTERS_HELP.items():
+        if counter in totals:
+            metrics.add(counter, help_text, totals[counter])
+    if totals.get("dns_queries"):
+        metrics.add(
+            "dns_failure_ratio",
+            "Fraction of the DNS lookups of the last update without an answer.",
+            totals.get("dns_failures", 0) / totals["dns_queries"],
+        )
+    for name, help_text in (
+        ("pools", "Stake pools in the pools list."),
+        ("updates", "Pool updates downloaded from Koios."),
+        ("register", "Stake pools in the register."),
+        ("hostnames", "Relay hostnames tracked in the DNS translations."),
+    ):
+        if counts.get(name) is not None:
+            metrics.add(name, help_text, counts[name])
+    for filename, entries in counts.get("sharing", {}).items():
+        metrics.add("sharing_entries", "Pools sharing resources in every sharing map.", entries, {"file": filename})
+    for filename, entries in counts.get("rules", {}).items():
+        metrics.add("rule_entries", "Pools in the files of every classification rule.", entries, {"file": filename})
+    if last_block_time:
+        metrics.add("last_block_time_seconds", "Block time of the last known pool update.", last_block_time)
+        metrics.add(
+            "last_block_time_lag_seconds",
+            "Seconds since the block time of the last known pool update.",
+            now - last_block_time,
+        )
+    return metrics.text()
+
+
+def read_last_success(path: str) -> float | None:
+    """Read the time of the last successful update from a previously written metrics file.
+
+    Args:
+        path (str): The metrics file.
+
+    Returns:
+        float | None: The time, or None if the file or the metric doesn't exist.
+    """
+    try:
+        with open(path) as file:
+            text = file.read()
+    except OSError:
+        return None
+    match = re.search(rf"^{PREFIX}last_success_timestamp_seconds (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def write_textfile(path: str, text: str) -> None:
+    """Write a metrics file atomically, so the collector never reads it half written.
+
+    The text is written to a temporary file of the same directory, which is
+    then renamed over the destination.
+
+    Args:
+        path (str): The metrics file, with the .prom extension for the textfile collector.
+        text (str): The metrics.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates the file only readable by its owner
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
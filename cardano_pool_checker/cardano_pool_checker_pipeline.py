@@ -0,0 +1,283 @@
+"""Cardano Pool Checker module containing the update pipeline scheduler."""
+import contextlib
+import io
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from datetime import datetime, timezone
+from typing import Any, TextIO, cast
+
+
+class PipelineError(RuntimeError):
+    """Raised when some stages of a pipeline did not complete."""
+
+
+class Stage:
+    """A named unit of work of a pipeline.
+
+    Attributes:
+        name (str): Unique name of the stage.
+        func (Callable[[], Any]): Callable run without arguments by the scheduler.
+        deps (tuple[str, ...]): Names of the stages that must be done before this one starts.
+        timeout (float | None): Seconds the stage may run before it is given up, None for no limit.
+        outputs (tuple[str, ...]): Names of the files written by the stage.
+        inputs (tuple[str, ...]): Names of the files the result of the stage depends on, empty
+            when it also depends on something else, like the network or the current time.
+        optional_deps (tuple[str, ...]): Names of the dependencies that must be finished before
+            this stage starts, but whose failure doesn't skip it.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        func: Callable[[], Any],
+        deps: Iterable[str] = (),
+        timeout: float | None = None,
+        outputs: Iterable[str] = (),
+        inputs: Iterable[str] = (),
+        optional_deps: Iterable[str] = (),
+    ) -> None:
+        """Initialize the stage.
+
+        Args:
+            name (str): Unique name of the stage.
+            func (Callable[[], Any]): Callable run without arguments by the scheduler.
+            deps (Iterable[str], optional): Names of the stages this one depends on. Defaults to ().
+            timeout (float | None, optional): Seconds the stage may run, None for no limit.
+                Defaults to None.
+            outputs (Iterable[str], optional): Names of the files written by the stage. Defaults to ().
+            inputs (Iterable[str], optional): Names of the files the result of the stage depends on.
+                Defaults to ().
+            optional_deps (Iterable[str], optional): Names of the dependencies, also listed in deps,
+                whose failure doesn't skip this stage. Defaults to ().
+        """
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.timeout = timeout
+        self.outputs = tuple(outputs)
+        self.inputs = tuple(inputs)
+        self.optional_deps = tuple(optional_deps)
+
+
+class Pipeline:
+    """Dependency graph of stages run by a thread pool scheduler.
+
+    Every stage starts as soon as all its dependencies are done, so
+    independent branches of the graph run concurrently. When a stage fails
+    or exceeds its timeout, only the stages depending on it (directly or
+    not) are skipped, the rest of the graph keeps running. The stages with
+    it as an optional dependency run anyway once it's finished.
+
+    Every stage runs in its own daemon thread, a stage exceeding its timeout
+    can't be stopped but it is abandoned and doesn't keep the interpreter
+    from exiting. The threads of the abandoned stages are kept in the
+    abandoned attribute, so callers can wait for them to end. While the pipeline runs, the lines printed by the stages
+    are written whole so they don't interleave.
+
+    Example:
+        pipeline = Pipeline([Stage("a", func_a), Stage("b", func_b, deps=["a"])])
+        pipeline.run()
+    """
+
+    DONE = "done"
+    FAILED = "failed"
+    TIMEOUT = "timeout"
+    SKIPPED = "skipped"
+
+    def __init__(self, stages: Iterable[Stage], max_workers: int = 8) -> None:
+        """Initialize the pipeline checking that the stages form a valid graph.
+
+        Args:
+            stages (Iterable[Stage]): The stages of the pipeline.
+            max_workers (int, optional): Maximum number of stages running at once. Defaults to 8.
+
+        Raises:
+            ValueError: If a stage name is repeated, a dependency is unknown or there is a cycle.
+        """
+        self.stages: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                msg = f"Duplicated stage name: {stage.name}."
+                raise ValueError(msg)
+            self.stages[stage.name] = stage
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    msg = f"Unknown dependency {dep} for stage {stage.name}."
+                    raise ValueError(msg)
+            for dep in stage.optional_deps:
+                if dep not in stage.deps:
+                    msg = f"Optional dependency {dep} of stage {stage.name} is not one of its dependencies."
+                    raise ValueError(msg)
+        self._check_acyclic()
+        self.max_workers = max(1, max_workers)
+        self.status: dict[str, str] = {}
+        self.errors: dict[str, BaseException] = {}
+        self.abandoned: dict[str, threading.Thread] = {}
+
+    def _check_acyclic(self) -> None:
+        # Kahn's algorithm, any stage left unvisited is part of a cycle
+        pending = {name: len(stage.deps) for name, stage in self.stages.items()}
+        ready = [name for name, count in pending.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for other in self.stages.values():
+                if name in other.deps:
+                    pending[other.name] -= 1
+                    if pending[other.name] == 0:
+                        ready.append(other.name)
+        if visited != len(self.stages):
+            msg = "The pipeline stages contain a dependency cycle."
+            raise ValueError(msg)
+
+    def _skip_dependents(self, name: str) -> None:
+        # Skip every stage that depends, directly or not, on the given one
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            for stage in self.stages.values():
+                if current in stage.deps and current not in stage.optional_deps and stage.name not in self.status:
+                    self.status[stage.name] = self.SKIPPED
+                    current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                    print(f"[{current_time}] Stage {stage.name}: skipped, depends on {current}.")  # noqa: T201
+                    pending.append(stage.name)
+
+    def _finish(self, name: str, status: str, error: BaseException | None = None) -> None:
+        self.status[name] = status
+        if status != self.DONE:
+            if error is not None:
+                self.errors[name] = error
+            current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"[{current_time}] Stage {name}: {status}{f' ({error!r})' if error else ''}.")  # noqa: T201
+            self._skip_dependents(name)
+
+    def _ready(self, stage: Stage) -> bool:
+        # The stage didn't start and its dependencies are done, or just finished when optional
+        if stage.name in self.status:
+            return False
+        return all(
+            self.status.get(dep) == self.DONE or (dep in stage.optional_deps and dep in self.status)
+            for dep in stage.deps
+        )
+
+    @staticmethod
+    def _start(stage: Stage) -> tuple[Future[Any], threading.Thread]:
+        # Run the stage in a daemon thread, so a stage given up can't keep the interpreter alive
+        future: Future[Any] = Future()
+
+        def target() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = stage.func()
+            except BaseException as exc:  # noqa: BLE001
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+        thread = threading.Thread(target=target, name=f"cpc-stage-{stage.name}", daemon=True)
+        thread.start()
+        return future, thread
+
+    def run(self) -> dict[str, str]:
+        """Run all the stages respecting their dependencies.
+
+        Returns:
+            dict[str, str]: The final status of every stage, one of "done",
+                "failed", "timeout" or "skipped".
+        """
+        self.status = {}
+        self.errors = {}
+        self.abandoned = {}
+        running: dict[Future[Any], tuple[str, float | None]] = {}
+        threads: dict[str, threading.Thread] = {}
+        with contextlib.redirect_stdout(cast(TextIO, LineWriter(sys.stdout))):
+            while len(self.status) < len(self.stages):
+                # Start the stages whose dependencies are done while there are free workers
+                started = {name for name, _ in running.values()}
+                for stage in self.stages.values():
+                    if len(running) >= self.max_workers:
+                        break
+                    if stage.name not in started and self._ready(stage):
+                        deadline = None if stage.timeout is None else time.monotonic() + stage.timeout
+                        future, threads[stage.name] = self._start(stage)
+                        running[future] = (stage.name, deadline)
+                if not running:
+                    break
+                # Wait until a stage finishes or the nearest deadline is reached
+                deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+                wait_time = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                done, _ = wait(running, timeout=wait_time, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, _ = running.pop(future)
+                    error = future.exception()
+                    self._finish(name, self.DONE if error is None else self.FAILED, error)
+                now = time.monotonic()
+                for future, (name, deadline) in list(running.items()):
+                    if deadline is not None and deadline <= now:
+                        # A running thread can't be stopped, it is abandoned and its result ignored
+                        del running[future]
+                        self.abandoned[name] = threads[name]
+                        self._finish(name, self.TIMEOUT)
+        return self.status
+
+    def raise_for_status(self) -> None:
+        """Raise an exception if some stage of the last run did not complete.
+
+        Raises:
+            PipelineError: If any stage failed, timed out or was skipped.
+        """
+        incomplete = {name: status for name, status in self.status.items() if status != self.DONE}
+        if incomplete:
+            details = ", ".join(f"{name} ({status})" for name, status in incomplete.items())
+            msg = f"Pipeline stages not completed: {details}."
+            raise PipelineError(msg) from next(iter(self.errors.values()), None)
+
+
+class LineWriter(io.TextIOBase):
+    """Text stream writing whole lines to another one, so the lines of concurrent threads don't interleave.
+
+    Every thread keeps its incomplete line until it's ended, then it's written
+    under a lock shared by all the threads.
+
+    Example:
+        with contextlib.redirect_stdout(cast(TextIO, LineWriter(sys.stdout))):
+            run_threads()
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize the writer.
+
+        Args:
+            stream (TextIO): The stream the lines are written to.
+        """
+        super().__init__()
+        self.stream = stream
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def write(self, text: str) -> int:
+        """Write the complete lines of the text, keeping the last incomplete one of the thread.
+
+        Args:
+            text (str): The text to write.
+
+        Returns:
+            int: The number of characters of the text.
+        """
+        lines, newline, rest = (getattr(self._local, "pending", "") + text).rpartition("\n")
+        self._local.pending = rest
+        if newline:
+            with self._lock:
+                self.stream.write(lines + newline)
+        return len(text)
+
+    def flush(self) -> None:
+        """Flush the written lines."""
+        with self._lock:
+            self.stream.flush()
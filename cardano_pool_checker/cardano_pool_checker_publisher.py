@@ -0,0 +1,368 @@
+r"""Cardano Pool Checker module publishing numbered generations of the data files.
+
+Every update whose files changed becomes a new generation. The publish
+directory holds:
+
+    index.json              the last generation, the digests of its files and the
+                            sizes of the available snapshots and deltas
+    snapshots/<n>.json      every file of generation n, written every few generations
+    deltas/<n>.json         the changes of the files from generation n - 1 to n
+
+The deltas replace ranges of the items of the JSON lists, or of the (key, value)
+pairs of the JSON objects, so applying them rebuilds the files byte for byte.
+A consumer keeps a copy of the files and syncs it to the last generation with
+the fewest downloaded bytes, see sync:
+
+    python -m cardano_pool_checker.cardano_pool_checker_publisher \
+        https://raw.githubusercontent.com/blockopszone/cardano-pool-checker/main/cardano_pool_checker/pools/published/ \
+        ./pools
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+from difflib import SequenceMatcher
+from typing import Any
+
+import urllib3
+
+import cardano_pool_checker.cardano_pool_checker_telemetry as cpc_telemetry
+from cardano_pool_checker.cardano_pool_checker_metrics import write_textfile
+
+# Version of the format of the publish directory
+PUBLISH_VERSION = 1
+INDEX_FILENAME = "index.json"
+# File of a synced copy with its generation and the digests of its files
+SYNC_STATE_FILENAME = "generation.json"
+
+
+def content_digest(value: Any) -> str:
+    """Return the digest of the content of a data file.
+
+    Args:
+        value (Any): The JSON content.
+
+    Returns:
+        str: The SHA-256 hex digest of the file, as written by CardanoPoolChecker.
+    """
+    return hashlib.sha256(json.dumps(value, indent=4).encode()).hexdigest()
+
+
+def _dumps(value: Any) -> str:
+    # The published files are only read by programs
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _items(value: Any) -> list[Any]:
+    items: list[Any] = [[key, item] for key, item in value.items()] if isinstance(value, dict) else value
+    return items
+
+
+def encode_delta(old: Any, new: Any) -> dict[str, Any] | None:
+    """Encode the changes from a JSON list or object to another one of the same type.
+
+    Args:
+        old (Any): The previous content.
+        new (Any): The new content.
+
+    Returns:
+        dict[str, Any] | None: The "type" ("list" or "dict") and the "ops", each one a
+            [start, end, items] replacing the old items from start to end, or None if
+            the contents are not lists or objects of the same type.
+    """
+    if not (isinstance(old, list) and isinstance(new, list)) and not (isinstance(old, dict) and isinstance(new, dict)):
+        return None
+    old_items, new_items = _items(old), _items(new)
+    matcher = SequenceMatcher(
+        None, [_dumps(item) for item in old_items], [_dumps(item) for item in new_items], autojunk=False
+    )
+    ops = [
+        [start, end, new_items[new_start:new_end]]
+        for tag, start, end, new_start, new_end in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+    return {"type": "dict" if isinstance(new, dict) else "list", "ops": ops}
+
+
+def apply_delta(old: Any, delta: dict[str, Any]) -> Any:
+    """Apply the changes encoded by encode_delta.
+
+    Args:
+        old (Any): The previous content.
+        delta (dict[str, Any]): The changes.
+
+    Returns:
+        Any: The new content.
+    """
+    items = list(_items(old))
+    # From the end, so the positions of the remaining ranges don't move
+    for start, end, new_items in reversed(delta["ops"]):
+        items[start:end] = new_items
+    return dict(items) if delta["type"] == "dict" else items
+
+
+class Publisher:
+    """Writes the generations of the data files into a publish directory.
+
+    Attributes:
+        directory (str): The publish directory.
+        full_interval (int): Generations between the full snapshots.
+        keep_snapshots (int): Number of snapshots kept, with the deltas after the oldest one.
+    """
+
+    def __init__(self, directory: str, full_interval: int = 10, keep_snapshots: int = 3) -> None:
+        """Initialize the publisher.
+
+        Args:
+            directory (str): The publish directory.
+            full_interval (int, optional): Generations between the full snapshots. Defaults to 10.
+            keep_snapshots (int, optional): Number of snapshots kept. Defaults to 3.
+        """
+        self.directory = directory
+        self.full_interval = max(1, full_interval)
+        self.keep_snapshots = max(1, keep_snapshots)
+
+    def _read(self, path: str) -> Any:
+        with open(os.path.join(self.directory, path)) as file:
+            data = json.load(file)
+            cpc_telemetry.count("bytes_read", file.tell())
+        return data
+
+    def _write(self, path: str, value: Any) -> int:
+        text = _dumps(value)
+        write_textfile(os.path.join(self.directory, path), text)
+        cpc_telemetry.count("bytes_written", len(text))
+        return len(text.encode())
+
+    @property
+    def index(self) -> dict[str, Any]:
+        """Return the index of the publish directory.
+
+        Returns:
+            dict[str, Any]: The "generation", the "files" digests, and the sizes of the
+                "snapshots" and "deltas" by generation, generation 0 if nothing was published.
+        """
+        try:
+            index = self._read(INDEX_FILENAME)
+        except FileNotFoundError:
+            index = None
+        if not isinstance(index, dict) or index.get("version") != PUBLISH_VERSION:
+            return {"version": PUBLISH_VERSION, "generation": 0, "files": {}, "snapshots": {}, "deltas": {}}
+        return index
+
+    def files(self) -> dict[str, Any]:
+        """Return the files of the last generation, rebuilt from its last snapshot and deltas.
+
+        Returns:
+            dict[str, Any]: The content of every file by name.
+        """
+        return sync_files(self.index, self._read, None, {})
+
+    def publish(self, files: dict[str, Any]) -> int | None:
+        """Publish the files as a new generation if they changed since the last one.
+
+        The delta from the last generation is always written, and a snapshot every
+        full_interval generations. The index is replaced last, so readers never see
+        a generation whose files are not written yet.
+
+        Args:
+            files (dict[str, Any]): The content of every file by name.
+
+        Returns:
+            int | None: The new generation, None if nothing changed.
+        """
+        index = self.index
+        digests = {name: content_digest(value) for name, value in files.items()}
+        if index["generation"] and digests == index["files"]:
+            return None
+        generation: int = index["generation"] + 1
+        if index["generation"]:
+            previous = self.files()
+            delta: dict[str, Any] = {"generation": generation, "files": {}, "removed": []}
+            for name, value in files.items():
+                if name in previous and digests[name] == index["files"].get(name):
+                    continue
+                encoded = encode_delta(previous[name], value) if name in previous else None
+                if encoded is not None and len(_dumps(encoded)) < len(_dumps(value)):
+                    delta["files"][name] = {"digest": digests[name], **encoded}
+                else:
+                    delta["files"][name] = {"digest": digests[name], "content": value}
+            delta["removed"] = sorted(set(previous) - set(files))
+            index["deltas"][str(generation)] = self._write(f"deltas/{generation}.json", delta)
+        last_snapshot = max(map(int, index["snapshots"]), default=0)
+        if not last_snapshot or generation - last_snapshot >= self.full_interval:
+            snapshot = {"generation": generation, "files": files}
+            index["snapshots"][str(generation)] = self._write(f"snapshots/{generation}.json", snapshot)
+        # Keep the last snapshots and the deltas after the oldest one
+        snapshots = sorted(map(int, index["snapshots"]))
+        removed = [f"snapshots/{number}.json" for number in snapshots[: -self.keep_snapshots]]
+        oldest = snapshots[-self.keep_snapshots :][0]
+        removed += [f"deltas/{number}.json" for number in map(int, index["deltas"]) if number <= oldest]
+        index["snapshots"] = {str(number): index["snapshots"][str(number)] for number in snapshots if number >= oldest}
+        index["deltas"] = {number: size for number, size in index["deltas"].items() if int(number) > oldest}
+        index["generation"] = generation
+        index["files"] = digests
+        self._write(INDEX_FILENAME, index)
+        for path in removed:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(os.path.join(self.directory, path))
+        return generation
+
+
+def _deltas_size(index: dict[str, Any], start: int) -> int | None:
+    # Size of the deltas from a generation to the last one, None if some of them is missing
+    total = 0
+    for number in range(start + 1, index["generation"] + 1):
+        size = index["deltas"].get(str(number))
+        if size is None:
+            return None
+        total += size
+    return total
+
+
+def _sync_start(index: dict[str, Any], generation: int | None) -> tuple[int, bool]:
+    # The generation to rebuild the last one from with the fewest downloaded bytes, either
+    # the generation of the files available or a snapshot, and if it's a snapshot
+    last = index["generation"]
+    # The files available are preferred to a snapshot needing the same bytes
+    plans: list[tuple[int, bool, int]] = []
+    if generation is not None and generation <= last and (size := _deltas_size(index, generation)) is not None:
+        plans.append((size, False, generation))
+    for number, snapshot_size in index["snapshots"].items():
+        if int(number) <= last and (size := _deltas_size(index, int(number))) is not None:
+            plans.append((snapshot_size + size, True, int(number)))
+    if not plans:
+        msg = f"Generation {last} can't be rebuilt from the published snapshots and deltas."
+        raise ValueError(msg)
+    _, snapshot, start = min(plans)
+    return start, snapshot
+
+
+def sync_files(
+    index: dict[str, Any],
+    fetch: Any,
+    generation: int | None,
+    files: dict[str, Any],
+) -> dict[str, Any]:
+    """Rebuild the files of the last generation of an index with the fewest downloaded bytes.
+
+    Args:
+        index (dict[str, Any]): The index of the publish directory.
+        fetch (Any): Function returning the JSON content of a path of the publish directory.
+        generation (int | None): Generation of the files already available, None if there are none.
+        files (dict[str, Any]): The files already available.
+
+    Returns:
+        dict[str, Any]: The content of every file of the last generation.
+
+    Raises:
+        ValueError: If the last generation can't be rebuilt or the digests don't match.
+    """
+    last = index["generation"]
+    start, snapshot = _sync_start(index, generation)
+    files = fetch(f"snapshots/{start}.json")["files"] if snapshot else dict(files)
+    for number in range(start + 1, last + 1):
+        delta = fetch(f"deltas/{number}.json")
+        for name, change in delta["files"].items():
+            files[name] = change["content"] if "content" in change else apply_delta(files[name], change)
+        for name in delta["removed"]:
+            files.pop(name, None)
+    if set(files) != set(index["files"]) or any(
+        content_digest(value) != index["files"][name] for name, value in files.items()
+    ):
+        msg = f"The rebuilt files of generation {last} don't match the published digests."
+        raise ValueError(msg)
+    return files
+
+
+def _synced_files(directory: str, state: dict[str, Any]) -> dict[str, Any]:
+    # The files of a local copy still having the digests of the generation they were synced to
+    files: dict[str, Any] = {}
+    for name, digest in state["files"].items():
+        try:
+            with open(os.path.join(directory, name)) as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            continue
+        if content_digest(content) == digest:
+            files[name] = content
+    return files
+
+
+def sync(source: str, directory: str) -> int:
+    """Update a copy of the published files to the last generation.
+
+    The local files are only patched when they all still have the digests of
+    the generation they were synced to, otherwise a snapshot is downloaded.
+    Only the files that changed are written.
+
+    Args:
+        source (str): URL or path of the publish directory.
+        directory (str): Directory of the local copy.
+
+    Returns:
+        int: The generation of the local copy.
+
+    Raises:
+        OSError: If a file can't be downloaded.
+        ValueError: If the last generation can't be rebuilt or the digests don't match.
+    """
+    pool_manager = urllib3.PoolManager()
+
+    def fetch(path: str) -> Any:
+        if source.startswith(("http://", "https://")):
+            cpc_telemetry.count("http_requests")
+            response = pool_manager.request("GET", source.rstrip("/") + "/" + path)
+            if response.status != 200:  # noqa: PLR2004
+                msg = f"Error downloading {path}: HTTP {response.status}."
+                raise OSError(msg)
+            cpc_telemetry.count("bytes_read", len(response.data))
+            return json.loads(response.data)
+        with open(os.path.join(source, path)) as file:
+            data = json.load(file)
+            cpc_telemetry.count("bytes_read", file.tell())
+        return data
+
+    index = fetch(INDEX_FILENAME)
+    try:
+        with open(os.path.join(directory, SYNC_STATE_FILENAME)) as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        state = {"generation": None, "files": {}}
+    files = _synced_files(directory, state)
+    valid = set(files)
+    if valid == set(state["files"]):
+        files = sync_files(index, fetch, state["generation"], files)
+    else:
+        # Modified copy, it can't be patched
+        files = sync_files(index, fetch, None, {})
+    for name, value in files.items():
+        if name not in valid or state["files"][name] != index["files"][name]:
+            write_textfile(os.path.join(directory, name), json.dumps(value, indent=4))
+    for name in set(state["files"]) - set(files):
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(os.path.join(directory, name))
+    generation: int = index["generation"]
+    write_textfile(
+        os.path.join(directory, SYNC_STATE_FILENAME),
+        json.dumps({"generation": generation, "files": index["files"]}),
+    )
+    return generation
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Sync a local copy of the published files from the command line.
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments, None to use sys.argv. Defaults to None.
+    """
+    parser = argparse.ArgumentParser(description="Sync a local copy of the published Cardano Pool Checker files.")
+    parser.add_argument("source", help="URL or path of the publish directory")
+    parser.add_argument("directory", help="directory of the local copy")
+    args = parser.parse_args(argv)
+    print(f"Synced to generation {sync(args.source, args.directory)}.")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
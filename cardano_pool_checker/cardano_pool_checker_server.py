@@ -0,0 +1,417 @@
+"""Cardano Pool Checker read-only HTTP query server.
+
+Loads the register, the sharing maps and the classification once and
+answers lookups from memory:
+
+    GET  /pools/<pool_id>               register entry and explanation of a pool
+    GET  /pools?ids=<pool_id>,...       the same for several pools
+    POST /pools                         the same for the pool ids of a JSON body {"ids": [...]}
+    GET  /resources?value=<resource>    pools sharing a resource (hostname, IP, owner...) by map
+    GET  /rules/<matching_file>/<pool_id>  whether a pool matches a rule
+    GET  /status                        time and files of the loaded data
+
+Responses carry an ETag and are gzip compressed when the client accepts it.
+The data files are watched and, when an update publishes new ones, the
+indexes are rebuilt in the background and swapped at once, so every request
+is answered from a consistent generation.
+
+Example:
+    python -m cardano_pool_checker.cardano_pool_checker_server --port 8054
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import cardano_pool_checker.cardano_pool_checker_class as cpc_class
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+# Encoded responses kept per generation of the data
+CACHE_SIZE = 10000
+# Largest request body read, enough for the ids of every registered pool
+MAX_BODY_SIZE = 1024 * 1024
+
+
+class QueryState:
+    """One generation of the data loaded by the query server.
+
+    Attributes:
+        checker (CardanoPoolChecker): The checker holding the loaded register and pool index.
+        register (dict[str, dict[str, Any]]): The register entries by pool id.
+        resources (dict[str, list[str]]): The names of the sharing maps of every resource.
+        signature (tuple): Modification times of the files the data was loaded from.
+        loaded (float): Time the data was loaded.
+    """
+
+    def __init__(self, settings: dict[str, Any] | None = None, files: list[str] | None = None) -> None:
+        """Load the data files.
+
+        Args:
+            settings (dict[str, Any] | None, optional): Settings of the checker, e.g.
+                {"CPC_DATA_DIR": "/tmp/pools/"}. Defaults to None.
+            files (list[str] | None, optional): The watched files, None to use watched_files.
+                Defaults to None.
+        """
+        # Files changed while loading are detected by the next check
+        self.signature = files_signature(files if files is not None else watched_files(settings))
+        self.checker = CardanoPoolChecker(settings=settings)
+        self.checker.load_pool_index()
+        self.register = {str(pool.get("pool_id_bech32")): pool for pool in self.checker.register}
+        self.resources: dict[str, list[str]] = {}
+        for name, sharing_map in self.checker._pool_index["maps"].items():  # noqa: SLF001
+            for resource in sharing_map:
+                self.resources.setdefault(resource, []).append(name)
+        self.matching_files = {str(rule["matching_file"]) for rule in self.checker.CPC_MSPO_RULES}
+        self.loaded = time.time()
+        self._cache: dict[str, tuple[int, bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, pool_id: str) -> dict[str, Any] | None:
+        """Return the register entry and the explanation of a pool.
+
+        Args:
+            pool_id (str): The bech32 pool id.
+
+        Returns:
+            dict[str, Any] | None: The "register" entry and the "explanation", None for unknown pools.
+        """
+        register = self.register.get(pool_id)
+        try:
+            explanation = self.checker.explain(pool_id)
+        except ValueError:
+            if register is None:
+                return None
+            explanation = None
+        return {"register": register, "explanation": explanation}
+
+    def resource(self, value: str) -> dict[str, list[str]]:
+        """Return the pools sharing a resource.
+
+        Args:
+            value (str): The resource, as it appears in the sharing maps.
+
+        Returns:
+            dict[str, list[str]]: The pools sharing it by sharing map name.
+        """
+        maps = self.checker._pool_index["maps"]  # noqa: SLF001
+        return {name: maps[name][value] for name in self.resources.get(value, [])}
+
+    def rule(self, matching_file: str, pool_id: str) -> dict[str, Any] | None:
+        """Return whether a pool matches a rule.
+
+        Args:
+            matching_file (str): The matching file of the rule.
+            pool_id (str): The bech32 pool id.
+
+        Returns:
+            dict[str, Any] | None: The membership, None if the rule doesn't exist.
+        """
+        if matching_file not in self.matching_files:
+            return None
+        rules = self.checker._pool_index["rules"].get(pool_id, [])  # noqa: SLF001
+        return {"pool_id_bech32": pool_id, "matching_file": matching_file, "matches": matching_file in rules}
+
+    def cached(self, key: str, build: Any) -> tuple[int, bytes, str]:
+        """Return the status, encoded body and ETag of a response, building it only once.
+
+        Args:
+            key (str): The request key, e.g. its path and query.
+            build (Any): Function returning the status and the data of the response.
+
+        Returns:
+            tuple[int, bytes, str]: The status, the JSON body and its ETag.
+        """
+        response = self._cache.get(key)
+        if response is None:
+            status, data = build()
+            body = json.dumps(data).encode()
+            response = (status, body, '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"')
+            with self._lock:
+                if len(self._cache) >= CACHE_SIZE:
+                    self._cache.clear()
+                self._cache[key] = response
+        return response
+
+
+def watched_files(settings: dict[str, Any] | None = None) -> list[str]:
+    """Return the paths of the files loaded by the query server.
+
+    Args:
+        settings (dict[str, Any] | None, optional): Settings of the checker. Defaults to None.
+
+    Returns:
+        list[str]: The pools list, the register, the sharing maps and the rules files.
+    """
+    checker = CardanoPoolChecker([], [], {}, settings=settings)
+    directory = os.path.join(os.path.dirname(cpc_class.__file__), checker.CPC_DATA_DIR)
+    filenames = [checker.CPC_POOLS_LIST_FILENAME, checker.CPC_POOLS_REGISTER_FILENAME]
+    for stage in checker.build_update_stages():
+        if stage.name.startswith("registered_"):
+            filenames += stage.outputs
+    filenames += [str(rule["matching_file"]) for rule in checker.CPC_MSPO_RULES]
+    return [os.path.join(directory, filename) for filename in filenames]
+
+
+def files_signature(paths: list[str]) -> tuple:
+    """Return the modification times and sizes of files.
+
+    Args:
+        paths (list[str]): The files.
+
+    Returns:
+        tuple: The (path, modification time, size) of every existing file.
+    """
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class QueryServer:
+    """Local HTTP server answering pool, resource and rule lookups from memory.
+
+    Attributes:
+        url (str): Base URL of the server.
+        state (QueryState): The data generation in use.
+
+    Example:
+        with QueryServer({"CPC_DATA_DIR": "/srv/pools/"}) as server:
+            urllib3.request("GET", server.url + "pools/pool1...")
+    """
+
+    def __init__(
+        self,
+        settings: dict[str, Any] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        reload_interval: float = 2.0,
+    ) -> None:
+        """Initialize the server loading the data, listening on a random free port by default.
+
+        Args:
+            settings (dict[str, Any] | None, optional): Settings of the checker, e.g. the
+                CPC_DATA_DIR to serve. Defaults to None.
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, 0 for a free one. Defaults to 0.
+            reload_interval (float, optional): Seconds between the checks for new data
+                files, 0 to disable the reloads. Defaults to 2.0.
+        """
+        self.settings = settings
+        self.reload_interval = reload_interval
+        self._files = watched_files(settings)
+        self.state = QueryState(settings, self._files)
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep the connections open between requests
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                server.handle(self)
+
+            def do_POST(self) -> None:  # noqa: N802
+                server.handle(self)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ARG002
+                return
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}/"
+
+    def reload(self) -> bool:
+        """Load the data again if the files changed and are not being written anymore.
+
+        Returns:
+            bool: Whether a new generation was loaded.
+        """
+        signature = files_signature(self._files)
+        if signature == self.state.signature:
+            return False
+        # Wait until an update in progress finishes writing the files
+        time.sleep(min(self.reload_interval, 1.0))
+        if files_signature(self._files) != signature:
+            return False
+        # Replacing the reference is atomic, the requests in progress keep the old generation
+        self.state = QueryState(self.settings, self._files)
+        return True
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.reload_interval):
+            self._try_reload()
+
+    def _try_reload(self) -> None:
+        try:
+            self.reload()
+        except Exception as exc:  # noqa: BLE001
+            # Keep serving the previous generation, the next check retries
+            print(f"Reload failed: {exc!r}")  # noqa: T201
+
+    @staticmethod
+    def route(  # noqa: PLR0911
+        state: QueryState, method: str, path: str, query: dict[str, list[str]], body: bytes
+    ) -> tuple[int, Any]:
+        """Answer a request.
+
+        Args:
+            state (QueryState): The data generation answering the request.
+            method (str): The HTTP method.
+            path (str): The URL path.
+            query (dict[str, list[str]]): The query string parameters.
+            body (bytes): The request body.
+
+        Returns:
+            tuple[int, Any]: The HTTP status and the data of the response.
+        """
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if method == "POST" and parts == ["pools"]:
+            try:
+                ids = json.loads(body or b"{}").get("ids", [])
+            except (ValueError, AttributeError):
+                ids = None
+            if not isinstance(ids, list):
+                return 400, {"message": 'Expected a JSON body like {"ids": ["pool1..."]}'}
+            return 200, {str(pool_id): state.pool(str(pool_id)) for pool_id in ids}
+        if method != "GET":
+            return 405, {"message": f"Unsupported method {method}"}
+        if parts == ["pools"] and "ids" in query:
+            ids = [pool_id for value in query["ids"] for pool_id in value.split(",") if pool_id]
+            return 200, {pool_id: state.pool(pool_id) for pool_id in ids}
+        if len(parts) == 2 and parts[0] == "pools":  # noqa: PLR2004
+            pool = state.pool(parts[1])
+            return (200, pool) if pool is not None else (404, {"message": f"Unknown pool {parts[1]}"})
+        if parts == ["resources"] and "value" in query:
+            return 200, state.resource(query["value"][0])
+        if len(parts) == 3 and parts[0] == "rules":  # noqa: PLR2004
+            rule = state.rule(parts[1], parts[2])
+            return (200, rule) if rule is not None else (404, {"message": f"Unknown rule {parts[1]}"})
+        if parts == ["status"]:
+            return 200, {
+                "loaded": state.loaded,
+                "files": {os.path.basename(path): mtime / 1e9 for path, mtime, _ in state.signature},
+            }
+        return 404, {"message": f"Unknown path {path}"}
+
+    def handle(self, request: BaseHTTPRequestHandler) -> None:
+        """Answer a request with its cached response when possible.
+
+        Args:
+            request (BaseHTTPRequestHandler): The request being handled.
+        """
+        state = self.state
+        parts = urlsplit(request.path)
+        try:
+            length = int(request.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        body = request.rfile.read(length) if 0 < length <= MAX_BODY_SIZE else b""
+        query = parse_qs(parts.query)
+        if not 0 <= length <= MAX_BODY_SIZE:
+            # The body is left unread, so the connection is closed after the response
+            status, data = 413, {"message": f"Expected a Content-Length of at most {MAX_BODY_SIZE} bytes"}
+            payload = json.dumps(data).encode()
+            etag = '"' + hashlib.blake2b(payload, digest_size=16).hexdigest() + '"'
+            request.close_connection = True
+        elif request.command == "POST":
+            # The batch queries are not cached, their bodies are too diverse
+            status, data = self.route(state, "POST", parts.path, query, body)
+            payload = json.dumps(data).encode()
+            etag = '"' + hashlib.blake2b(payload, digest_size=16).hexdigest() + '"'
+        else:
+            status, payload, etag = state.cached(
+                request.path, lambda: self.route(state, "GET", parts.path, query, body)
+            )
+        if status == 200 and etag in request.headers.get("If-None-Match", ""):  # noqa: PLR2004
+            request.send_response(304)
+            request.send_header("ETag", etag)
+            request.send_header("Content-Length", "0")
+            request.end_headers()
+            return
+        encoding = None
+        if len(payload) >= GZIP_MIN_SIZE and "gzip" in request.headers.get("Accept-Encoding", ""):
+            payload = gzip.compress(payload, compresslevel=5)
+            encoding = "gzip"
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("ETag", etag)
+        request.send_header("Vary", "Accept-Encoding")
+        if encoding is not None:
+            request.send_header("Content-Encoding", encoding)
+        if request.close_connection:
+            request.send_header("Connection", "close")
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def start(self) -> "QueryServer":
+        """Start serving and watching the data files in background threads.
+
+        Returns:
+            QueryServer: The server itself.
+        """
+        self._threads = [threading.Thread(target=self.httpd.serve_forever, daemon=True)]
+        if self.reload_interval:
+            self._threads.append(threading.Thread(target=self._watch, daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and watching, and close the socket."""
+        self._stop.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> "QueryServer":
+        """Start serving when entering the context."""
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        """Stop serving when leaving the context."""
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the query server from the command line until interrupted.
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments, None to use sys.argv. Defaults to None.
+    """
+    parser = argparse.ArgumentParser(description="Serve pool, resource and rule lookups over the data files.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8054, help="port to listen on")
+    parser.add_argument("--data-dir", help="directory of the data files instead of the configured one")
+    parser.add_argument("--reload-interval", type=float, default=2.0, help="seconds between checks for new data")
+    args = parser.parse_args(argv)
+
+    settings = {}
+    if args.data_dir is not None:
+        settings["CPC_DATA_DIR"] = os.path.join(os.path.abspath(args.data_dir), "")
+    server = QueryServer(settings, args.host, args.port, args.reload_interval).start()
+    print(f"Serving {len(server.state.register)} pools at {server.url}")  # noqa: T201
+    try:
+        server._stop.wait()  # noqa: SLF001
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
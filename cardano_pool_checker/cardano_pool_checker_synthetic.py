@@ -0,0 +1,252 @@
+"""Cardano Pool Checker module containing a synthetic Koios data generator.
+
+The generated data has the same shape as the Koios pool_list and pool_updates
+responses, so it can be used to test and benchmark the whole processing at
+sizes much larger than the test fixtures. The output only depends on the
+parameters, the same seed always produces the same data.
+
+Example:
+    dataset = generate_dataset(pools=10000, sharing_rate=0.05)
+    register = CardanoPoolChecker.build_register(dataset["updates"])
+"""
+import random
+from typing import Any
+
+BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+WORDS = (
+    "stake pool cardano reliable secure community low fee high performance bare metal relay node operator "
+    "decentralization mission charity green energy renewable small independent single family friendly "
+    "support network ada delegate rewards epoch uptime monitoring experienced team europe asia america "
+    "africa oceania datacenter cloud redundant backup block producer ticker transparent honest local"
+).split()
+# Resources that can be shared between the pools of a same operator
+SHARED_RESOURCES = ("owners", "reward_addr", "hostname", "ipv4", "homepage", "meta_url", "description")
+SECONDS_PER_EPOCH = 432000
+
+
+def _random_hex(rng: random.Random, length: int) -> str:
+    return f"{rng.getrandbits(length * 4):0{length}x}"
+
+
+def _random_bech32(rng: random.Random, length: int) -> str:
+    bits = rng.getrandbits(length * 5)
+    return "".join(BECH32_CHARSET[(bits >> (5 * index)) & 31] for index in range(length))
+
+
+def _ipv4(number: int) -> str:
+    # Addresses from the 10.0.0.0/8 block, unique for every number
+    return f"10.{(number >> 16) & 255}.{(number >> 8) & 255}.{number & 255}"
+
+
+def _ipv6(number: int) -> str:
+    return f"2001:0db8:0000:0000:0000:0000:{(number >> 16) & 0xFFFF:04x}:{number & 0xFFFF:04x}"
+
+
+def _relay(kind: str, number: int, port: int) -> dict[str, Any]:
+    relay: dict[str, Any] = {"dns": None, "srv": None, "ipv4": None, "ipv6": None, "port": port}
+    if kind == "ipv4":
+        relay["ipv4"] = _ipv4(number)
+    elif kind == "ipv6":
+        relay["ipv6"] = _ipv6(number)
+    elif kind == "dns":
+        relay["dns"] = f"relay{number}.synthetic.example"
+    else:
+        relay["srv"] = f"_cardano._tcp.pool{number}.synthetic.example"
+        relay["port"] = None
+    return relay
+
+
+def _pool(rng: random.Random, number: int) -> dict[str, Any]:
+    # Build the initial registration of a pool with resources used only by it
+    relays = [
+        _relay(rng.choices(("ipv4", "dns", "ipv6", "srv"), (60, 30, 5, 5))[0], number * 4 + index, 3000 + index)
+        for index in range(rng.randint(1, 3))
+    ]
+    stake_addr = "stake1u" + _random_bech32(rng, 52)
+    return {
+        "pool_id_bech32": "pool1" + _random_bech32(rng, 51),
+        "pool_id_hex": _random_hex(rng, 56),
+        "vrf_key_hash": _random_hex(rng, 64),
+        "margin": rng.choice((0, 0.01, 0.02, 0.05)),
+        "fixed_cost": str(rng.choice((170000000, 340000000, 345000000))),
+        "pledge": str(rng.randint(0, 1000) * 1000000000),
+        "reward_addr": stake_addr,
+        "owners": [stake_addr],
+        "relays": relays,
+        "meta_url": f"https://pool{number}.synthetic.example/poolmeta.json",
+        "meta_hash": _random_hex(rng, 64),
+        "meta_json": {
+            "name": f"Synthetic Pool {number}",
+            "ticker": f"S{number:04X}"[-5:],
+            "homepage": f"https://pool{number}.synthetic.example",
+            "description": " ".join(rng.choices(WORDS, k=12)),
+        },
+    }
+
+
+def _share(rng: random.Random, leader_number: int, pools: list[dict[str, Any]], resources: list[str]) -> None:
+    # Make the pools of an operator group use the resources of the first one
+    leader = pools[0]
+    if "hostname" in resources:
+        leader["relays"] = [*leader["relays"], _relay("dns", leader_number * 4 + 3, 3001)]
+    for position, pool in enumerate(pools[1:], 2):
+        for resource in resources:
+            if resource == "owners":
+                pool["owners"] = [*pool["owners"], leader["owners"][0]]
+            elif resource == "reward_addr":
+                pool["reward_addr"] = leader["reward_addr"]
+            elif resource == "hostname":
+                pool["relays"] = [*pool["relays"], leader["relays"][-1]]
+            elif resource == "ipv4":
+                shared = [relay for relay in leader["relays"] if relay["ipv4"] is not None]
+                pool["relays"] = [*pool["relays"], dict(shared[0]) if shared else dict(leader["relays"][0])]
+            elif resource == "homepage":
+                pool["meta_json"] = {**pool["meta_json"], "homepage": leader["meta_json"]["homepage"]}
+            elif resource == "meta_url":
+                pool["meta_url"] = leader["meta_url"]
+            else:
+                # Near duplicate name and description, only one word changed
+                words = leader["meta_json"]["description"].split()
+                words[rng.randrange(len(words))] = rng.choice(WORDS)
+                pool["meta_json"] = {
+                    **pool["meta_json"],
+                    "name": f"{leader['meta_json']['name']} {position}",
+                    "description": " ".join(words),
+                }
+
+
+def generate_dataset(  # noqa: PLR0913
+    pools: int = 1000,
+    sharing_rate: float = 0.05,
+    retired_rate: float = 0.1,
+    updates_per_pool: float = 2.0,
+    seed: int = 0,
+    start_time: int = 1596059091,
+    end_time: int = 1700000000,
+) -> dict[str, Any]:
+    """Generate a synthetic Koios-shaped dataset.
+
+    Args:
+        pools (int, optional): Number of pools. Defaults to 1000.
+        sharing_rate (float, optional): Fraction of the pools belonging to a multi pool
+            operator group sharing some resources. Defaults to 0.05.
+        retired_rate (float, optional): Fraction of the pools that end up retired. Defaults to 0.1.
+        updates_per_pool (float, optional): Average number of updates after the registration
+            of every pool. Defaults to 2.0.
+        seed (int, optional): Seed of the random generator. Defaults to 0.
+        start_time (int, optional): Block time of the first update. Defaults to 1596059091.
+        end_time (int, optional): Block time of the last possible update. Defaults to 1700000000.
+
+    Returns:
+        dict[str, Any]: Dictionary with the "pools" list (as in Koios pool_list), the
+            "updates" list (as in Koios pool_updates, sorted by block_time), the "dns"
+            records {hostname: {"A": [...], "AAAA": [...]}}, the "srv" records
+            {name: [targets]} and the operator "groups" as lists of pool ids.
+    """
+    rng = random.Random(seed)
+    pool_states = [_pool(rng, number) for number in range(pools)]
+    # Split the sharing pools in operator groups of 2 to 5 pools
+    groups: list[list[str]] = []
+    candidates = rng.sample(range(pools), round(pools * sharing_rate))
+    while len(candidates) > 1:
+        size = min(rng.randint(2, 5), len(candidates))
+        members = [pool_states[number] for number in candidates[:size]]
+        _share(rng, candidates[0], members, rng.sample(SHARED_RESOURCES, rng.randint(1, 2)))
+        candidates = candidates[size:]
+        groups.append([pool["pool_id_bech32"] for pool in members])
+    # Create the registration and the later updates of every pool
+    updates = []
+    retired = set(rng.sample(range(pools), round(pools * retired_rate)))
+    for number, state in enumerate(pool_states):
+        status = "retired" if number in retired else "registered"
+        block_time = rng.randint(start_time, end_time)
+        retiring_epoch = None
+        count = 1 + round(rng.expovariate(1 / updates_per_pool)) if updates_per_pool > 0 else 1
+        for index in range(count):
+            if index > 0:
+                block_time = rng.randint(block_time, end_time)
+                state["pledge"] = str(rng.randint(0, 1000) * 1000000000)
+                state["margin"] = rng.choice((0, 0.01, 0.02, 0.05))
+            if status == "retired":
+                retiring_epoch = 208 + (block_time - start_time) // SECONDS_PER_EPOCH + 1
+            updates.append(
+                {
+                    "tx_hash": _random_hex(rng, 64),
+                    "block_time": block_time,
+                    **{key: value for key, value in state.items() if key != "vrf_key_hash"},
+                    "active_epoch_no": 208 + (block_time - start_time) // SECONDS_PER_EPOCH + 2,
+                    "vrf_key_hash": state["vrf_key_hash"],
+                    "pool_status": status,
+                    "retiring_epoch": retiring_epoch,
+                }
+            )
+    updates.sort(key=lambda update: update["block_time"])
+    # Every hostname resolves to one or two addresses, some of them also used directly by other pools
+    dns: dict[str, dict[str, list[str]]] = {}
+    srv: dict[str, list[str]] = {}
+    for update in updates:
+        for relay in update["relays"]:
+            if relay["dns"] is not None and relay["dns"] not in dns:
+                number = int(relay["dns"][5:].split(".")[0])
+                dns[relay["dns"]] = {
+                    "A": [_ipv4(number + offset) for offset in range(rng.randint(1, 2))],
+                    "AAAA": [_ipv6(number)] if rng.random() < 0.1 else [],  # noqa: PLR2004
+                }
+            if relay["srv"] is not None and relay["srv"] not in srv:
+                number = int(relay["srv"].split(".")[2][4:])
+                srv[relay["srv"]] = [f"relay{number * 4}.synthetic.example"]
+                dns.setdefault(srv[relay["srv"]][0], {"A": [_ipv4(number * 4)], "AAAA": []})
+    return {
+        "pools": [
+            {"pool_id_bech32": state["pool_id_bech32"], "ticker": state["meta_json"]["ticker"]}
+            for number, state in enumerate(pool_states)
+            if number not in retired
+        ],
+        "updates": updates,
+        "dns": dns,
+        "srv": srv,
+        "groups": groups,
+    }
+
+
+def generate_translations(  # noqa: PLR0913
+    register: list[dict[str, Any]],
+    dns: dict[str, dict[str, list[str]]],
+    srv: dict[str, list[str]],
+    now: float = 1700000000.0,
+    history_days: int = 120,
+    seed: int = 0,
+) -> dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]:
+    """Generate a translations dictionary for the hostnames and SRV names of a register.
+
+    Args:
+        register (list[dict[str, Any]]): Register built from the generated updates.
+        dns (dict[str, dict[str, list[str]]]): The "dns" records of the generated dataset.
+        srv (dict[str, list[str]]): The "srv" records of the generated dataset.
+        now (float, optional): Timestamp of the last resolution. Defaults to 1700000000.0.
+        history_days (int, optional): Days in the past of the oldest translations. Defaults to 120.
+        seed (int, optional): Seed of the random generator. Defaults to 0.
+
+    Returns:
+        dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]: The translations
+            of the registered pools resolved now, and of the retired ones at some past time.
+    """
+    rng = random.Random(seed)
+    translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]] = {}
+
+    def add(name: str, hostname: str, pool: dict[str, Any], last: float) -> None:
+        first = last - rng.uniform(0, history_days * 86400)
+        for family, rdtype in (("4", "A"), ("6", "AAAA")):
+            for address in dns.get(hostname, {}).get(rdtype, []):
+                pools = translations.setdefault(name, {}).setdefault(family, {}).setdefault(address, {})
+                pools[pool["pool_id_bech32"]] = {"first": first, "last": last}
+
+    for pool in register:
+        last = now if pool["pool_status"] == "registered" else now - rng.uniform(0, history_days * 86400)
+        for relay in pool["relays"]:
+            if relay.get("dns") is not None:
+                add(relay["dns"], relay["dns"], pool, last)
+            if relay.get("srv") is not None:
+                for target in srv.get(relay["srv"], []):
+                    add(relay["srv"], target, pool, last)
+    return translations
@@ -0,0 +1,227 @@
+"""Cardano Pool Checker module containing the update pipeline telemetry."""
+import cProfile
+import os
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any, ParamSpec, TypeVar
+
+COUNTERS = (
+    "bytes_read",
+    "bytes_written",
+    "http_requests",
+    "koios_errors",
+    "koios_retries",
+    "dns_queries",
+    "dns_failures",
+)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# The counters of the stage the current thread works for, None outside any stage
+_local = threading.local()
+# The counters of the whole run, including the work done outside the stages, the
+# lock also protects the counters of the stages, shared by the threads they start
+_totals_lock = threading.Lock()
+_totals: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+
+
+def count(counter: str, amount: int = 1) -> None:
+    """Add an amount to a counter of the current stage and of the whole run.
+
+    Args:
+        counter (str): One of the names in COUNTERS.
+        amount (int, optional): The amount to add. Defaults to 1.
+    """
+    counters = getattr(_local, "counters", None)
+    with _totals_lock:
+        if counters is not None:
+            counters[counter] += amount
+        _totals[counter] += amount
+
+
+def propagate(func: Callable[P, T]) -> Callable[P, T]:
+    """Return a function running func with the counters of the current stage, to be run by other threads.
+
+    Example:
+        with ThreadPoolExecutor() as executor:
+            executor.submit(propagate(download), url)
+
+    Args:
+        func (Callable[P, T]): The function run by the other threads.
+
+    Returns:
+        Callable[P, T]: The wrapped function.
+    """
+    counters = getattr(_local, "counters", None)
+
+    def wrapped(*args: P.args, **kwargs: P.kwargs) -> T:
+        previous = getattr(_local, "counters", None)
+        _local.counters = counters
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.counters = previous
+
+    return wrapped
+
+
+def totals() -> dict[str, int]:
+    """Return a copy of the counters of the whole run.
+
+    Returns:
+        dict[str, int]: The value of every counter since the last reset.
+    """
+    with _totals_lock:
+        return dict(_totals)
+
+
+def reset_totals() -> None:
+    """Set all the counters of the whole run to zero."""
+    with _totals_lock:
+        for counter in COUNTERS:
+            _totals[counter] = 0
+
+
+class Telemetry:
+    """Collects the resources used by every stage of a pipeline run.
+
+    Each stage function is wrapped to measure its wall time, the CPU time of
+    its thread, the bytes read and written, the HTTP requests and the DNS
+    queries, and optionally the peak of traced memory and a cProfile dump.
+
+    Since the stages run concurrently, the peak memory of a stage is the peak
+    of the whole process while it was running, which includes the allocations
+    of the stages running at the same time. The CPU time does not include the
+    work done by the threads a stage starts (e.g. the DNS lookups), their
+    counters are only included when the functions they run are wrapped with
+    propagate.
+
+    Example:
+        telemetry = Telemetry()
+        pipeline = Pipeline([Stage("a", telemetry.wrap("a", func_a))])
+        telemetry.start()
+        status = pipeline.run()
+        report = telemetry.stop(status)
+    """
+
+    def __init__(self, trace_memory: bool = False, profile_dir: str | None = None) -> None:  # noqa: FBT001, FBT002
+        """Initialize the telemetry collector.
+
+        Args:
+            trace_memory (bool, optional): Measure the peak memory with tracemalloc,
+                which slows down the allocations heavy stages. Defaults to False.
+            profile_dir (str | None, optional): Directory where a cProfile dump is
+                written for every stage, None to disable profiling. Only one stage
+                can be profiled at once in some python versions, so the profiled
+                stages should run one at a time. Defaults to None.
+        """
+        self.trace_memory = trace_memory
+        self.profile_dir = profile_dir
+        self.stages: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._active: set[str] = set()
+        self._started_tracing = False
+        self._started = 0.0
+        self._start_time = ""
+
+    def _memory_checkpoint(self) -> None:
+        # Attribute the peak since the last checkpoint to every running stage and start a new window
+        if not tracemalloc.is_tracing():
+            return
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for name in self._active:
+            self.stages[name]["memory_peak"] = max(self.stages[name]["memory_peak"], peak)
+
+    def start(self) -> None:
+        """Start collecting, resetting the run counters and enabling tracemalloc if needed."""
+        reset_totals()
+        self.stages = {}
+        self._started = time.perf_counter()
+        self._start_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self, status: dict[str, str] | None = None) -> dict[str, Any]:
+        """Stop collecting and return the report of the run.
+
+        Args:
+            status (dict[str, str] | None, optional): Final status of every stage
+                as returned by Pipeline.run. Defaults to None.
+
+        Returns:
+            dict[str, Any]: The report with the run totals and the metrics of every stage.
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        if status is None:
+            status = {}
+        stages = {}
+        for name in status or self.stages:
+            stages[name] = {"status": status.get(name, "done"), **self.stages.get(name, {})}
+        return {
+            "started": self._start_time,
+            "wall_time": round(time.perf_counter() - self._started, 6),
+            "totals": totals(),
+            "stages": stages,
+        }
+
+    def wrap(self, name: str, func: Callable[[], Any]) -> Callable[[], Any]:
+        """Return a function running func while collecting its metrics under the stage name.
+
+        Args:
+            name (str): The stage name.
+            func (Callable[[], Any]): The stage function.
+
+        Returns:
+            Callable[[], Any]: The wrapped function.
+        """
+
+        def wrapped() -> Any:
+            metrics: dict[str, Any] = {
+                "started": datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                "wall_time": 0.0,
+                "cpu_time": 0.0,
+                "memory_peak": 0,
+                **dict.fromkeys(COUNTERS, 0),
+            }
+            with self._lock:
+                self.stages[name] = metrics
+                self._memory_checkpoint()
+                self._active.add(name)
+            profiler = None
+            if self.profile_dir is not None:
+                profiler = cProfile.Profile()
+                try:
+                    profiler.enable()
+                except ValueError as exc:
+                    # Only one profiler can be active at once in some python versions
+                    profiler = None
+                    current_time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                    print(f"[{current_time}] Stage {name}: not profiled ({exc}).")  # noqa: T201
+            _local.counters = dict.fromkeys(COUNTERS, 0)
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+            try:
+                return func()
+            finally:
+                metrics["cpu_time"] = round(time.thread_time() - cpu_start, 6)
+                metrics["wall_time"] = round(time.perf_counter() - wall_start, 6)
+                with _totals_lock:
+                    metrics.update(_local.counters)
+                _local.counters = None
+                if profiler is not None and self.profile_dir is not None:
+                    profiler.disable()
+                    os.makedirs(self.profile_dir, exist_ok=True)
+                    profiler.dump_stats(os.path.join(self.profile_dir, name + ".prof"))
+                with self._lock:
+                    self._memory_checkpoint()
+                    self._active.discard(name)
+
+        return wrapped
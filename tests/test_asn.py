@@ -0,0 +1,105 @@
+"""test module for the IP address to autonomous system database and the relays grouping."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import ipaddress
+import json
+import os
+import random
+import time
+
+from cardano_pool_checker.cardano_pool_checker_asn import AsnDatabase
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+
+DATABASE = """1.0.0.0\t1.0.0.255\t13335\tUS\tCLOUDFLARENET
+1.0.1.0\t1.0.3.255\t0\tNone\tNot routed
+5.9.0.0\t5.9.255.255\t24940\tDE\tHETZNER-AS
+16.0.0.0\t16.15.255.255\t16509\tUS\tAMAZON-02
+2a01:4f8::\t2a01:4f8:ffff:ffff:ffff:ffff:ffff:ffff\t24940\tDE\tHETZNER-AS
+2a05:d000::\t2a05:d07f:ffff:ffff:ffff:ffff:ffff:ffff\t16509\tUS\tAMAZON-02
+"""
+
+
+def test_asn_database(tmp_path: str):
+    """Tests the lookups of both CSV formats, the reuse of the index and the lookup time.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    path = os.path.join(tmp_path, "ip2asn.tsv")
+    with open(path, "w") as file:
+        file.write(DATABASE)
+    index_path = os.path.join(tmp_path, "asn_index.bin")
+    with AsnDatabase(path, index_path) as database:
+        assert database.lookup("1.0.0.1") == (13335, "CLOUDFLARENET")  # noqa: S101
+        assert database.lookup("5.9.255.255") == (24940, "HETZNER-AS")  # noqa: S101
+        assert database.lookup("2a01:4f8:1:2::3") == (24940, "HETZNER-AS")  # noqa: S101
+        assert database.lookup("2a05:d07f::1") == (16509, "AMAZON-02")  # noqa: S101
+        # Unrouted and missing ranges, and invalid addresses are unknown
+        for address in ("1.0.2.1", "0.0.0.1", "16.16.0.0", "2a05:d080::", "::1", "invalid"):
+            assert database.lookup(address) is None  # noqa: S101
+    # The index is compiled again only when the database changes
+    modified = os.stat(index_path).st_mtime_ns
+    AsnDatabase(path, index_path).close()
+    assert os.stat(index_path).st_mtime_ns == modified  # noqa: S101
+    path = os.path.join(tmp_path, "GeoLite2-ASN-Blocks.csv")
+    with open(path, "w") as file:
+        file.write(
+            'network,autonomous_system_number,autonomous_system_organization\n5.9.0.0/16,24940,"Hetzner, GmbH"\n'
+        )
+    with AsnDatabase(path, index_path) as database:
+        assert database.lookup("5.9.1.1") == (24940, "Hetzner, GmbH")  # noqa: S101
+        assert database.lookup("1.0.0.1") is None  # noqa: S101
+
+    # Tens of thousands of addresses are annotated in less than a second
+    rng = random.Random(7)
+    path = os.path.join(tmp_path, "large.tsv")
+    with open(path, "w") as file:
+        start = 1 << 24
+        for number in range(100000):
+            end = start + rng.randint(10, 5000)
+            file.write(f"{ipaddress.IPv4Address(start)}\t{ipaddress.IPv4Address(end)}\t{number + 1}\tUS\tAS{number}\n")
+            start = end + rng.randint(1, 100)
+    addresses = [str(ipaddress.IPv4Address(rng.randint(1 << 24, start))) for _ in range(30000)]
+    with AsnDatabase(path, index_path) as database:
+        begin = time.perf_counter()
+        found = [database.lookup(address) for address in addresses]
+        assert time.perf_counter() - begin < 1  # noqa: S101
+    assert sum(asn is not None for asn in found) > len(addresses) / 2  # noqa: S101
+
+
+def test_asn_concentration(tmp_path: str):
+    """Tests the grouping of the registered and resolved relay addresses by autonomous system.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    with open(os.path.join(tmp_path, "ip2asn.tsv"), "w") as file:
+        file.write(DATABASE)
+    now = time.time()
+    with open(os.path.join(tmp_path, "pools_dns_translations.json"), "w") as file:
+        json.dump({"relay.example.com": {"4": {"16.0.0.1": {"pool1c": {"first": now, "last": now}}}}}, file)
+    register = [
+        {"pool_id_bech32": "pool1a", "relays": [{"ipv4": "5.9.0.1"}, {"ipv6": "2a01:4f8::1"}]},
+        {"pool_id_bech32": "pool1b", "relays": [{"ipv4": "5.9.0.2"}, {"ipv4": "192.0.2.1"}]},
+        {"pool_id_bech32": "pool1c", "relays": [{"dns": "relay.example.com"}]},
+    ]
+    for pool in register:
+        pool["pool_status"] = "registered"
+    settings = {"CPC_DATA_DIR": str(tmp_path), "CPC_TELEMETRY_TRACE_MEMORY": False, "CPC_ASN_DATABASE": "ip2asn.tsv"}
+    checker = CardanoPoolChecker(settings=settings)
+    checker.set_asn_concentration(register)
+    concentration = checker.asn_concentration
+    assert concentration["pools"] == 3  # noqa: S101, PLR2004
+    assert concentration["unknown"] == 1  # noqa: S101
+    assert list(concentration["asns"]) == ["AS24940", "AS16509"]  # noqa: S101
+    assert concentration["asns"]["AS24940"] == {  # noqa: S101
+        "name": "HETZNER-AS",
+        "relays": 3,
+        "pools": ["pool1a", "pool1b"],
+        "share": 0.666667,
+    }
+    assert concentration["relays"]["16.0.0.1"] == 16509  # noqa: S101, PLR2004
+    assert concentration["relays"]["2a01:04f8:0000:0000:0000:0000:0000:0001"] == 24940  # noqa: S101, PLR2004
+    with open(os.path.join(tmp_path, "pools_asn.json")) as file:
+        assert json.load(file) == concentration  # noqa: S101
+    stages = {stage.name: stage for stage in checker.build_update_stages()}
+    assert "ip2asn.tsv" in stages["asn"].inputs  # noqa: S101
@@ -0,0 +1,214 @@
+"""test module for build_translations."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+
+
+@pytest.fixture()
+def register_data() -> list[dict[str, Any]]:
+    """Fixture that builds a register with relays using hostnames and SRV records.
+
+    Returns:
+        list[dict[str, Any]]: list with the register data.
+    """
+    return [
+        {
+            "pool_id_bech32": "pool1111111111111111111111111111111111111111111111111111",
+            "pool_status": "registered",
+            "relays": [
+                {"dns": "relay.one.com", "srv": None, "ipv4": None, "ipv6": None, "port": 6000},
+                {"dns": None, "srv": "_cardano._tcp.one.com", "ipv4": None, "ipv6": None, "port": None},
+            ],
+        },
+        {
+            "pool_id_bech32": "pool2222222222222222222222222222222222222222222222222222",
+            "pool_status": "registered",
+            "relays": [
+                {"dns": "relay.one.com", "srv": None, "ipv4": None, "ipv6": None, "port": 6000},
+                {"dns": None, "srv": "_cardano._tcp.two.com", "ipv4": None, "ipv6": None, "port": None},
+            ],
+        },
+        {
+            "pool_id_bech32": "pool3333333333333333333333333333333333333333333333333333",
+            "pool_status": "retired",
+            "relays": [{"dns": "relay.three.com", "srv": None, "ipv4": None, "ipv6": None, "port": 6000}],
+        },
+    ]
+
+
+@pytest.fixture()
+def lookups(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Fixture that replaces the DNS lookups with fake ones, recording the queried names.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+
+    Returns:
+        list[str]: list that will contain the queried names.
+    """
+    queried: list[str] = []
+    records = {
+        ("relay.one.com", "A"): (["1.1.1.1"], ["one.cdn.com"]),
+        ("relay.one.com", "AAAA"): (["2001:db8::1"], ["one.cdn.com"]),
+        ("relay.srv.com", "A"): (["2.2.2.2"], []),
+    }
+    srv_records = {
+        "_cardano._tcp.one.com": ["relay.one.com", "relay.srv.com"],
+        "_cardano._tcp.two.com": ["relay.srv.com"],
+    }
+
+    def resolve_records(
+        hostname: str, rdtype: str, timeout: float = 5.0  # noqa: ARG001
+    ) -> tuple[list[str], list[str]]:
+        queried.append(hostname + "/" + rdtype)
+        return records.get((hostname, rdtype), ([], []))
+
+    def resolve_srv_records(name: str, timeout: float = 5.0) -> list[str]:  # noqa: ARG001
+        queried.append(name)
+        return srv_records.get(name, [])
+
+    monkeypatch.setattr(CardanoPoolChecker, "_resolve_records", staticmethod(resolve_records))
+    monkeypatch.setattr(CardanoPoolChecker, "_resolve_srv_records", staticmethod(resolve_srv_records))
+    return queried
+
+
+def test_build_translations(register_data: list[dict[str, Any]], lookups: list[str]):
+    """Tests that function build_translations resolves hostnames and SRV records once.
+
+    Args:
+        register_data (list[dict[str, Any]]): The test register data.
+        lookups (list[str]): The names queried by the fake DNS lookups.
+    """
+    result = CardanoPoolChecker.build_translations(register_data)
+    # Every name is resolved only once even when shared, and retired pools are ignored
+    assert sorted(lookups) == sorted(  # noqa: S101
+        [
+            "relay.one.com/A",
+            "relay.one.com/AAAA",
+            "relay.srv.com/A",
+            "relay.srv.com/AAAA",
+            "_cardano._tcp.one.com",
+            "_cardano._tcp.two.com",
+        ]
+    )
+    assert set(result) == {"relay.one.com", "_cardano._tcp.one.com", "_cardano._tcp.two.com"}  # noqa: S101
+    assert set(result["relay.one.com"]["4"]["1.1.1.1"]) == {  # noqa: S101
+        "pool1111111111111111111111111111111111111111111111111111",
+        "pool2222222222222222222222222222222222222222222222222222",
+    }
+    assert "2001:0db8:0000:0000:0000:0000:0000:0001" in result["relay.one.com"]["6"]  # noqa: S101
+    # The CNAME chain is recorded for the hostnames
+    assert list(result["relay.one.com"]["cname"]) == ["one.cdn.com"]  # noqa: S101
+    # The SRV targets translations are stored under the SRV name
+    assert set(result["_cardano._tcp.one.com"]["4"]) == {"1.1.1.1", "2.2.2.2"}  # noqa: S101
+    assert list(result["_cardano._tcp.two.com"]["4"]["2.2.2.2"]) == [  # noqa: S101
+        "pool2222222222222222222222222222222222222222222222222222"
+    ]
+
+
+def test_build_translations_index(register_data: list[dict[str, Any]], lookups: list[str]):  # noqa: ARG001
+    """Tests that the reverse index is kept up to date by build_translations.
+
+    Args:
+        register_data (list[dict[str, Any]]): The test register data.
+        lookups (list[str]): The names queried by the fake DNS lookups.
+    """
+    index = CardanoPoolChecker.build_translations_index({})
+    result = CardanoPoolChecker.build_translations(register_data, {}, index=index)
+    # The incrementally updated index matches the one built from scratch
+    assert index == CardanoPoolChecker.build_translations_index(result)  # noqa: S101
+    assert set(index["4"]["2.2.2.2"]) == {  # noqa: S101
+        "pool1111111111111111111111111111111111111111111111111111",
+        "pool2222222222222222222222222222222222222222222222222222",
+    }
+
+
+def legacy_sharing_relay_ip(  # noqa: C901
+    register: list[dict[str, Any]],
+    translations: dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]],
+    family: str,
+    currently: bool,  # noqa: FBT001
+) -> dict[str, list[str]]:
+    """Reference implementation of the IP sharing detectors walking the nested translations.
+
+    Args:
+        register (list[dict[str, Any]]): Register of pools.
+        translations (dict[str, dict[str, dict[str, dict[str, dict[str, float]]]]]): Hostname translations.
+        family (str): The IP family, "4" or "6".
+        currently (bool): Whether to look at the current relays and recent translations only.
+
+    Returns:
+        dict[str, list[str]]: Dictionary containing the shared resources between pools.
+    """
+    unshorten = CardanoPoolChecker._unshorten_ipv6  # noqa: SLF001
+    addresses: dict[str, list[str]] = {}
+    for pool in register:
+        if pool.get("pool_status") != "registered":
+            continue
+        logs = [{"relays": pool.get("relays", [])}] if currently else pool.get("relays_log", [])
+        for log in logs:
+            for relay in log["relays"]:
+                if relay.get("ipv" + family) is not None:
+                    address = relay["ipv" + family]
+                    if family == "6":
+                        address = unshorten(address)
+                    if pool["pool_id_bech32"] not in addresses.setdefault(address, []):
+                        addresses[address].append(pool["pool_id_bech32"])
+    # the historical IPv4 walk never matched its isinstance(...) == dict check
+    if translations.get(family) is not None and (currently or family == "6"):
+        for hostname_data in translations.values():
+            for resolved_ip, resolved_ip_data in hostname_data.get(family, {}).items():
+                address = unshorten(resolved_ip) if family == "6" else resolved_ip
+                for mypool, pool_data in resolved_ip_data.items():
+                    last_datetime = datetime.fromtimestamp(pool_data["last"], tz=timezone.utc)
+                    recent = last_datetime > datetime.now(tz=timezone.utc) - timedelta(hours=4)
+                    if (recent or not currently) and mypool not in addresses.setdefault(address, []):
+                        addresses[address].append(mypool)
+    return {value: value_pools for value, value_pools in addresses.items() if len(value_pools) > 1}
+
+
+def test_sharing_relay_ip_index(register_data: list[dict[str, Any]], lookups: list[str]):  # noqa: ARG001
+    """Tests that the index based IP sharing detectors return the same output as the nested translations walk.
+
+    Args:
+        register_data (list[dict[str, Any]]): The test register data.
+        lookups (list[str]): The names queried by the fake DNS lookups.
+    """
+    register_data[0]["relays"].append({"dns": None, "srv": None, "ipv4": "1.1.1.1", "ipv6": "2001:db8::1"})
+    register_data[2]["relays"].append({"dns": None, "srv": None, "ipv4": "2.2.2.2", "ipv6": None})
+    register_data.append(
+        {
+            "pool_id_bech32": "pool4444444444444444444444444444444444444444444444444444",
+            "pool_status": "registered",
+            "relays": [{"dns": None, "srv": None, "ipv4": "1.1.1.1", "ipv6": "2001:db8:0::1"}],
+        }
+    )
+    for pool in register_data:
+        pool["relays_log"] = [{"relays": pool["relays"]}, {"relays": [{"ipv4": "3.3.3.3", "ipv6": "::3"}]}]
+    translations = CardanoPoolChecker.build_translations(register_data)
+    old = time.time() - 86400
+    # hostnames named like the IP families make the translations walk match its guard
+    guarded = dict(translations)
+    guarded["4"] = {
+        "4": {"2.2.2.2": {"pool5": {"first": old, "last": old}}, "3.3.3.3": {"pool6": {"first": old, "last": old}}}
+    }
+    guarded["6"] = {
+        "6": {"2001:db8::1": {"pool5": {"first": old, "last": old}}, "::3": {"pool6": {"first": old, "last": old}}}
+    }
+    for my_translations in (translations, guarded):
+        index = CardanoPoolChecker.build_translations_index(my_translations)
+        for family, currently, detector in (
+            ("4", True, CardanoPoolChecker.find_registered_currently_sharing_relay_ipv4),
+            ("6", True, CardanoPoolChecker.find_registered_currently_sharing_relay_ipv6),
+            ("4", False, CardanoPoolChecker.find_registered_sharing_relay_ipv4),
+            ("6", False, CardanoPoolChecker.find_registered_sharing_relay_ipv6),
+        ):
+            expected = legacy_sharing_relay_ip(register_data, my_translations, family, currently)
+            if family == "6" or currently:
+                assert detector(register_data, my_translations, index) == expected  # noqa: S101
+            assert detector(register_data, my_translations) == expected  # noqa: S101
@@ -0,0 +1,71 @@
+"""test module for the changes between updates."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import json
+import os
+
+import cardano_pool_checker.cardano_pool_checker_telemetry as cpc_telemetry
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset
+
+
+def test_build_changes():
+    """Tests the pools entering and leaving the lists and the resources shared, changed and unshared."""
+    previous = {
+        "lists": {"multi.json": ["pool1a", "pool1b"]},
+        "maps": {"owners": {"x": ["pool1a", "pool1b"], "y": ["pool1c", "pool1d"]}},
+    }
+    current = {
+        "lists": {"multi.json": ["pool1b", "pool1c"], "single.json": ["pool1e"]},
+        "maps": {"owners": {"x": ["pool1a", "pool1b", "pool1c"], "z": ["pool1d", "pool1e"]}},
+    }
+    changes = CardanoPoolChecker.build_changes(previous, current)
+    assert changes["lists"]["multi.json"] == {"entered": ["pool1c"], "left": ["pool1a"], "count": 2}  # noqa: S101
+    assert changes["lists"]["single.json"]["entered"] == ["pool1e"]  # noqa: S101
+    assert changes["maps"]["owners"] == {  # noqa: S101
+        "shared": {"z": ["pool1d", "pool1e"]},
+        "changed": {"x": ["pool1a", "pool1b", "pool1c"]},
+        "unshared": ["y"],
+        "count": 2,
+    }
+    assert changes["totals"] == {"entered": 2, "left": 1, "shared": 1, "changed": 1, "unshared": 1}  # noqa: S101
+    assert CardanoPoolChecker.build_changes(current, current)["totals"] == dict.fromkeys(  # noqa: S101
+        ("entered", "left", "shared", "changed", "unshared"), 0
+    )
+
+
+def test_update_changes(tmp_path: str):
+    """Tests that every update compares its files with the previous one.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    dataset = generate_dataset(100, sharing_rate=0.2, seed=11)
+    with open(os.path.join(tmp_path, "pools_list.json"), "w") as file:
+        json.dump(dataset["pools"], file)
+    with open(os.path.join(tmp_path, "pools_updates.json"), "w") as file:
+        json.dump(dataset["updates"], file)
+    settings = {"CPC_DATA_DIR": str(tmp_path), "CPC_TELEMETRY_TRACE_MEMORY": False}
+    checker = CardanoPoolChecker(settings=settings)
+    checker.update(skip=["pools", "updates", "translations"], allow_stale=True)
+    # The first update has nothing to compare with
+    lists = checker.changes["lists"]
+    assert lists["registered_single_stake_pool_operators.json"]["left"] == []  # noqa: S101
+    total = sum(len(changes["entered"]) for changes in lists.values())
+    assert total == len(dataset["pools"])  # noqa: S101
+    # The rules files and sharing maps built by the update are not read again
+    state_size = os.path.getsize(os.path.join(tmp_path, "changes_state.json"))
+    cpc_telemetry.reset_totals()
+    checker.set_changes()
+    assert cpc_telemetry.totals()["bytes_read"] == state_size  # noqa: S101
+
+    # A pool leaving the pools list leaves its rules file
+    pool_id = dataset["pools"][0]["pool_id_bech32"]
+    with open(os.path.join(tmp_path, "pools_list.json"), "w") as file:
+        json.dump(dataset["pools"][1:], file)
+    checker = CardanoPoolChecker(settings=settings)
+    checker.update(skip=["pools", "updates", "translations"], allow_stale=True)
+    with open(os.path.join(tmp_path, "changes.json")) as file:
+        changes = json.load(file)
+    assert changes == checker.changes  # noqa: S101
+    assert changes["totals"] == {"entered": 0, "left": 1, "shared": 0, "changed": 0, "unshared": 0}  # noqa: S101
+    assert [pool_id] in [entry["left"] for entry in changes["lists"].values()]  # noqa: S101
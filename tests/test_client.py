@@ -0,0 +1,87 @@
+"""test module for the client of the published files."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cardano_pool_checker.cardano_pool_checker_client import PoolsClient
+
+
+def test_client(tmp_path: str):
+    """Tests the conditional requests, the on disk cache, its eviction and the membership queries.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    files = {
+        "multi.json": json.dumps([{"pool_id_bech32": "pool1a", "ticker": "A"}]).encode(),
+        "owners.json": json.dumps({"stake1x": ["pool1b", "pool1c"]}).encode(),
+    }
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            name = self.path.strip("/")
+            etag = '"' + hashlib.sha256(files.get(name, b"")).hexdigest() + '"'
+            requests.append((name, self.headers.get("If-None-Match")))
+            if name not in files:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            elif self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+            else:
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(files[name])))
+                self.end_headers()
+                self.wfile.write(files[name])
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002, ARG002
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    cache_dir = os.path.join(tmp_path, "cache")
+    try:
+        client = PoolsClient(url, cache_dir, max_age=3600)
+        assert client.contains("multi.json", "pool1a")  # noqa: S101
+        assert not client.contains("multi.json", "pool1b")  # noqa: S101
+        assert client.contains("owners.json", "pool1c")  # noqa: S101
+        assert client.get("owners.json") == {"stake1x": ["pool1b", "pool1c"]}  # noqa: S101
+        assert len(requests) == 2  # noqa: S101, PLR2004
+        # Another instance uses the disk cache, and revalidates it once it's too old
+        assert PoolsClient(url, cache_dir, max_age=3600).contains("multi.json", "pool1a")  # noqa: S101
+        assert len(requests) == 2  # noqa: S101, PLR2004
+        client = PoolsClient(url, cache_dir, max_age=0)
+        first = client.fetch("multi.json")
+        assert requests[-1][1] is not None  # noqa: S101
+        # Unchanged files keep their decoded content, changed ones are downloaded again
+        assert client.fetch("multi.json") is first  # noqa: S101
+        files["multi.json"] = json.dumps([{"pool_id_bech32": "pool1b"}]).encode()
+        assert client.contains("multi.json", "pool1b")  # noqa: S101
+        with pytest.raises(OSError, match="HTTP 404"):
+            client.fetch("unknown.json")
+        # The least recently used files are evicted from the cache
+        client = PoolsClient(url, cache_dir, max_bytes=len(files["multi.json"]), max_age=0)
+        client.fetch("owners.json")
+        client.fetch("multi.json")
+        assert len([name for name in os.listdir(cache_dir) if name.endswith(".body")]) == 1  # noqa: S101
+    finally:
+        server.shutdown()
+        server.server_close()
+    # The cached copy is used while the server is down, without delaying the next revalidation
+    _, meta_path = client._paths("multi.json")  # noqa: SLF001
+    with open(meta_path) as file:
+        validated = json.load(file)["validated"]
+    assert client.contains("multi.json", "pool1b")  # noqa: S101
+    with open(meta_path) as file:
+        assert json.load(file)["validated"] == validated  # noqa: S101
+    assert client._files["multi.json"][0] == validated  # noqa: S101, SLF001
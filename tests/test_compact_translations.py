@@ -0,0 +1,171 @@
+"""test module for compact_translations."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+from typing import Any
+
+import pytest
+
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+
+DAY = 86400.0
+NOW = 1700000000.0
+
+
+@pytest.fixture()
+def register_data() -> list[dict[str, Any]]:
+    """Fixture that builds a register with a registered and a retired pool.
+
+    Returns:
+        list[dict[str, Any]]: list with the register data.
+    """
+    return [
+        {"pool_id_bech32": "pool1111111111111111111111111111111111111111111111111111", "pool_status": "registered"},
+        {"pool_id_bech32": "pool2222222222222222222222222222222222222222222222222222", "pool_status": "retired"},
+    ]
+
+
+@pytest.fixture()
+def translations_data() -> dict[str, Any]:
+    """Fixture that builds a translations dictionary with recent and old entries.
+
+    Returns:
+        dict[str, Any]: the translations dictionary.
+    """
+    return {
+        "relay.one.com": {
+            "4": {
+                "1.1.1.1": {
+                    "pool1111111111111111111111111111111111111111111111111111": {"first": NOW - 5 * DAY, "last": NOW},
+                },
+                "1.1.1.2": {
+                    "pool1111111111111111111111111111111111111111111111111111": {
+                        "first": NOW - 50 * DAY,
+                        "last": NOW - 40 * DAY,
+                    },
+                },
+            }
+        },
+        "relay.two.com": {
+            "4": {
+                "2.2.2.1": {
+                    "pool2222222222222222222222222222222222222222222222222222": {
+                        "first": NOW - 200 * DAY,
+                        "last": NOW - 100 * DAY,
+                    },
+                },
+                "2.2.2.2": {
+                    "pool2222222222222222222222222222222222222222222222222222": {
+                        "first": NOW - 60 * DAY,
+                        "last": NOW - 45 * DAY,
+                    },
+                },
+            }
+        },
+    }
+
+
+@pytest.fixture()
+def archive_data() -> dict[str, Any]:
+    """Fixture that builds an archive with an older window of a hot translation and of a retired pool.
+
+    Returns:
+        dict[str, Any]: the archived translations dictionary.
+    """
+    return {
+        "relay.one.com": {
+            "4": {
+                "1.1.1.2": {
+                    "pool1111111111111111111111111111111111111111111111111111": {
+                        "first": NOW - 300 * DAY,
+                        "last": NOW - 250 * DAY,
+                    },
+                },
+            }
+        },
+        "relay.two.com": {
+            "4": {
+                "2.2.2.0": {
+                    "pool2222222222222222222222222222222222222222222222222222": {
+                        "first": NOW - 400 * DAY,
+                        "last": NOW - 300 * DAY,
+                    },
+                },
+            }
+        },
+    }
+
+
+def test_compact_translations(
+    register_data: list[dict[str, Any]], translations_data: dict[str, Any], archive_data: dict[str, Any]
+):
+    """Tests that function compact_translations archives, merges and drops the expected entries.
+
+    Args:
+        register_data (list[dict[str, Any]]): The test register data.
+        translations_data (dict[str, Any]): The test translations.
+        archive_data (dict[str, Any]): The test archived translations.
+    """
+    hot, cold = CardanoPoolChecker.compact_translations(
+        translations_data, archive_data, register_data, retention_days=90, archive_days=30, now=NOW
+    )
+    # Only the recent translation stays in the translations
+    assert hot == {  # noqa: S101
+        "relay.one.com": {
+            "4": {
+                "1.1.1.1": {
+                    "pool1111111111111111111111111111111111111111111111111111": {"first": NOW - 5 * DAY, "last": NOW},
+                }
+            }
+        }
+    }
+    # The cold window is merged with the archived one, and the retired pool
+    # is only kept while it's inside the retention period, also in the archive
+    assert cold == {  # noqa: S101
+        "relay.one.com": {
+            "4": {
+                "1.1.1.2": {
+                    "pool1111111111111111111111111111111111111111111111111111": {
+                        "first": NOW - 300 * DAY,
+                        "last": NOW - 40 * DAY,
+                    },
+                }
+            }
+        },
+        "relay.two.com": {
+            "4": {
+                "2.2.2.2": {
+                    "pool2222222222222222222222222222222222222222222222222222": {
+                        "first": NOW - 60 * DAY,
+                        "last": NOW - 45 * DAY,
+                    },
+                }
+            }
+        },
+    }
+    # Merging both returns all the known translations
+    merged = CardanoPoolChecker.merge_translations(hot, cold)
+    assert set(merged["relay.one.com"]["4"]) == {"1.1.1.1", "1.1.1.2"}  # noqa: S101
+
+
+def test_compact_translations_empty_register(
+    register_data: list[dict[str, Any]], translations_data: dict[str, Any], archive_data: dict[str, Any]
+):
+    """Tests that function compact_translations skips the retention without a register.
+
+    Args:
+        register_data (list[dict[str, Any]]): The test register data.
+        translations_data (dict[str, Any]): The test translations.
+        archive_data (dict[str, Any]): The test archived translations.
+    """
+    # The retired pool is dropped when the register is known
+    hot, cold = CardanoPoolChecker.compact_translations(
+        translations_data, archive_data, register_data, retention_days=0, archive_days=365, now=NOW
+    )
+    assert set(hot) == {"relay.one.com"}  # noqa: S101
+    assert set(cold) == {"relay.one.com"}  # noqa: S101
+    # An empty register doesn't mean that every pool retired, nothing is moved or dropped
+    for register in ([], None):
+        hot, cold = CardanoPoolChecker.compact_translations(
+            translations_data, archive_data, register, retention_days=0, archive_days=365, now=NOW
+        )
+        assert hot == translations_data  # noqa: S101
+        assert cold == archive_data  # noqa: S101
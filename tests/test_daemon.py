@@ -0,0 +1,124 @@
+"""test module for the daemon mode."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import os
+import threading
+import time
+
+import pytest
+
+import cardano_pool_checker.cardano_pool_checker_telemetry as cpc_telemetry
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_daemon import CardanoPoolCheckerDaemon
+from cardano_pool_checker.cardano_pool_checker_koios_server import KoiosServer
+from cardano_pool_checker.cardano_pool_checker_pipeline import PipelineError
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset
+
+
+def test_daemon_refresh(tmp_path: str, monkeypatch: pytest.MonkeyPatch):
+    """Tests that the daemon only runs the stages and writes the files affected by the changes.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+    """
+    dataset = generate_dataset(300, sharing_rate=0.2, seed=4)
+    monkeypatch.setattr(
+        CardanoPoolChecker,
+        "_resolve_records",
+        staticmethod(
+            lambda hostname, rdtype, timeout=5.0: (  # noqa: ARG005
+                dataset["dns"].get(hostname, {}).get(rdtype, []),
+                [],
+            )
+        ),
+    )
+    monkeypatch.setattr(
+        CardanoPoolChecker,
+        "_resolve_srv_records",
+        staticmethod(lambda name, timeout=5.0: dataset["srv"].get(name, [])),  # noqa: ARG005
+    )
+    half = len(dataset["updates"]) // 2
+    with KoiosServer(dataset["pools"], dataset["updates"][:half]) as server:
+        checker = CardanoPoolChecker([], [], {})
+        checker.CPC_DATA_DIR = str(tmp_path)
+        checker.CPC_KOIOS_URL = server.url
+        daemon = CardanoPoolCheckerDaemon(checker, poll_interval=0, dns_interval=3600)
+
+        def data_files() -> list[str]:
+            # The files of the data directory and its subdirectories, like the report shards
+            return [os.path.join(root, name) for root, _, names in os.walk(tmp_path) for name in names]
+
+        # The first cycle runs every stage
+        status = daemon.refresh(now=0)
+        stages = {stage.name for stage in checker.build_update_stages()}
+        assert set(status) == stages - {"pools", "updates"}  # noqa: S101
+        contents = {}
+        for name in data_files():
+            with open(name) as file:
+                contents[name] = file.read()
+        # Without changes nothing is run nor written
+        assert daemon.refresh(now=60) == {}  # noqa: S101
+        # New updates rebuild the register and the detectors, but not the translations
+        server.endpoints["pool_updates"] = dataset["updates"]
+        cpc_telemetry.reset_totals()
+        status = daemon.refresh(now=120)
+        assert "register" in status  # noqa: S101
+        assert "translations" not in status  # noqa: S101
+        assert len(checker.register) == 300  # noqa: S101, PLR2004
+        # Only the files whose content changed are written again
+        changed = 0
+        for name in data_files():
+            with open(name) as file:
+                content = file.read()
+            if content != contents.get(name):
+                changed += len(content)
+        assert cpc_telemetry.totals()["bytes_written"] == changed  # noqa: S101
+        # The DNS sweep only runs when its interval has elapsed
+        assert "translations" in daemon.refresh(now=3600)  # noqa: S101
+
+
+def test_daemon_abandoned_stage(tmp_path: str, monkeypatch: pytest.MonkeyPatch):
+    """Tests that the daemon doesn't start again a stage given up while its thread is still running.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+    """
+    dataset = generate_dataset(50, sharing_rate=0.2, seed=4)
+    # No relay hostname resolves
+    monkeypatch.setattr(CardanoPoolChecker, "_resolve_records", staticmethod(lambda *_: ([], [])))
+    monkeypatch.setattr(CardanoPoolChecker, "_resolve_srv_records", staticmethod(lambda *_: []))
+    with KoiosServer(dataset["pools"], dataset["updates"]) as server:
+        checker = CardanoPoolChecker([], [], {})
+        checker.CPC_DATA_DIR = str(tmp_path)
+        checker.CPC_KOIOS_URL = server.url
+        daemon = CardanoPoolCheckerDaemon(checker, poll_interval=0, dns_interval=60)
+        daemon.refresh(now=0)
+        # The DNS sweep hangs until released, exceeding its timeout
+        release = threading.Event()
+        calls: list[float] = []
+
+        def set_translations(self: CardanoPoolChecker) -> None:  # noqa: ARG001
+            calls.append(time.monotonic())
+            release.wait(10)
+
+        monkeypatch.setattr(CardanoPoolChecker, "set_translations", set_translations)
+        checker.CPC_STAGE_TIMEOUTS = {"translations": 0.1}
+        with pytest.raises(PipelineError):
+            daemon.refresh(now=60)
+        # While its thread runs, neither it nor the stages depending on it are started again
+        stages = {stage.name: stage for stage in checker.build_update_stages()}
+        dependents = {name for name, stage in stages.items() if "translations" in stage.deps}
+        server.endpoints["pools"] = dataset["pools"][:-1]
+        status = daemon.refresh(now=120)
+        assert "classified_pools" not in status  # noqa: S101
+        assert not {"translations", *dependents} & set(status)  # noqa: S101
+        assert len(calls) == 1  # noqa: S101
+        # Once it ends, the stage and its dependents run in the next cycle
+        release.set()
+        daemon._abandoned["translations"].join()  # noqa: SLF001
+        checker.CPC_STAGE_TIMEOUTS = {}
+        status = daemon.refresh(now=180)
+        assert status["translations"] == "done"  # noqa: S101
+        assert status["classified_pools"] == "done"  # noqa: S101
+        assert len(calls) == 2  # noqa: S101, PLR2004
@@ -0,0 +1,51 @@
+"""test module for the explanation of the pools classification."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import json
+import os
+
+import pytest
+
+from cardano_pool_checker.__main__ import main
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset
+
+
+def test_explain(tmp_path: str, capsys: pytest.CaptureFixture):
+    """Tests that the explanation lists the resources shared by a pool, its peers and its rules.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+        capsys (pytest.CaptureFixture): The pytest output capture fixture.
+    """
+    dataset = generate_dataset(100, sharing_rate=0.2, seed=8)
+    with open(os.path.join(tmp_path, "pools_list.json"), "w") as file:
+        json.dump(dataset["pools"], file)
+    with open(os.path.join(tmp_path, "pools_updates.json"), "w") as file:
+        json.dump(dataset["updates"], file)
+    settings = {"CPC_DATA_DIR": str(tmp_path), "CPC_TELEMETRY_TRACE_MEMORY": False}
+    CardanoPoolChecker(settings=settings).update(skip=["pools", "updates", "translations"], allow_stale=True)
+    with open(os.path.join(tmp_path, "registered_multi_stake_pool_operators.json")) as file:
+        multi = json.load(file)[0]
+    with open(os.path.join(tmp_path, "registered_sharing_owners.json")) as file:
+        owners = json.load(file)
+
+    explanation = CardanoPoolChecker(settings=settings).explain(multi["pool_id_bech32"])
+    assert explanation["ticker"] == multi["ticker"]  # noqa: S101
+    assert explanation["rules"][0]["matches"]  # noqa: S101
+    # The true keywords are the files given as reason of the classification
+    reasons = {reason.rsplit("/", 1)[-1] for reason in multi["reason"]}
+    files = CardanoPoolChecker(settings=settings).CPC_MSPO_RULES[0]["files"]
+    assert {files[keyword] for keyword in explanation["rules"][0]["keywords"]} == reasons  # noqa: S101
+    for resource in explanation["resources"]:
+        if resource["type"] == "owners" and resource["historical_peers"]:
+            peers = [pool_id for pool_id in owners[resource["resource"]] if pool_id != multi["pool_id_bech32"]]
+            assert resource["historical_peers"] == peers  # noqa: S101
+
+    main(["--data-dir", str(tmp_path), "explain", multi["pool_id_bech32"]])
+    output = capsys.readouterr().out
+    assert output.splitlines()[-1].startswith("    ")  # noqa: S101
+    assert f"matches {explanation['rules'][0]['matching_file']}" in output  # noqa: S101
+    main(["--data-dir", str(tmp_path), "explain", "--json", multi["pool_id_bech32"]])
+    assert json.loads(capsys.readouterr().out) == explanation  # noqa: S101
+    with pytest.raises(SystemExit, match="Unknown pool"):
+        main(["--data-dir", str(tmp_path), "explain", "pool1unknown"])
@@ -0,0 +1,116 @@
+"""test module for the crawl of the pools extended metadata."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+
+
+def test_extended_metadata(tmp_path: str):
+    """Tests the operator identifiers, the ETag revalidation, the per host limit and the time budget.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    files = {
+        "a.json": {"info": {"social": {"twitter_handle": "@SameOp"}, "company": {"name": "Op Ltd"}}},
+        "b.json": {"pool": {"contact": {"twitter": "sameop", "email": "b@example.com"}}},
+        "c.json": {"telegram_admin_handle": ["other"], "my_pool_ids": ["pool1c", "pool1d"]},
+        "d.json": {"my_pool_ids": ["pool1c", "pool1d"]},
+    }
+    for number in range(8):
+        files[f"e{number}.json"] = {"info": {"company": {"vat_id": f"vat{number}"}}}
+    requests = []
+    active = [0, 0]
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802
+            name = self.path.strip("/")
+            with lock:
+                requests.append((name, self.headers.get("If-None-Match")))
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.02)
+            body = json.dumps(files[name]).encode() if name in files else b""
+            etag = '"' + hashlib.sha256(body).hexdigest() + '"'
+            if name not in files:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+            elif self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+            else:
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if name in files and self.headers.get("If-None-Match") != etag:
+                self.wfile.write(body)
+            with lock:
+                active[0] -= 1
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002, ARG002
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    register = [
+        {"pool_id_bech32": "pool1" + name[0] + name[1:].removesuffix(".json"), "meta_json": {"extended": url + name}}
+        for name in files
+    ]
+    register.append({"pool_id_bech32": "pool1missing", "meta_json": {"extended": url + "missing.json"}})
+    for pool in register:
+        pool["pool_status"] = "registered"
+    settings = {
+        "CPC_DATA_DIR": str(tmp_path),
+        "CPC_TELEMETRY_TRACE_MEMORY": False,
+        "CPC_EXTENDED_METADATA_FETCH": True,
+        "CPC_EXTENDED_METADATA_MAX_WORKERS": 8,
+        "CPC_EXTENDED_METADATA_MAX_PER_HOST": 2,
+    }
+    try:
+        checker = CardanoPoolChecker(settings=settings)
+        checker.set_extended_metadata(register)
+        # The connections to the host never exceed its limit
+        assert len(requests) == len(register)  # noqa: S101
+        assert active[1] <= 2  # noqa: S101, PLR2004
+        checker.set_registered_currently_sharing_extended_operator(register)
+        assert checker.registered_currently_sharing_extended_operator == {  # noqa: S101
+            "pool_id:pool1c": ["pool1c", "pool1d"],
+            "pool_id:pool1d": ["pool1c", "pool1d"],
+            "twitter:sameop": ["pool1a", "pool1b"],
+        }
+        with open(os.path.join(tmp_path, "pools_extended_metadata_cache.json")) as file:
+            cache = json.load(file)
+        assert cache[url + "missing.json"]["status"] == "unreachable"  # noqa: S101
+        assert cache[url + "a.json"]["fields"] == ["company:op ltd", "twitter:sameop"]  # noqa: S101
+        # The cached responses are revalidated with their ETag
+        requests.clear()
+        files["a.json"] = {"info": {"social": {"twitter_handle": "changed"}}}
+        CardanoPoolChecker(settings=settings).set_extended_metadata(register)
+        assert all(etag is not None for name, etag in requests if name != "missing.json")  # noqa: S101
+        with open(os.path.join(tmp_path, "pools_extended_metadata_cache.json")) as file:
+            cache = json.load(file)
+        assert cache[url + "a.json"]["fields"] == ["twitter:changed"]  # noqa: S101
+        assert cache[url + "b.json"]["fields"] == ["email:b@example.com", "twitter:sameop"]  # noqa: S101
+        # Without time left no request is started and the cached results are kept
+        requests.clear()
+        checker = CardanoPoolChecker(settings={**settings, "CPC_EXTENDED_METADATA_BUDGET": 0})
+        checker.set_extended_metadata(register)
+        assert requests == []  # noqa: S101
+        with open(os.path.join(tmp_path, "pools_extended_metadata_cache.json")) as file:
+            assert json.load(file) == cache  # noqa: S101
+    finally:
+        server.shutdown()
+        server.server_close()
+    stages = {stage.name: stage for stage in CardanoPoolChecker(settings=settings).build_update_stages()}
+    assert "registered_currently_sharing_extended_operator" in stages["classified_pools"].deps  # noqa: S101
@@ -163,3 +163,43 @@ def test_find_registered_currently_sharing_reward_addr(register_data: list[dict[
     save_result(prefix, result)
     # test result
     assert result == expected  # noqa: S101
+
+
+def test_find_registered_currently_similar_meta_json(register_data: list[dict[str, Any]]):
+    """Tests that function find_registered_currently_similar_meta_json returns the expected result.
+
+    Args:
+        register_data (list[dict[str, Any]]): The test register data.
+    """
+    # Define the prefix of the field to test and load expected results
+    prefix = "registered_currently_similar_meta_json"
+    expected = load_expected(prefix)
+    # Give "Four" a near-duplicate of the current metadata of "Two", and list it first
+    # so the cluster has to be named after its lowest pool id, not its first pool
+    register_data[3]["meta_json"] = dict(
+        register_data[1]["meta_json"], ticker="TWO2", description="Pool Two grouped with Three for tests"
+    )
+    register_data.reverse()
+    # Run the function to test
+    result = CardanoPoolChecker.find_registered_currently_similar_meta_json(register_data)
+    # Save the output JSON to a file for further analysis
+    save_result(prefix, result)
+    # test result
+    assert result == expected  # noqa: S101
+
+
+def test_find_registered_currently_sharing_relay_endpoint(register_data: list[dict[str, Any]]):
+    """Tests that function find_registered_currently_sharing_relay_endpoint returns the expected result.
+
+    Args:
+        register_data (list[dict[str, Any]]): The test register data.
+    """
+    # Define the prefix of the field to test and load expected results
+    prefix = "registered_currently_sharing_relay_endpoint"
+    expected = load_expected(prefix)
+    # Run the function to test
+    result = CardanoPoolChecker.find_registered_currently_sharing_relay_endpoint(register_data)
+    # Save the output JSON to a file for further analysis
+    save_result(prefix, result)
+    # test result
+    assert result == expected  # noqa: S101
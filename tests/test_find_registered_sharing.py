@@ -163,3 +163,59 @@ def test_find_registered_sharing_reward_addr(register_data: list[dict[str, Any]]
     save_result(prefix, result)
     # test result
     assert result == expected  # noqa: S101
+
+
+def test_find_registered_similar_meta_json(register_data: list[dict[str, Any]]):
+    """Tests that function find_registered_similar_meta_json returns the expected result.
+
+    Args:
+        register_data (list[dict[str, Any]]): The test register data.
+    """
+    # Define the prefix of the field to test and load expected results
+    prefix = "registered_similar_meta_json"
+    expected = load_expected(prefix)
+    # Run the function to test, with a low threshold to group "Three" and "Three 2"
+    result = CardanoPoolChecker.find_registered_similar_meta_json(register_data, threshold=0.4)
+    # Save the output JSON to a file for further analysis
+    save_result(prefix, result)
+    # test result
+    assert result == expected  # noqa: S101
+
+
+def test_find_registered_sharing_relay_endpoint(register_data: list[dict[str, Any]]):
+    """Tests that function find_registered_sharing_relay_endpoint returns the expected result.
+
+    Args:
+        register_data (list[dict[str, Any]]): The test register data.
+    """
+    # Define the prefix of the field to test and load expected results
+    prefix = "registered_sharing_relay_endpoint"
+    expected = load_expected(prefix)
+    # Run the function to test
+    result = CardanoPoolChecker.find_registered_sharing_relay_endpoint(register_data)
+    # Save the output JSON to a file for further analysis
+    save_result(prefix, result)
+    # test result
+    assert result == expected  # noqa: S101
+
+
+def test_find_registered_similar_meta_json_same_name():
+    """Tests that two unrelated clusters whose first pools have the same name are not merged."""
+    first = "Alpha staking pool, low fees and reliable relays in Europe since the Shelley era."
+    second = "Omega operators running bare metal servers on three continents with full monitoring."
+    register = [
+        {
+            "pool_id_bech32": pool_id,
+            "pool_status": "registered",
+            "meta_json": {"name": "Stake Pool", "description": description},
+            "meta_json_log": [],
+        }
+        for pool_id, description in (
+            ("pool1a", first),
+            ("pool1b", first + " Join us"),
+            ("pool1c", second),
+            ("pool1d", second + " Join us"),
+        )
+    ]
+    result = CardanoPoolChecker.find_registered_currently_similar_meta_json(register, threshold=0.6)
+    assert result == {"pool1a": ["pool1a", "pool1b"], "pool1c": ["pool1c", "pool1d"]}  # noqa: S101
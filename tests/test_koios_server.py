@@ -0,0 +1,76 @@
+"""test module for the ingestion against the local Koios stand-in server."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import json
+
+import pytest
+import urllib3
+
+import cardano_pool_checker.cardano_pool_checker_class as cpc_class
+import cardano_pool_checker.cardano_pool_checker_telemetry as cpc_telemetry
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_koios_server import KoiosServer
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset
+
+
+@pytest.fixture(scope="module")
+def dataset() -> dict:
+    """Fixture that generates a synthetic dataset larger than a Koios page.
+
+    Returns:
+        dict: The synthetic dataset.
+    """
+    return generate_dataset(1200, seed=2)
+
+
+def test_build_updates(dataset: dict):
+    """Tests that build_pools and build_updates download all the pages from a configurable Koios URL.
+
+    Args:
+        dataset (dict): The synthetic dataset.
+    """
+    with KoiosServer(dataset["pools"], dataset["updates"]) as server:
+        assert CardanoPoolChecker.build_pools(server.url) == dataset["pools"]  # noqa: S101
+        assert CardanoPoolChecker.build_updates(0, server.url) == dataset["updates"]  # noqa: S101
+        since = dataset["updates"][2000]["block_time"]
+        expected = [update for update in dataset["updates"] if update["block_time"] > since]
+        assert CardanoPoolChecker.build_updates(since, server.url) == expected  # noqa: S101
+
+
+def test_koios_server_queries(dataset: dict):
+    """Tests the PostgREST style parameters and the error injection of the server.
+
+    Args:
+        dataset (dict): The synthetic dataset.
+    """
+    http = urllib3.PoolManager()
+    with KoiosServer(dataset["pools"], dataset["updates"]) as server:
+        response = http.request("GET", server.url + "pool_updates?order=block_time.desc&offset=1&limit=2")
+        block_times = [update["block_time"] for update in dataset["updates"]][::-1][1:3]
+        assert [update["block_time"] for update in json.loads(response.data)] == block_times  # noqa: S101
+        until = dataset["updates"][4]["block_time"]
+        response = http.request("GET", server.url + "pool_updates?block_time=lte." + str(until))
+        assert json.loads(response.data) == [  # noqa: S101
+            update for update in dataset["updates"] if update["block_time"] <= until
+        ]
+        response = http.request("GET", server.url + "pool_updates?block_time=like.1")
+        assert response.status == 400  # noqa: S101, PLR2004
+    with KoiosServer([], [], error_rate=1.0) as server:
+        assert http.request("GET", server.url + "pool_list").status == 503  # noqa: S101, PLR2004
+
+
+def test_download_retries(dataset: dict, monkeypatch: pytest.MonkeyPatch):
+    """Tests that the failed Koios requests are retried and counted.
+
+    Args:
+        dataset (dict): The synthetic dataset.
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(cpc_class, "KOIOS_RETRY_BACKOFF", 0.0)
+    cpc_telemetry.reset_totals()
+    with KoiosServer(dataset["pools"], dataset["updates"], error_rate=0.3, seed=1) as server:
+        assert CardanoPoolChecker.build_pools(server.url) == dataset["pools"]  # noqa: S101
+        totals = cpc_telemetry.totals()
+        assert totals["http_requests"] == server.requests  # noqa: S101
+        assert totals["koios_errors"] == totals["koios_retries"] > 0  # noqa: S101
+    with KoiosServer([], [], error_rate=1.0) as server, pytest.raises(SystemExit):
+        CardanoPoolChecker.build_pools(server.url)
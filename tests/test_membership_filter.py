@@ -0,0 +1,46 @@
+"""test module for the Bloom filters of the rules files."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import json
+import os
+
+import pytest
+
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_filter import BloomFilter
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset
+
+
+def test_bloom_filter():
+    """Tests that the filter finds every item and about the documented rate of the other ones."""
+    items = [f"pool1{number:050d}" for number in range(2000)]
+    bloom = BloomFilter.from_json(json.loads(json.dumps(BloomFilter.build(items, 0.01).to_json())))
+    assert all(item in bloom for item in items)  # noqa: S101
+    false_positives = sum(f"pool1other{number:045d}" in bloom for number in range(20000))
+    assert false_positives / 20000 < 0.02  # noqa: S101, PLR2004
+    assert 0.005 < bloom.false_positive_rate < 0.015  # noqa: S101, PLR2004
+    # About 9.6 bits by item for a 1% rate
+    assert bloom.bits // 8 < 2000 * 10 / 8  # noqa: S101
+    with pytest.raises(ValueError, match="Unsupported filter version"):
+        BloomFilter.from_json({**bloom.to_json(), "version": 0})
+
+
+def test_update_membership_filters(tmp_path: str):
+    """Tests that the update writes a filter of every rule matching file.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    dataset = generate_dataset(100, sharing_rate=0.2, seed=14)
+    with open(os.path.join(tmp_path, "pools_list.json"), "w") as file:
+        json.dump(dataset["pools"], file)
+    with open(os.path.join(tmp_path, "pools_updates.json"), "w") as file:
+        json.dump(dataset["updates"], file)
+    settings = {"CPC_DATA_DIR": str(tmp_path), "CPC_TELEMETRY_TRACE_MEMORY": False}
+    CardanoPoolChecker(settings=settings).update(skip=["pools", "updates", "translations"], allow_stale=True)
+    with open(os.path.join(tmp_path, "registered_multi_stake_pool_operators.json")) as file:
+        multi = json.load(file)
+    with open(os.path.join(tmp_path, "registered_multi_stake_pool_operators.bloom.json")) as file:
+        bloom = BloomFilter.from_json(json.load(file))
+    assert bloom.count == len(multi)  # noqa: S101
+    assert all(pool["pool_id_bech32"] in bloom for pool in multi)  # noqa: S101
+    assert bloom.false_positive_rate < 0.002  # noqa: S101, PLR2004
@@ -0,0 +1,87 @@
+"""test module for the check of the pools metadata against its hash."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+
+
+def test_metadata(tmp_path: str):
+    """Tests the unreachable and mismatched metadata lists and the cache of the checked metadata.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    files = {
+        "valid.json": b'{"name": "Valid", "ticker": "VAL"}',
+        "changed.json": b'{"name": "Changed", "ticker": "CHG"}',
+        "large.json": b'{"description": "' + b"x" * 1024 + b'"}',
+    }
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            name = self.path.strip("/")
+            requests.append(name)
+            body = files.get(name)
+            self.send_response(200 if body is not None else 404)
+            self.send_header("Content-Length", str(len(body or b"")))
+            self.end_headers()
+            self.wfile.write(body or b"")
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002, ARG002
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    def digest(body: bytes) -> str:
+        return hashlib.blake2b(body, digest_size=32).hexdigest()
+
+    register = [
+        {"pool_id_bech32": "pool1valid", "meta_url": url + "valid.json", "meta_hash": digest(files["valid.json"])},
+        {"pool_id_bech32": "pool1other", "meta_url": url + "valid.json", "meta_hash": digest(files["valid.json"])},
+        {"pool_id_bech32": "pool1changed", "meta_url": url + "changed.json", "meta_hash": digest(b"{}")},
+        {"pool_id_bech32": "pool1large", "meta_url": url + "large.json", "meta_hash": digest(files["large.json"])},
+        {"pool_id_bech32": "pool1missing", "meta_url": url + "missing.json", "meta_hash": digest(b"{}")},
+        {"pool_id_bech32": "pool1nourl", "meta_url": None, "meta_hash": None},
+    ]
+    for pool in register:
+        pool["pool_status"] = "registered"
+    settings = {"CPC_DATA_DIR": str(tmp_path), "CPC_TELEMETRY_TRACE_MEMORY": False, "CPC_METADATA_FETCH": True}
+    try:
+        checker = CardanoPoolChecker(settings=settings)
+        checker.set_verified_metadata(register)
+        # The metadata bigger than the maximum size can't be valid, it was downloaded fine though
+        assert checker.registered_currently_mismatched_meta_hash == {  # noqa: S101
+            url + "changed.json": ["pool1changed"],
+            url + "large.json": ["pool1large"],
+        }
+        assert checker.registered_currently_unreachable_meta_url == {  # noqa: S101
+            url + "missing.json": ["pool1missing"]
+        }
+        # Every url is downloaded once
+        assert sorted(requests) == ["changed.json", "large.json", "missing.json", "valid.json"]  # noqa: S101
+        with open(os.path.join(tmp_path, "registered_currently_unreachable_meta_url.json")) as file:
+            assert json.load(file) == checker.registered_currently_unreachable_meta_url  # noqa: S101
+        # The valid metadata is not checked again, the other one is checked again when it's too old
+        requests.clear()
+        CardanoPoolChecker(settings=settings).set_verified_metadata(register)
+        assert requests == []  # noqa: S101
+        checker = CardanoPoolChecker(settings={**settings, "CPC_METADATA_RECHECK_HOURS": 0})
+        checker.set_verified_metadata(register)
+        assert sorted(requests) == ["changed.json", "large.json", "missing.json"]  # noqa: S101
+    finally:
+        server.shutdown()
+        server.server_close()
+    # The metadata is a dependency of the classification only when it's enabled
+    stages = {stage.name: stage for stage in CardanoPoolChecker(settings=settings).build_update_stages()}
+    assert "metadata" in stages["classified_pools"].deps  # noqa: S101
+    settings["CPC_METADATA_FETCH"] = False
+    names = {stage.name for stage in CardanoPoolChecker(settings=settings).build_update_stages()}
+    assert "metadata" not in names  # noqa: S101
@@ -0,0 +1,63 @@
+"""test module for the Prometheus metrics exporter."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import json
+import os
+
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_metrics import build_metrics, read_last_success, write_textfile
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset
+
+
+def test_update_exports_metrics(tmp_path: str):
+    """Tests that the update writes the durations and record counts in the textfile.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    dataset = generate_dataset(100, sharing_rate=0.2, seed=6)
+    with open(os.path.join(tmp_path, "pools_list.json"), "w") as file:
+        json.dump(dataset["pools"], file)
+    with open(os.path.join(tmp_path, "pools_updates.json"), "w") as file:
+        json.dump(dataset["updates"], file)
+    checker = CardanoPoolChecker(
+        settings={
+            "CPC_DATA_DIR": str(tmp_path),
+            "CPC_TELEMETRY_TRACE_MEMORY": False,
+            "CPC_METRICS_TEXTFILE": "metrics/cpc.prom",
+        }
+    )
+    checker.update(skip=["pools", "updates", "translations"], allow_stale=True)
+    with open(os.path.join(tmp_path, "metrics", "cpc.prom")) as file:
+        lines = file.read().splitlines()
+    assert "cardano_pool_checker_run_success 1" in lines  # noqa: S101
+    assert f"cardano_pool_checker_pools {len(dataset['pools'])}" in lines  # noqa: S101
+    assert f"cardano_pool_checker_updates {len(dataset['updates'])}" in lines  # noqa: S101
+    assert "# TYPE cardano_pool_checker_stage_duration_seconds gauge" in lines  # noqa: S101
+    register_duration = 'cardano_pool_checker_stage_duration_seconds{stage="register"} '
+    assert any(line.startswith(register_duration) for line in lines)  # noqa: S101
+    with open(os.path.join(tmp_path, "registered_multi_stake_pool_operators.json")) as file:
+        multi = len(json.load(file))
+    assert (  # noqa: S101
+        f'cardano_pool_checker_rule_entries{{file="registered_multi_stake_pool_operators.json"}} {multi}' in lines
+    )
+    assert any(line.startswith("cardano_pool_checker_last_block_time_lag_seconds ") for line in lines)  # noqa: S101
+    # Only the metrics file is left in its directory
+    assert os.listdir(os.path.join(tmp_path, "metrics")) == ["cpc.prom"]  # noqa: S101
+
+
+def test_failed_run_keeps_last_success(tmp_path: str):
+    """Tests that a failed run keeps the time of the last successful one.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    path = os.path.join(tmp_path, "cpc.prom")
+    report = {"stages": {"pools": {"status": "done", "wall_time": 1.5, "cpu_time": 0.5}}, "totals": {}}
+    write_textfile(path, build_metrics(report, {}, now=1000.0))
+    report = {"stages": {"pools": {"status": "failed"}}, "totals": {"dns_queries": 4, "dns_failures": 1}}
+    text = build_metrics(report, {}, 900, read_last_success(path), now=2000.0)
+    lines = text.splitlines()
+    assert "cardano_pool_checker_run_success 0" in lines  # noqa: S101
+    assert "cardano_pool_checker_last_success_timestamp_seconds 1000.0" in lines  # noqa: S101
+    assert "cardano_pool_checker_dns_failure_ratio 0.25" in lines  # noqa: S101
+    assert "cardano_pool_checker_last_block_time_lag_seconds 1100.0" in lines  # noqa: S101
@@ -0,0 +1,144 @@
+"""test module for the update pipeline scheduler."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import threading
+import time
+
+import pytest
+
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_pipeline import Pipeline, PipelineError, Stage
+
+
+def test_pipeline_runs_independent_stages_concurrently():
+    """Tests that independent stages run at the same time and dependents wait for them."""
+    barrier = threading.Barrier(2, timeout=5)
+    order: list[str] = []
+
+    def branch(name: str):
+        def func() -> None:
+            # Both branches must reach the barrier, which only happens if they run concurrently
+            barrier.wait()
+            order.append(name)
+
+        return func
+
+    pipeline = Pipeline(
+        [
+            Stage("a", branch("a")),
+            Stage("b", branch("b")),
+            Stage("c", lambda: order.append("c"), ["a", "b"]),
+        ]
+    )
+    assert pipeline.run() == {"a": "done", "b": "done", "c": "done"}  # noqa: S101
+    assert order[-1] == "c"  # noqa: S101
+
+
+def test_pipeline_skips_only_dependents():
+    """Tests that a failed or timed out stage only skips the stages depending on it."""
+    ran: list[str] = []
+
+    def fail() -> None:
+        msg = "download error"
+        raise ValueError(msg)
+
+    pipeline = Pipeline(
+        [
+            Stage("fails", fail),
+            Stage("slow", lambda: time.sleep(1), timeout=0.05),
+            Stage("after_fail", lambda: ran.append("after_fail"), ["fails"]),
+            Stage("after_after_fail", lambda: ran.append("after_after_fail"), ["after_fail"]),
+            Stage("after_slow", lambda: ran.append("after_slow"), ["slow"]),
+            Stage("independent", lambda: ran.append("independent")),
+        ]
+    )
+    assert pipeline.run() == {  # noqa: S101
+        "fails": "failed",
+        "slow": "timeout",
+        "after_fail": "skipped",
+        "after_after_fail": "skipped",
+        "after_slow": "skipped",
+        "independent": "done",
+    }
+    assert ran == ["independent"]  # noqa: S101
+    with pytest.raises(PipelineError):
+        pipeline.raise_for_status()
+
+
+def test_pipeline_runs_after_optional_deps():
+    """Tests that a failed optional dependency doesn't skip the stage, which waits for it to finish."""
+    ran: list[str] = []
+
+    def fail() -> None:
+        time.sleep(0.05)
+        ran.append("fails")
+        msg = "download error"
+        raise ValueError(msg)
+
+    pipeline = Pipeline(
+        [
+            Stage("fails", fail),
+            Stage("after_fail", lambda: ran.append("after_fail"), ["fails"]),
+            Stage("slow", lambda: time.sleep(1), timeout=0.05),
+            Stage("gather", lambda: ran.append("gather"), ["after_fail", "slow"], optional_deps=["after_fail", "slow"]),
+        ]
+    )
+    assert pipeline.run() == {  # noqa: S101
+        "fails": "failed",
+        "after_fail": "skipped",
+        "slow": "timeout",
+        "gather": "done",
+    }
+    assert ran == ["fails", "gather"]  # noqa: S101
+    # The abandoned stage runs in a daemon thread, which doesn't keep the interpreter alive
+    assert all(thread.daemon for thread in threading.enumerate() if thread.name.startswith("cpc-stage"))  # noqa: S101
+
+
+def test_pipeline_writes_whole_lines(capsys: pytest.CaptureFixture[str]):
+    """Tests that the lines printed by concurrent stages don't interleave.
+
+    Args:
+        capsys (pytest.CaptureFixture[str]): The pytest capture fixture.
+    """
+
+    def branch(name: str):
+        def func() -> None:
+            for number in range(200):
+                print(name, number, "end")  # noqa: T201
+
+        return func
+
+    Pipeline([Stage(name, branch(name)) for name in "abcd"]).run()
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 800  # noqa: S101, PLR2004
+    assert all(line.split()[0] in "abcd" and line.endswith(" end") for line in lines)  # noqa: S101
+
+
+def test_pipeline_rejects_invalid_graphs():
+    """Tests that unknown dependencies and cycles are detected before running."""
+    with pytest.raises(ValueError, match="Unknown dependency"):
+        Pipeline([Stage("a", lambda: None, ["missing"])])
+    with pytest.raises(ValueError, match="cycle"):
+        Pipeline([Stage("a", lambda: None, ["b"]), Stage("b", lambda: None, ["a"])])
+
+
+def test_build_update_stages():
+    """Tests that the update stages form a valid graph where only the IP detectors need the translations."""
+    checker = CardanoPoolChecker([], [], {})
+    stages = {stage.name: stage for stage in checker.build_update_stages()}
+    Pipeline(stages.values())
+    assert stages["pools"].deps == ()  # noqa: S101
+    assert stages["registered_sharing_owners"].deps == ("register",)  # noqa: S101
+    assert stages["registered_sharing_relay_ipv4"].deps == ("compaction",)  # noqa: S101
+    assert set(stages["classified_pools"].deps) == set(stages) - {  # noqa: S101
+        "classified_pools",
+        "pool_report",
+        "membership_filters",
+        "changes",
+        "updates",
+        "register",
+        "translations",
+        "compaction",
+    }
+    # The classification still runs with the previous files of the detectors depending on a download
+    assert "registered_sharing_relay_ipv4" in stages["classified_pools"].optional_deps  # noqa: S101
+    assert "registered_sharing_owners" not in stages["classified_pools"].optional_deps  # noqa: S101
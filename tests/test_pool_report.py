@@ -0,0 +1,66 @@
+"""test module for the per pool report and its shards."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import json
+import os
+
+import pytest
+
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset
+
+
+def test_pool_report(tmp_path: str, monkeypatch: pytest.MonkeyPatch):
+    """Tests that the report gathers the explanation and cluster of every pool, and its shards split it.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+    """
+    dataset = generate_dataset(100, sharing_rate=0.2, seed=10)
+    with open(os.path.join(tmp_path, "pools_list.json"), "w") as file:
+        json.dump(dataset["pools"], file)
+    with open(os.path.join(tmp_path, "pools_updates.json"), "w") as file:
+        json.dump(dataset["updates"], file)
+    settings = {"CPC_DATA_DIR": str(tmp_path), "CPC_TELEMETRY_TRACE_MEMORY": False}
+    checker = CardanoPoolChecker(settings=settings)
+    checker.update(skip=["pools", "updates", "translations"], allow_stale=True)
+    with open(os.path.join(tmp_path, "pools_report.json")) as file:
+        report = json.load(file)
+    assert report == checker.pool_report  # noqa: S101
+    with open(os.path.join(tmp_path, "registered_multi_stake_pool_operators.json")) as file:
+        multi = json.load(file)
+    for pool in multi:
+        entry = report[pool["pool_id_bech32"]]
+        assert entry["resources"] == checker.explain(pool["pool_id_bech32"])["resources"]  # noqa: S101
+        assert "registered_multi_stake_pool_operators.json" in entry["rules"]  # noqa: S101
+        assert entry["cluster_size"] > 1  # noqa: S101
+        # Every peer belongs to the same cluster
+        for resource in entry["resources"]:
+            for peer in resource["current_peers"] + resource["historical_peers"]:
+                assert report[peer]["cluster"] == entry["cluster"]  # noqa: S101
+    clusters = [entry["cluster"] for entry in report.values()]
+    for pool_id, entry in report.items():
+        assert entry["cluster_size"] == clusters.count(entry["cluster"])  # noqa: S101
+        assert entry["cluster"] <= pool_id  # noqa: S101
+
+    # The shards hold every pool once, in the shard named after its prefix
+    shards = {}
+    for name in checker.pool_report_shards():
+        with open(os.path.join(tmp_path, name)) as file:
+            shard = json.load(file)
+        assert all(checker.pool_report_shard(pool_id) == name for pool_id in shard)  # noqa: S101
+        shards.update(shard)
+    assert len(checker.pool_report_shards()) == 32  # noqa: S101, PLR2004
+    assert shards == report  # noqa: S101
+
+    # The report is built from the attributes and only the changed shards are written again
+    os.remove(os.path.join(tmp_path, "registered_sharing_owners.json"))
+    pools = [dict(pool) for pool in dataset["pools"]]
+    pools[0]["ticker"] = "CHANGED"
+    pool_id = pools[0]["pool_id_bech32"]
+    checker._pools = pools  # noqa: SLF001
+    saved: list[str] = []
+    monkeypatch.setattr(checker, "_save_json", lambda filename, data: saved.append(filename))  # noqa: ARG005
+    checker.set_pool_report()
+    assert checker.pool_report == {**report, pool_id: {**report[pool_id], "ticker": "CHANGED"}}  # noqa: S101
+    assert saved == ["pools_report.json", checker.pool_report_shard(pool_id)]  # noqa: S101
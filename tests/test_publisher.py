@@ -0,0 +1,99 @@
+"""test module for the published generations and their sync."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import json
+import os
+
+import pytest
+
+import cardano_pool_checker.cardano_pool_checker_telemetry as cpc_telemetry
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_publisher import Publisher, apply_delta, encode_delta, sync
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset
+
+
+def test_delta_roundtrip():
+    """Tests that the deltas rebuild the new lists and objects with the same order."""
+    old = [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}]
+    new = [{"id": 0}, {"id": 1}, {"id": 3}, {"id": 4, "x": 1}, {"id": 5}]
+    assert apply_delta(old, encode_delta(old, new)) == new  # noqa: S101
+    old_map = {"a": [1], "b": [2], "c": [3]}
+    new_map = {"a": [1], "d": [4], "c": [3, 5]}
+    result = apply_delta(old_map, encode_delta(old_map, new_map))
+    assert list(result.items()) == list(new_map.items())  # noqa: S101
+    assert encode_delta(old, old)["ops"] == []  # noqa: S101
+    assert encode_delta(old, new_map) is None  # noqa: S101
+
+
+def test_publish_and_sync(tmp_path: str):
+    """Tests the snapshots, deltas and retention of the generations and the sync of a copy.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    published = os.path.join(tmp_path, "published")
+    publisher = Publisher(published, full_interval=3, keep_snapshots=2)
+    pools = generate_dataset(200, seed=12)["pools"]
+    generations = []
+    for number in range(8):
+        files = {"pools_list.json": pools[number:], "maps.json": {str(key): [key] for key in range(number)}}
+        generations.append(files)
+        assert publisher.publish(files) == number + 1  # noqa: S101
+    assert publisher.publish(generations[-1]) is None  # noqa: S101
+    index = publisher.index
+    assert sorted(map(int, index["snapshots"])) == [4, 7]  # noqa: S101
+    assert sorted(map(int, index["deltas"])) == [5, 6, 7, 8]  # noqa: S101
+    assert sorted(os.listdir(os.path.join(published, "snapshots"))) == ["4.json", "7.json"]  # noqa: S101
+    # A small change is published as a small delta
+    assert index["deltas"]["8"] < index["snapshots"]["7"] / 10  # noqa: S101
+    assert publisher.files() == generations[-1]  # noqa: S101
+
+    # A new copy is synced from a snapshot, an updated one from the deltas only
+    copy = os.path.join(tmp_path, "copy")
+    assert sync(published, copy) == 8  # noqa: S101, PLR2004
+    for name, value in generations[-1].items():
+        with open(os.path.join(copy, name)) as file:
+            assert file.read() == json.dumps(value, indent=4)  # noqa: S101
+    files = {"pools_list.json": pools[10:], "maps.json": {}}
+    publisher.publish(files)
+    cpc_telemetry.reset_totals()
+    assert sync(published, copy) == 9  # noqa: S101, PLR2004
+    assert cpc_telemetry.totals()["bytes_read"] < publisher.index["snapshots"]["7"] / 10  # noqa: S101
+    with open(os.path.join(copy, "maps.json")) as file:
+        assert json.load(file) == {}  # noqa: S101
+    # A modified copy is rebuilt from a snapshot, which has to be available
+    with open(os.path.join(copy, "maps.json"), "w") as file:
+        file.write('{"x": []}')
+    assert sync(published, copy) == 9  # noqa: S101, PLR2004
+    with open(os.path.join(copy, "maps.json")) as file:
+        assert json.load(file) == {}  # noqa: S101
+    with open(os.path.join(copy, "maps.json"), "w") as file:
+        file.write('{"x": []}')
+    for name in os.listdir(os.path.join(published, "snapshots")):
+        os.unlink(os.path.join(published, "snapshots", name))
+    with pytest.raises(OSError, match="7.json"):
+        sync(published, copy)
+
+
+def test_update_publishes(tmp_path: str):
+    """Tests that the update publishes a generation only when the files change.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    dataset = generate_dataset(100, sharing_rate=0.2, seed=13)
+    with open(os.path.join(tmp_path, "pools_list.json"), "w") as file:
+        json.dump(dataset["pools"], file)
+    with open(os.path.join(tmp_path, "pools_updates.json"), "w") as file:
+        json.dump(dataset["updates"], file)
+    settings = {"CPC_DATA_DIR": str(tmp_path), "CPC_TELEMETRY_TRACE_MEMORY": False, "CPC_PUBLISH_DIR": "published/"}
+    checker = CardanoPoolChecker(settings=settings)
+    checker.update(skip=["pools", "updates", "translations"], allow_stale=True)
+    checker.update(skip=["pools", "updates", "translations"], allow_stale=True)
+    publisher = Publisher(os.path.join(tmp_path, "published"))
+    assert publisher.index["generation"] == 1  # noqa: S101
+    assert "registered_multi_stake_pool_operators.json" in publisher.files()  # noqa: S101
+    assert sync(os.path.join(tmp_path, "published"), os.path.join(tmp_path, "copy")) == 1  # noqa: S101
+    with open(os.path.join(tmp_path, "pools_report.json")) as file, open(
+        os.path.join(tmp_path, "copy", "pools_report.json")
+    ) as copy:
+        assert file.read() == copy.read()  # noqa: S101
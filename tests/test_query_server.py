@@ -0,0 +1,99 @@
+"""test module for the read-only HTTP query server."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import gzip
+import json
+import os
+from http.client import HTTPConnection
+from urllib.parse import urlsplit
+
+import urllib3
+
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_server import MAX_BODY_SIZE, QueryServer
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset
+
+
+def test_query_server(tmp_path: str):
+    """Tests the pool, resource, rule and batch lookups, the ETags, the compression and the reload.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    dataset = generate_dataset(100, sharing_rate=0.2, seed=9)
+    with open(os.path.join(tmp_path, "pools_list.json"), "w") as file:
+        json.dump(dataset["pools"], file)
+    with open(os.path.join(tmp_path, "pools_updates.json"), "w") as file:
+        json.dump(dataset["updates"], file)
+    settings = {"CPC_DATA_DIR": str(tmp_path), "CPC_TELEMETRY_TRACE_MEMORY": False}
+    checker = CardanoPoolChecker(settings=settings)
+    checker.update(skip=["pools", "updates", "translations"], allow_stale=True)
+    with open(os.path.join(tmp_path, "registered_multi_stake_pool_operators.json")) as file:
+        multi = json.load(file)[0]
+    with open(os.path.join(tmp_path, "registered_sharing_owners.json")) as file:
+        owner, owner_pools = next(iter(json.load(file).items()))
+    pool_id = multi["pool_id_bech32"]
+    matching_file = "registered_multi_stake_pool_operators.json"
+
+    with QueryServer(settings, reload_interval=0) as server:
+        http = urllib3.PoolManager()
+        response = http.request("GET", server.url + "pools/" + pool_id)
+        assert response.status == 200  # noqa: S101, PLR2004
+        assert response.json()["explanation"] == checker.explain(pool_id)  # noqa: S101
+        assert response.json()["register"]["pool_id_bech32"] == pool_id  # noqa: S101
+        etag = response.headers["ETag"]
+        response = http.request("GET", server.url + "pools/" + pool_id, headers={"If-None-Match": etag})
+        assert response.status == 304  # noqa: S101, PLR2004
+        response = http.request(
+            "GET", server.url + "pools/" + pool_id, headers={"Accept-Encoding": "gzip"}, decode_content=False
+        )
+        assert response.headers["Content-Encoding"] == "gzip"  # noqa: S101
+        assert json.loads(gzip.decompress(response.data))["register"]["pool_id_bech32"] == pool_id  # noqa: S101
+        assert http.request("GET", server.url + "pools/pool1unknown").status == 404  # noqa: S101, PLR2004
+
+        response = http.request("GET", server.url + "resources", fields={"value": owner})
+        assert response.json()["registered_sharing_owners"] == owner_pools  # noqa: S101
+        response = http.request("GET", server.url + f"rules/{matching_file}/{pool_id}")
+        assert response.json()["matches"]  # noqa: S101
+        response = http.request("GET", server.url + f"rules/{matching_file}/pool1unknown")
+        assert not response.json()["matches"]  # noqa: S101
+        assert http.request("GET", server.url + "rules/unknown.json/" + pool_id).status == 404  # noqa: S101, PLR2004
+
+        batch = http.request("POST", server.url + "pools", json={"ids": [pool_id, "pool1unknown"]}).json()
+        assert batch[pool_id]["explanation"]["ticker"] == multi["ticker"]  # noqa: S101
+        assert batch["pool1unknown"] is None  # noqa: S101
+        response = http.request("GET", server.url + "pools", fields={"ids": f"{pool_id},pool1unknown"})
+        assert response.json() == batch  # noqa: S101
+
+        # A new generation of the files is loaded at once
+        assert not server.reload()  # noqa: S101
+        with open(os.path.join(tmp_path, matching_file), "w") as file:
+            json.dump([], file)
+        assert server.reload()  # noqa: S101
+        response = http.request("GET", server.url + f"rules/{matching_file}/{pool_id}")
+        assert not response.json()["matches"]  # noqa: S101
+
+
+def test_query_server_bad_requests(tmp_path: str):
+    """Tests that the malformed and oversized batch requests are rejected.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    with QueryServer({"CPC_DATA_DIR": str(tmp_path)}, reload_interval=0) as server:
+        http = urllib3.PoolManager()
+        # The batch ids must be a list
+        for body in ({"ids": 5}, {"ids": "pool1abc"}, ["pool1abc"]):
+            assert http.request("POST", server.url + "pools", json=body).status == 400  # noqa: S101, PLR2004
+        assert http.request("POST", server.url + "pools", json={"ids": ["pool1abc"]}).json() == {  # noqa: S101
+            "pool1abc": None
+        }
+        # An oversized body is not read
+        host, port = urlsplit(server.url).netloc.split(":")
+        connection = HTTPConnection(host, int(port))
+        connection.putrequest("POST", "/pools")
+        connection.putheader("Content-Length", str(MAX_BODY_SIZE + 1))
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 413  # noqa: S101, PLR2004
+        assert response.getheader("Connection") == "close"  # noqa: S101
+        connection.close()
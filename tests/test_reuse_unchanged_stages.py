@@ -0,0 +1,82 @@
+"""test module for the reuse of the stages whose inputs did not change."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import json
+import os
+import time
+
+import pytest
+
+from cardano_pool_checker.cardano_pool_checker_class import CURRENT_WINDOW_STAGES, CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset
+
+NETWORK_STAGES = ["pools", "updates", "translations"]
+
+
+def test_reuse_unchanged_stages(tmp_path: str, monkeypatch: pytest.MonkeyPatch):
+    """Tests that the stages run only when their input files or the settings change.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+    """
+    dataset = generate_dataset(200, sharing_rate=0.2, seed=5)
+    with open(os.path.join(tmp_path, "pools_list.json"), "w") as file:
+        json.dump(dataset["pools"], file)
+    with open(os.path.join(tmp_path, "pools_updates.json"), "w") as file:
+        json.dump(dataset["updates"], file)
+
+    def update(**settings: object) -> list[str]:
+        checker = CardanoPoolChecker(
+            settings={"CPC_DATA_DIR": str(tmp_path), "CPC_TELEMETRY_TRACE_MEMORY": False, **settings}
+        )
+        checker.update(skip=NETWORK_STAGES, allow_stale=True)
+        return checker.run_report["reused"]
+
+    assert update() == []  # noqa: S101
+    with open(os.path.join(tmp_path, "registered_sharing_owners.json")) as file:
+        owners = file.read()
+    # Nothing changed, only the compaction runs again since it depends on the current time
+    reusable = {stage.name for stage in CardanoPoolChecker([], [], {}).build_update_stages() if stage.inputs}
+    assert set(update()) == reusable  # noqa: S101
+    # The outputs are the same
+    with open(os.path.join(tmp_path, "registered_sharing_owners.json")) as file:
+        assert file.read() == owners  # noqa: S101
+    # A modified output is built again
+    with open(os.path.join(tmp_path, "registered_sharing_owners.json"), "w") as file:
+        file.write("{}")
+    assert "registered_sharing_owners" not in update()  # noqa: S101
+    with open(os.path.join(tmp_path, "registered_sharing_owners.json")) as file:
+        assert file.read() == owners  # noqa: S101
+    # An hour later the stages using the recently resolved relays run again
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 3600)
+    assert set(update()) == reusable - set(CURRENT_WINDOW_STAGES)  # noqa: S101
+    # Changed settings or inputs run the affected stages
+    assert update(CPC_META_JSON_SIMILARITY_THRESHOLD=0.9) == []  # noqa: S101
+    with open(os.path.join(tmp_path, "pools_updates.json"), "w") as file:
+        json.dump(dataset["updates"][:-10], file)
+    assert "register" not in update()  # noqa: S101
+    assert update(CPC_REUSE_UNCHANGED_STAGES=False) == []  # noqa: S101
+
+
+def test_file_digest_edited(tmp_path: str):
+    """Tests that the cached digest of a data file changes when the file is edited by another process.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    checker = CardanoPoolChecker([], [], {}, settings={"CPC_DATA_DIR": str(tmp_path)})
+    checker._save_json("pools_list.json", ["pool1a"])  # noqa: SLF001
+    digest = checker._file_digest("pools_list.json")  # noqa: SLF001
+    # Edited keeping the size, like a long running instance would see it
+    path = os.path.join(tmp_path, "pools_list.json")
+    stat = os.stat(path)
+    with open(path, "w") as file:
+        json.dump(["pool1b"], file, indent=4)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert checker._file_digest("pools_list.json") != digest  # noqa: S101, SLF001
+    # Saving the previous content writes the file again
+    checker._save_json("pools_list.json", ["pool1a"])  # noqa: SLF001
+    with open(path) as file:
+        assert json.load(file) == ["pool1a"]  # noqa: S101
+    assert checker._file_digest("pools_list.json") == digest  # noqa: S101, SLF001
@@ -0,0 +1,55 @@
+"""test module for the selection of the update stages."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import os
+
+import pytest
+
+from cardano_pool_checker.__main__ import main
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+
+
+def test_select_update_stages(tmp_path: str):
+    """Tests the selection of stages and the staleness checks of the skipped ones.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+    checker = CardanoPoolChecker([], [], {}, settings={"CPC_DATA_DIR": str(tmp_path)})
+    stages = {stage.name: stage for stage in checker.build_update_stages()}
+    # Nothing was run yet, so the outputs of the detectors are missing
+    with pytest.raises(ValueError, match="stale or missing outputs"):
+        checker.select_update_stages(["classified_pools"])
+    selected = checker.select_update_stages(["classified_pools"], allow_stale=True)
+    assert [stage.name for stage in selected] == ["classified_pools"]  # noqa: S101
+    assert not selected[0].deps  # noqa: S101
+    # Once every output exists, in the order the stages write them, the classification can run alone
+    for name in ("pools", "updates", "register", "translations", "compaction", *stages):
+        for output in stages[name].outputs:
+            os.makedirs(os.path.dirname(os.path.join(tmp_path, output)), exist_ok=True)
+            with open(os.path.join(tmp_path, output), "w") as file:
+                file.write("[]")
+    assert len(checker.select_update_stages(["classified_pools"])) == 1  # noqa: S101
+    # Running the register makes the skipped stages depending on it stale
+    with pytest.raises(ValueError, match="registered_sharing_owners"):
+        checker.select_update_stages(["register", "classified_pools"])
+    selected = checker.select_update_stages(
+        ["register", "compaction", "detectors", "classified_pools"], ["translations"], ["translations"]
+    )
+    assert "translations" not in {stage.name for stage in selected}  # noqa: S101
+    with pytest.raises(ValueError, match="Unknown stage"):
+        checker.select_update_stages(["unknown"])
+    with pytest.raises(ValueError, match="Unknown setting"):
+        CardanoPoolChecker([], [], {}, settings={"DATA_DIR": str(tmp_path)})
+
+
+def test_main_dry_run(tmp_path: str, capsys: pytest.CaptureFixture):
+    """Tests that the command line shows the stages it would run.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+        capsys (pytest.CaptureFixture): The pytest output capture fixture.
+    """
+    main(["--data-dir", str(tmp_path), "--only", "register", "--dry-run"])
+    assert capsys.readouterr().out.splitlines()[-1] == "register: -"  # noqa: S101
+    with pytest.raises(SystemExit, match="stale or missing outputs"):
+        main(["--data-dir", str(tmp_path), "--offline", "--dry-run"])
@@ -0,0 +1,53 @@
+"""test module for the binary snapshot of the loaded state."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import json
+import os
+
+import pytest
+
+import cardano_pool_checker.cardano_pool_checker_class as cpc_class
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset
+
+
+def test_snapshot(tmp_path: str, monkeypatch: pytest.MonkeyPatch):
+    """Tests that the snapshot is used while the JSON files keep the same content.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+    """
+    dataset = generate_dataset(100, sharing_rate=0.2, seed=7)
+    with open(os.path.join(tmp_path, "pools_list.json"), "w") as file:
+        json.dump(dataset["pools"], file)
+    with open(os.path.join(tmp_path, "pools_updates.json"), "w") as file:
+        json.dump(dataset["updates"], file)
+    settings = {"CPC_DATA_DIR": str(tmp_path), "CPC_TELEMETRY_TRACE_MEMORY": False}
+    checker = CardanoPoolChecker(settings=settings)
+    checker.update(skip=["pools", "updates", "translations"], allow_stale=True)
+    loads: list[str] = []
+    monkeypatch.setattr(CardanoPoolChecker, "_load_register", lambda self: loads.append("register"))  # noqa: ARG005
+
+    # Fresh snapshot, even if the files were rewritten with the same content
+    os.utime(os.path.join(tmp_path, "pools_register.json"))
+    warm = CardanoPoolChecker(settings=settings)
+    assert loads == []  # noqa: S101
+    assert warm.register == checker.register  # noqa: S101
+    assert warm.updates == checker.updates  # noqa: S101
+    assert warm._translations_index is not None  # noqa: S101, SLF001
+
+    # Changed sources, disabled snapshot or a new format fall back to the JSON files
+    with open(os.path.join(tmp_path, "pools_register.json"), "w") as file:
+        json.dump(checker.register[:-1], file)
+    CardanoPoolChecker(settings=settings)
+    assert loads == ["register"]  # noqa: S101
+    monkeypatch.setattr(cpc_class, "SNAPSHOT_VERSION", cpc_class.SNAPSHOT_VERSION + 1)
+    checker.save_snapshot()
+    monkeypatch.undo()
+    monkeypatch.setattr(CardanoPoolChecker, "_load_register", lambda self: loads.append("register"))  # noqa: ARG005
+    CardanoPoolChecker(settings=settings)
+    assert loads == ["register", "register"]  # noqa: S101
+    with open(os.path.join(tmp_path, "cardano_pool_checker_state.pickle"), "wb") as file:
+        file.write(b"truncated")
+    CardanoPoolChecker(settings=settings)
+    assert loads == ["register", "register", "register"]  # noqa: S101
@@ -0,0 +1,43 @@
+"""test module for the synthetic data generator and the benchmark runner."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+from cardano_pool_checker.cardano_pool_checker_benchmark import compare, run_benchmark
+from cardano_pool_checker.cardano_pool_checker_class import CardanoPoolChecker
+from cardano_pool_checker.cardano_pool_checker_synthetic import generate_dataset, generate_translations
+
+
+def test_generate_dataset():
+    """Tests that the synthetic data is deterministic and has the shape expected by the processing."""
+    dataset = generate_dataset(500, sharing_rate=0.2, seed=1)
+    assert dataset == generate_dataset(500, sharing_rate=0.2, seed=1)  # noqa: S101
+    assert CardanoPoolChecker._check_updates(dataset["updates"])  # noqa: S101, SLF001
+    register = CardanoPoolChecker.build_register(dataset["updates"])
+    assert len(register) == 500  # noqa: S101, PLR2004
+    assert len(dataset["pools"]) == 450  # noqa: S101, PLR2004
+    # The registered pools of every operator group are found by at least one of the ever shared detectors
+    registered = {pool["pool_id_bech32"] for pool in register if pool["pool_status"] == "registered"}
+    translations = generate_translations(register, dataset["dns"], dataset["srv"])
+    detected = [
+        CardanoPoolChecker.find_registered_sharing_owners(register),
+        CardanoPoolChecker.find_registered_sharing_reward_addr(register),
+        CardanoPoolChecker.find_registered_sharing_relay_hostname(register),
+        CardanoPoolChecker.find_registered_sharing_relay_ipv4(register, translations),
+        CardanoPoolChecker.find_registered_sharing_meta_json_homepage(register),
+        CardanoPoolChecker.find_registered_sharing_meta_url(register),
+        CardanoPoolChecker.find_registered_similar_meta_json(register, threshold=0.6),
+    ]
+    clusters = [set(pools) for found in detected for pools in found.values()]
+    for group in dataset["groups"]:
+        members = set(group) & registered
+        if len(members) > 1:
+            assert any(members <= cluster for cluster in clusters)  # noqa: S101
+
+
+def test_benchmark_compare():
+    """Tests that the benchmark runs every stage and the regressions past the threshold are reported."""
+    results = {"200": run_benchmark(200, trace_memory=False, stages=["build_register", "build_classified_pools"])}
+    assert set(results["200"]) == {"build_register", "build_classified_pools"}  # noqa: S101
+    baselines = {"200": {"build_register": {"time": 1.0, "memory": 100}}}
+    current = {"200": {"build_register": {"time": 1.2, "memory": 200}}}
+    assert compare(current, baselines, threshold=0.25) == ["200 build_register: memory 100 -> 200 bytes"]  # noqa: S101
+    current = {"200": {"build_register": {"time": 2.0, "memory": 100}}}
+    assert compare(current, baselines, threshold=0.25) == ["200 build_register: time 1.000s -> 2.000s"]  # noqa: S101
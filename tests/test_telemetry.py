@@ -0,0 +1,65 @@
+"""test module for the update pipeline telemetry."""  # noqa: INP001
+# see https://docs.pytest.org/en/latest/explanation/goodpractices.html#tests-outside-application-code
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cardano_pool_checker.cardano_pool_checker_telemetry as cpc_telemetry
+from cardano_pool_checker.cardano_pool_checker_pipeline import Pipeline, Stage
+from cardano_pool_checker.cardano_pool_checker_telemetry import Telemetry
+
+
+def test_telemetry_report(tmp_path: str):
+    """Tests that the metrics of every stage are collected and attributed to the right stage.
+
+    Args:
+        tmp_path (str): The pytest temporary directory.
+    """
+
+    def download() -> None:
+        cpc_telemetry.count("http_requests", 3)
+        time.sleep(0.05)
+
+    def resolve() -> list[bytes]:
+        # The counts of the threads started by the stage are attributed to the stage
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for _ in range(10):
+                executor.submit(cpc_telemetry.propagate(cpc_telemetry.count), "dns_queries")
+        return [bytes(1_000_000)]
+
+    def fail() -> None:
+        msg = "broken stage"
+        raise ValueError(msg)
+
+    telemetry = Telemetry(trace_memory=True, profile_dir=os.path.join(tmp_path, "profiles"))
+    pipeline = Pipeline(
+        [
+            Stage("download", telemetry.wrap("download", download)),
+            Stage("resolve", telemetry.wrap("resolve", resolve), ["download"]),
+            Stage("fail", telemetry.wrap("fail", fail)),
+            Stage("after_fail", telemetry.wrap("after_fail", lambda: None), ["fail"]),
+        ]
+    )
+    telemetry.start()
+    # Work done outside the stages only counts in the totals
+    cpc_telemetry.count("bytes_read", 100)
+    report = telemetry.stop(pipeline.run())
+    stages = report["stages"]
+    assert report["totals"] == {  # noqa: S101
+        "bytes_read": 100,
+        "bytes_written": 0,
+        "http_requests": 3,
+        "koios_errors": 0,
+        "koios_retries": 0,
+        "dns_queries": 10,
+        "dns_failures": 0,
+    }
+    assert stages["download"]["status"] == "done"  # noqa: S101
+    assert stages["download"]["http_requests"] == 3  # noqa: S101, PLR2004
+    assert stages["download"]["dns_queries"] == 0  # noqa: S101
+    assert stages["download"]["wall_time"] >= 0.05  # noqa: S101, PLR2004
+    assert stages["resolve"]["dns_queries"] == 10  # noqa: S101, PLR2004
+    assert stages["resolve"]["memory_peak"] >= 1_000_000  # noqa: S101, PLR2004
+    assert stages["fail"]["status"] == "failed"  # noqa: S101
+    assert stages["after_fail"] == {"status": "skipped"}  # noqa: S101
+    assert os.path.isfile(os.path.join(tmp_path, "profiles", "download.prof"))  # noqa: S101